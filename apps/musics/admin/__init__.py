@@ -1,5 +1,6 @@
 from .album import *  # noqa
 from .artist import *  # noqa
+from .charts import *  # noqa
 from .genres import *  # noqa
 from .playlist import *  # noqa
 from .stats import *  # noqa
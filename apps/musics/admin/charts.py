@@ -0,0 +1,21 @@
+from django.contrib import admin
+from unfold.admin import ModelAdmin as UnfoldModelAdmin
+
+from apps.musics.models import Chart, ChartEntry
+
+
+class ChartEntryInline(admin.TabularInline):
+    model = ChartEntry
+    fields = ("position", "track", "plays", "previous_position")
+    raw_id_fields = ("track",)
+    extra = 0
+
+
+@admin.register(Chart)
+class ChartAdmin(UnfoldModelAdmin):
+    list_display = ("id", "period", "scope", "key", "period_start", "computed_at")
+    list_filter = ("period", "scope")
+    search_fields = ("key",)
+    date_hierarchy = "period_start"
+    ordering = ("-period_start", "period", "scope", "key")
+    inlines = [ChartEntryInline]
@@ -1,11 +1,14 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin as UnfoldModelAdmin
 
-from apps.musics.models import Like, ListeningHistory
+from apps.musics.models import Like, ListeningEvent, ListeningHistory
+from apps.shared.paginations.estimated import EstimatedCountPaginator
 
 
 @admin.register(Like)
 class LikeAdmin(UnfoldModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_display = ("id", "user", "track", "created_at")
     search_fields = ("user__username", "track__name", "track__artist__name")
     list_filter = ("created_at",)
@@ -15,8 +18,22 @@ class LikeAdmin(UnfoldModelAdmin):
 
 @admin.register(ListeningHistory)
 class ListeningHistoryAdmin(UnfoldModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_display = ("id", "user", "track", "listened_at", "duration")
     search_fields = ("user__username", "track__name", "track__artist__name")
     list_filter = ("listened_at",)
     date_hierarchy = "listened_at"
     ordering = ("-listened_at",)
+
+
+@admin.register(ListeningEvent)
+class ListeningEventAdmin(UnfoldModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_display = ("id", "user", "track", "event_type", "listened_at", "duration")
+    list_filter = ("event_type",)
+    search_fields = ("user__username", "track__name")
+    list_select_related = ("user", "track")
+    raw_id_fields = ("user", "track")
+    ordering = ("-listened_at",)
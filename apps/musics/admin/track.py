@@ -1,13 +1,28 @@
 from django.contrib import admin
 from unfold.admin import ModelAdmin as UnfoldModelAdmin
 
-from apps.musics.models import Track
+from apps.musics.models import Track, TrackRendition
+from apps.shared.paginations.estimated import EstimatedCountPaginator
+
+
+class TrackRenditionInline(admin.TabularInline):
+    model = TrackRendition
+    fields = ("bitrate", "status", "segments", "size", "updated_at", "error")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(Track)
 class TrackAdmin(UnfoldModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     list_display = ("id", "name", "album", "duration", "created_at")
     search_fields = ("name", "album__name", "album__artist__name")
     list_filter = ("album__artist", "album")
     ordering = ("-created_at",)
     prepopulated_fields = {"slug": ("name",)}
+    inlines = [TrackRenditionInline]
@@ -1,28 +1,33 @@
 from rest_framework import serializers
 from apps.musics.models import Album, Track, Artist, Genre
+from apps.shared.utils.signed_media import SignedMediaSerializerMixin
+from apps.shared.utils.sparse import SparseFieldsSerializerMixin
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ("id", "name", "slug")
 
 
-class AlbumListSerializer(serializers.ModelSerializer):
-    tracks_count = serializers.IntegerField(source='tracks.count', read_only=True)
+class AlbumListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    # Аннотация AlbumQuerySet.with_counts()
+    tracks_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Album
         fields = ("id", "name", "slug", "cover", "release_date", "tracks_count", "created_at")
 
 
-class ArtistSerializer(serializers.ModelSerializer):
+class ArtistSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Artist
         fields = ("id", "name", "slug", "owner", "bio", "avatar", "meta")
 
 
-class TrackSerializer(serializers.ModelSerializer):
+class TrackSerializer(
+    SignedMediaSerializerMixin, SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     genres = GenreSerializer(many=True, read_only=True)
 
     class Meta:
@@ -41,10 +46,11 @@ class TrackSerializer(serializers.ModelSerializer):
         )
 
 
-class AlbumDetailSerializer(serializers.ModelSerializer):
+class AlbumDetailSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     tracks = TrackSerializer(many=True, read_only=True)
     artist = ArtistSerializer(read_only=True)
-    tracks_count = serializers.IntegerField(source='tracks.count', read_only=True)
+    # Аннотация AlbumQuerySet.with_counts()
+    tracks_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Album
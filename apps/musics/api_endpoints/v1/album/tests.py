@@ -1,7 +1,8 @@
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from apps.musics.models import Album, Artist
+from apps.musics.models import Album, Artist, Track
 from apps.users.models import User
 
 
@@ -66,3 +67,49 @@ class AlbumAPITestCase(APITestCase):
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertFalse(Album.objects.filter(slug=self.album1.slug).exists())
+
+    def test_retrieve_album_not_modified(self):
+        """Деталь альбома отдаёт 304 по ETag, пока не изменились альбом и его треки"""
+        cache.clear()
+        url = reverse("album-detail", args=[self.album1.slug])
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Track.objects.create(
+            owner=self.user,
+            name="New",
+            artist=self.artist,
+            album=self.album1,
+            duration=100,
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["tracks"]), 1)
+
+    def test_list_albums_query_budget(self):
+        """Список альбомов — один запрос, tracks_count считается аннотацией"""
+        for i in range(5):
+            album = Album.objects.create(
+                name=f"Extra {i}",
+                artist=self.artist,
+                is_published=True,
+                owner=self.user,
+            )
+            for j in range(i):
+                Track.objects.create(
+                    owner=self.user,
+                    name=f"Track {i}-{j}",
+                    artist=self.artist,
+                    album=album,
+                    duration=100,
+                    is_published=j != 0,
+                )
+
+        # Первый запрос кладёт в кэш валидатор conditional GET
+        self.client.get(reverse("album-list"))
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("album-list"))
+        counts = {a["name"]: a["tracks_count"] for a in response.data}
+        self.assertEqual(counts["Extra 3"], 2)
+        self.assertEqual(counts["Album One"], 0)
@@ -1,8 +1,11 @@
 from rest_framework import viewsets, permissions, filters
 from rest_framework.exceptions import PermissionDenied
-from apps.musics.models import Album
+from apps.musics.models import Album, Artist, Track
 from .serializers import *  # noqa
 from apps.shared.permissions import IsOwnerOrReadOnly
+from apps.shared.views.conditional import ConditionalGetMixin
+from apps.shared.views.response_cache import AnonymousResponseCacheMixin
+from apps.shared.views.sparse import SPARSE_PARAMETERS, SparseFieldsetMixin
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
 
 
@@ -11,12 +14,14 @@ from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResp
         tags=["Albums"],
         summary="Get all albums",
         description="Retrieve a list of all albums.",
+        parameters=SPARSE_PARAMETERS,
         responses={200: AlbumListSerializer(many=True)},
     ),
     retrieve=extend_schema(
         tags=["Albums"],
         summary="Get album details",
         description="Retrieve detailed information about a specific album by ID.",
+        parameters=SPARSE_PARAMETERS,
         responses={200: AlbumDetailSerializer},
     ),
     create=extend_schema(
@@ -47,20 +52,41 @@ from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResp
         responses={204: OpenApiResponse(description="Album successfully deleted")},
     ),
 )
-class AlbumViewSet(viewsets.ModelViewSet):
+class AlbumViewSet(
+    ConditionalGetMixin,
+    AnonymousResponseCacheMixin,
+    SparseFieldsetMixin,
+    viewsets.ModelViewSet,
+):
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
     lookup_field = "slug"
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["name", "artist__name"]
     ordering_fields = ["release_date", "name"]
+    validator_tags = ("albums", "tracks", "artists")
+    sparse_relations = {
+        "artist": "artist",
+        "tracks": "tracks",
+        "tracks.genres": "tracks__genres",
+    }
 
     def get_queryset(self):
-        return (
-            Album.objects.filter(is_published=True)
-            .select_related("artist")
-            .prefetch_related("tracks")
-            .all()
-        )
+        qs = Album.objects.filter(is_published=True).with_counts()
+        if self.action == "list":
+            return qs
+        return qs.select_related("artist").prefetch_related("tracks__genres")
+
+    def get_validator_querysets(self):
+        albums = super().get_validator_querysets()[0]
+        if self.action == "list":
+            # tracks_count меняется вместе с треками альбомов
+            return [albums, Track.objects.filter(album__in=albums.values("pk"))]
+        slug = self.kwargs["slug"]
+        return [
+            albums,
+            Track.objects.filter(album__slug=slug),
+            Artist.objects.filter(albums__slug=slug),
+        ]
 
     def get_serializer_class(self):
         if self.action == "list":
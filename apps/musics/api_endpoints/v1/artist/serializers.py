@@ -1,14 +1,18 @@
 from rest_framework import serializers
 from apps.musics.models import Artist, Album, Track, Genre
+from apps.shared.utils.signed_media import SignedMediaSerializerMixin
+from apps.shared.utils.sparse import SparseFieldsSerializerMixin
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ["id", "name", "slug"]
 
 
-class ArtistTrackSerializer(serializers.ModelSerializer):
+class ArtistTrackSerializer(
+    SignedMediaSerializerMixin, SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     genres = GenreSerializer(many=True, read_only=True)
 
     class Meta:
@@ -26,7 +30,9 @@ class ArtistTrackSerializer(serializers.ModelSerializer):
         )
 
 
-class AlbumWithTracksSerializer(serializers.ModelSerializer):
+class AlbumWithTracksSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     tracks = ArtistTrackSerializer(many=True, read_only=True)
 
     class Meta:
@@ -42,9 +48,10 @@ class AlbumWithTracksSerializer(serializers.ModelSerializer):
         )
 
 
-class ArtistListSerializer(serializers.ModelSerializer):
-    albums_count = serializers.SerializerMethodField()
-    tracks_count = serializers.SerializerMethodField()
+class ArtistListSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
+    # Аннотации ArtistQuerySet.with_counts()
+    albums_count = serializers.IntegerField(read_only=True)
+    tracks_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Artist
@@ -63,18 +70,13 @@ class ArtistListSerializer(serializers.ModelSerializer):
             "updated_at",
         )
 
-    def get_albums_count(self, obj):
-        return obj.albums.filter(is_published=True).count()
 
-    def get_tracks_count(self, obj):
-        return obj.tracks.filter(is_published=True).count()
-
-
-class ArtistDetailSerializer(serializers.ModelSerializer):
+class ArtistDetailSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     albums = AlbumWithTracksSerializer(many=True, read_only=True)
     tracks = ArtistTrackSerializer(many=True, read_only=True)
-    albums_count = serializers.SerializerMethodField()
-    tracks_count = serializers.SerializerMethodField()
+    # Аннотации ArtistQuerySet.with_counts()
+    albums_count = serializers.IntegerField(read_only=True)
+    tracks_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Artist
@@ -98,12 +100,6 @@ class ArtistDetailSerializer(serializers.ModelSerializer):
             "updated_at",
         )
 
-    def get_albums_count(self, obj):
-        return obj.albums.filter(is_published=True).count()
-
-    def get_tracks_count(self, obj):
-        return obj.tracks.filter(is_published=True).count()
-
 
 class ArtistCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,3 +1,6 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -111,3 +114,63 @@ class ArtistAPITestCase(APITestCase):
 
         response = self.client.delete(self.detail_url)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_artist_list_not_modified(self):
+        """Список артистов отдаёт 304; новый альбом меняет albums_count и валидатор"""
+        cache.clear()
+        etag = self.client.get(self.list_url)["ETag"]
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        Album.objects.create(
+            name="New Album", artist=self.artist, owner=self.admin, is_published=True
+        )
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_artist_list_query_budget(self):
+        """Список артистов — один запрос независимо от числа альбомов и треков"""
+        for i in range(5):
+            artist = Artist.objects.create(name=f"Artist {i}", owner=self.admin)
+            album = Album.objects.create(
+                name=f"Album {i}", artist=artist, owner=self.admin, is_published=True
+            )
+            for j in range(i):
+                Track.objects.create(
+                    owner=self.admin,
+                    name=f"Track {i}-{j}",
+                    album=album,
+                    artist=artist,
+                    duration=180,
+                )
+
+        # Авторизованный запрос идёт мимо кэша ответов; первый кладёт в кэш валидатор
+        self.client.force_authenticate(user=self.admin)
+        self.client.get(self.list_url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.list_url)
+        counts = {
+            a["name"]: (a["albums_count"], a["tracks_count"]) for a in response.data
+        }
+        self.assertEqual(counts["Artist 4"], (1, 4))
+        # Неопубликованный альбом не считается
+        self.assertEqual(counts["Test Artist"], (0, 1))
+
+    def test_artist_retrieve_sparse(self):
+        """?include= и ?fields= сужают вложенные альбомы и их запросы"""
+
+        full = self.client.get(self.detail_url)
+        self.client.force_authenticate(user=self.admin)
+        params = {"include": "albums", "fields": "name,albums.name"}
+        # Первый запрос кладёт в кэш валидатор conditional GET
+        self.client.get(self.detail_url, params)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.detail_url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {"name": "Test Artist", "albums": [{"name": "Test Album"}]}
+        )
+        # Артист и альбомы; треки альбомов и артиста не загружаются
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertNotIn('"bio"', ctx.captured_queries[0]["sql"])
+        self.assertIn("tracks", full.data)
@@ -1,8 +1,11 @@
 from rest_framework import viewsets, permissions, filters
 from rest_framework.exceptions import PermissionDenied
 from drf_spectacular.utils import extend_schema_view, extend_schema, OpenApiResponse
-from django.db.models import Count
-from apps.musics.models import Artist
+from django.db.models import Q
+from apps.musics.models import Album, Artist, Track
+from apps.shared.views.conditional import ConditionalGetMixin
+from apps.shared.views.response_cache import AnonymousResponseCacheMixin
+from apps.shared.views.sparse import SPARSE_PARAMETERS, SparseFieldsetMixin
 from .serializers import (
     ArtistListSerializer,
     ArtistDetailSerializer,
@@ -15,12 +18,14 @@ from .serializers import (
         tags=["Artists"],
         summary="Get all artists",
         description="Retrieve a list of all artists.",
+        parameters=SPARSE_PARAMETERS,
         responses={200: ArtistListSerializer(many=True)},
     ),
     retrieve=extend_schema(
         tags=["Artists"],
         summary="Get artist details",
         description="Retrieve detailed information about a specific artist by ID.",
+        parameters=SPARSE_PARAMETERS,
         responses={200: ArtistDetailSerializer},
     ),
     create=extend_schema(
@@ -51,18 +56,48 @@ from .serializers import (
         responses={204: OpenApiResponse(description="Artist successfully deleted")},
     ),
 )
-class ArtistViewSet(viewsets.ModelViewSet):
-    queryset = (
-        Artist.objects.all()
-        .annotate(albums_count=Count("albums"))
-        .order_by("-created_at")
-        .prefetch_related("albums__tracks")
-    )
+class ArtistViewSet(
+    ConditionalGetMixin,
+    AnonymousResponseCacheMixin,
+    SparseFieldsetMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Artist.objects.with_counts().order_by("-created_at")
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     lookup_field = "slug"
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["name"]
     ordering_fields = ["name", "created_at"]
+    validator_tags = ("artists", "albums", "tracks")
+    sparse_relations = {
+        "albums": "albums",
+        "albums.tracks": "albums__tracks",
+        "albums.tracks.genres": "albums__tracks__genres",
+        "tracks": "tracks",
+        "tracks.genres": "tracks__genres",
+    }
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        if self.action == "retrieve":
+            qs = qs.prefetch_related("albums__tracks__genres", "tracks__genres")
+        return qs
+
+    def get_validator_querysets(self):
+        artists = super().get_validator_querysets()[0]
+        if self.action == "list":
+            # albums_count / tracks_count меняются вместе с альбомами и треками
+            return [
+                artists,
+                Album.objects.filter(artist__in=artists.values("pk")),
+                Track.objects.filter(artist__in=artists.values("pk")),
+            ]
+        slug = self.kwargs["slug"]
+        return [
+            artists,
+            Album.objects.filter(artist__slug=slug),
+            Track.objects.filter(Q(artist__slug=slug) | Q(album__artist__slug=slug)),
+        ]
 
     def get_serializer_class(self):
         if self.action == "list":
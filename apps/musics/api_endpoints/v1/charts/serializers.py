@@ -0,0 +1,35 @@
+from rest_framework import serializers
+
+from apps.musics.models import Chart, ChartEntry
+from apps.musics.api_endpoints.v1.track.serializers import (
+    LikedTracksListSerializer,
+    TrackListSerializer,
+)
+
+
+class ChartSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Chart
+        fields = ["period", "scope", "key", "period_start", "period_end", "computed_at"]
+
+
+class ChartEntrySerializer(serializers.ModelSerializer):
+    track = TrackListSerializer(read_only=True)
+    change = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = ChartEntry
+        fields = ["position", "previous_position", "change", "plays", "track"]
+        list_serializer_class = LikedTracksListSerializer
+        liked_track_id_attr = "track_id"
+
+
+class ChartDetailSerializer(ChartSerializer):
+    # top_entries заполняет view: срез по limit с select_related
+    entries = ChartEntrySerializer(source="top_entries", many=True, read_only=True)
+
+    class Meta(ChartSerializer.Meta):
+        fields = ChartSerializer.Meta.fields + ["entries"]
+
+
+__all__ = ["ChartSerializer", "ChartEntrySerializer", "ChartDetailSerializer"]
@@ -0,0 +1,160 @@
+from datetime import date, datetime, time, timedelta
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.musics.models import Album, Artist, Genre, ListeningEvent, Track
+from apps.musics.services.charts import (
+    build_charts,
+    rollup_daily_plays,
+    update_album_listens,
+)
+
+User = get_user_model()
+
+# Понедельники двух соседних недель одного месяца
+PREVIOUS_WEEK = date(2026, 9, 7)
+THIS_WEEK = date(2026, 9, 14)
+
+
+class ChartsAPITestCase(APITestCase):
+    """Тесты для предрасчитанных чартов /charts/"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="pass123"
+        )
+        self.rock = Genre.objects.create(name="Rock")
+        artist = Artist.objects.create(name="Artist", owner=self.user)
+        self.album = Album.objects.create(name="Album", artist=artist, owner=self.user)
+        self.first, self.second, self.third = [
+            Track.objects.create(
+                owner=self.user,
+                name=f"Track {i}",
+                artist=artist,
+                album=self.album,
+                duration=180,
+                language=language,
+            )
+            for i, language in enumerate(["EN", "uz", "en"])
+        ]
+        self.third.genres.add(self.rock)
+
+    def _play(self, track, day, times):
+        listened_at = timezone.make_aware(datetime.combine(day, time(12)))
+        ListeningEvent.objects.bulk_create(
+            ListeningEvent(
+                user=self.user, track=track, event_type="play", listened_at=listened_at
+            )
+            for _ in range(times)
+        )
+        # Просмотры карточки в чарт не попадают
+        ListeningEvent.objects.create(
+            user=self.user, track=track, event_type="view", listened_at=listened_at
+        )
+        rollup_daily_plays(day)
+
+    def _build_two_weeks(self):
+        self._play(self.first, PREVIOUS_WEEK, 5)
+        self._play(self.second, PREVIOUS_WEEK, 3)
+        build_charts("weekly", PREVIOUS_WEEK)
+        self._play(self.second, THIS_WEEK, 4)
+        self._play(self.third, THIS_WEEK + timedelta(days=1), 6)
+        self._play(self.first, THIS_WEEK + timedelta(days=2), 2)
+        build_charts("weekly", THIS_WEEK + timedelta(days=2))
+
+    def test_rollup_is_idempotent(self):
+        self._play(self.first, THIS_WEEK, 3)
+        rollup_daily_plays(THIS_WEEK)
+        daily = self.first.daily_plays.get()
+        self.assertEqual((daily.day, daily.plays, daily.listeners), (THIS_WEEK, 3, 1))
+
+    def test_weekly_chart_positions_and_changes(self):
+        self._build_two_weeks()
+        response = self.client.get(reverse("chart-detail", args=["weekly"]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["period_start"], THIS_WEEK.isoformat())
+        rows = [
+            (e["track"]["id"], e["position"], e["previous_position"], e["change"])
+            for e in response.data["entries"]
+        ]
+        self.assertEqual(
+            rows,
+            [
+                (self.third.id, 1, None, None),
+                (self.second.id, 2, 2, 0),
+                (self.first.id, 3, 1, -2),
+            ],
+        )
+
+        # Исторический чарт по любой дате периода
+        response = self.client.get(
+            reverse("chart-detail", args=["weekly"]),
+            {"date": (PREVIOUS_WEEK + timedelta(days=3)).isoformat(), "limit": 1},
+        )
+        self.assertEqual(
+            [e["track"]["id"] for e in response.data["entries"]], [self.first.id]
+        )
+
+        # Нераспознанная дата — 400, корректная дата без чарта — 404
+        url = reverse("chart-detail", args=["weekly"])
+        response = self.client.get(url, {"date": "14-09-2026"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("date", response.data)
+        response = self.client.get(url, {"date": "2020-01-01"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_genre_and_language_charts(self):
+        self._build_two_weeks()
+        url = reverse("chart-detail", args=["weekly"])
+
+        response = self.client.get(url, {"genre": "rock"})
+        self.assertEqual(
+            [e["track"]["id"] for e in response.data["entries"]], [self.third.id]
+        )
+        response = self.client.get(url, {"language": "EN"})
+        self.assertEqual(
+            [e["track"]["id"] for e in response.data["entries"]],
+            [self.third.id, self.first.id],
+        )
+        self.assertEqual(response.data["entries"][1]["change"], -1)
+
+        response = self.client.get(url, {"genre": "jazz"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_chart_list_returns_latest_period(self):
+        self._build_two_weeks()
+        build_charts("monthly", THIS_WEEK)
+        response = self.client.get(reverse("chart-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(
+            [(c["period"], c["scope"], c["key"]) for c in response.data],
+            [
+                ("monthly", "all", ""),
+                ("monthly", "genre", "rock"),
+                ("monthly", "language", "en"),
+                ("monthly", "language", "uz"),
+                ("weekly", "all", ""),
+                ("weekly", "genre", "rock"),
+                ("weekly", "language", "en"),
+                ("weekly", "language", "uz"),
+            ],
+        )
+        self.assertEqual(
+            {c["period_start"] for c in response.data if c["period"] == "weekly"},
+            {THIS_WEEK.isoformat()},
+        )
+
+    def test_unknown_period(self):
+        response = self.client.get(reverse("chart-detail", args=["daily"]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update_album_listens(self):
+        self._build_two_weeks()
+        update_album_listens(THIS_WEEK + timedelta(days=2))
+        self.album.refresh_from_db()
+        self.assertEqual(self.album.listens_last_week, 12)
+        self.assertEqual(self.album.listens_last_month, 20)
@@ -0,0 +1,100 @@
+from datetime import date
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+from django.http import Http404
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
+
+from apps.musics.models import Chart
+from .serializers import ChartDetailSerializer, ChartSerializer
+
+
+class ChartListAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        tags=["Charts"],
+        summary="Available charts",
+        description=(
+            "Charts of the latest weekly and monthly periods: overall, "
+            "per genre (key = genre slug) and per language (key = language)."
+        ),
+        responses={200: ChartSerializer(many=True)},
+    )
+    def get(self, request):
+        latest = (
+            Chart.objects.filter(period=OuterRef("period"))
+            .order_by("-period_start")
+            .values("period_start")[:1]
+        )
+        charts = Chart.objects.filter(period_start=Subquery(latest)).order_by(
+            "period", "scope", "key"
+        )
+        return Response(ChartSerializer(charts, many=True).data)
+
+
+class ChartDetailAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        tags=["Charts"],
+        summary="Get a chart",
+        description=(
+            "Precomputed weekly or monthly top tracks with position changes "
+            "versus the previous period. Defaults to the latest overall chart."
+        ),
+        parameters=[
+            OpenApiParameter("genre", str, description="Genre slug"),
+            OpenApiParameter("language", str, description="Track language"),
+            OpenApiParameter(
+                "date", str, description="Any day of the period, YYYY-MM-DD"
+            ),
+            OpenApiParameter("limit", int, description="Number of positions"),
+        ],
+        responses={
+            200: ChartDetailSerializer,
+            400: OpenApiResponse(description="Malformed date"),
+            404: OpenApiResponse(description="No chart for this period"),
+        },
+    )
+    def get(self, request, period):
+        if period not in Chart.PeriodChoices.values:
+            raise Http404
+        params = request.query_params
+        charts = Chart.objects.filter(period=period)
+        if params.get("genre"):
+            charts = charts.filter(scope=Chart.ScopeChoices.GENRE, key=params["genre"])
+        elif params.get("language"):
+            charts = charts.filter(
+                scope=Chart.ScopeChoices.LANGUAGE,
+                key=params["language"].strip().lower(),
+            )
+        else:
+            charts = charts.filter(scope=Chart.ScopeChoices.ALL)
+        if params.get("date"):
+            try:
+                day = date.fromisoformat(params["date"])
+            except ValueError:
+                # Кривая дата — ошибка запроса; 404 только когда чарта за дату нет
+                raise ValidationError({"date": "Expected a date in YYYY-MM-DD format."})
+            charts = charts.filter(period_start__lte=day, period_end__gte=day)
+
+        try:
+            limit = max(1, min(int(params["limit"]), settings.CHARTS_SIZE))
+        except (KeyError, ValueError):
+            limit = settings.CHARTS_SIZE
+        chart = charts.order_by("-period_start").first()
+        if chart is None:
+            raise Http404
+        chart.top_entries = chart.entries.select_related(
+            "track__artist", "track__album"
+        ).prefetch_related("track__genres")[:limit]
+        serializer = ChartDetailSerializer(chart, context={"request": request})
+        return Response(serializer.data)
+
+
+__all__ = ["ChartListAPIView", "ChartDetailAPIView"]
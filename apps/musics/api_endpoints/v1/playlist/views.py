@@ -3,14 +3,16 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from django.db.models import Count
-from apps.musics.models import Playlist
+from apps.musics.models import Playlist, Track
 from .serializers import (
     PlaylistListSerializer,
     PlaylistDetailSerializer,
     PlaylistCreateUpdateSerializer,
 )
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
+from apps.shared.paginations.keyset import KeysetPagination
 from apps.shared.permissions import IsOwnerOrReadOnly
+from apps.shared.views.conditional import ConditionalGetMixin
 
 
 @extend_schema_view(
@@ -54,17 +56,19 @@ from apps.shared.permissions import IsOwnerOrReadOnly
         responses={204: OpenApiResponse(description="Playlist successfully deleted")},
     ),
 )
-class PlaylistViewSet(viewsets.ModelViewSet):
+class PlaylistViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet для управления плейлистами.
     Поддерживает CRUD, поиск, сортировку и очистку треков.
     """
 
     permission_classes = [IsOwnerOrReadOnly]
+    pagination_class = KeysetPagination
     lookup_field = "slug"
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ["name", "description", "owner__username"]
     ordering_fields = ["created_at", "updated_at", "name"]
+    validator_tags = ("playlists", "tracks")
 
     def get_queryset(self):
         """Оптимизированный queryset с подсчётом треков"""
@@ -76,6 +80,14 @@ class PlaylistViewSet(viewsets.ModelViewSet):
         )
         return qs.select_related("owner").prefetch_related("tracks")
 
+    def get_validator_querysets(self):
+        """Состав плейлиста меняет его updated_at (см. signals), треки — свой"""
+
+        playlists = super().get_validator_querysets()[0]
+        if self.action == "list":
+            return [playlists]
+        return [playlists, Track.objects.filter(in_playlists__slug=self.kwargs["slug"])]
+
     def get_serializer_class(self):
         """Выбор сериализатора по действию"""
 
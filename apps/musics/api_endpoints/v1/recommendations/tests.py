@@ -0,0 +1,127 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.musics.models import Artist, Like, ListeningEvent, Track
+from apps.musics.services.recommendations import (
+    CURRENT_LINK,
+    KEEP_MODELS,
+    MODEL_ARRAYS,
+    load_model,
+    save_model,
+    train_recommender,
+)
+
+User = get_user_model()
+
+
+class ForYouAPITestCase(APITestCase):
+    """Тесты для персональной подборки /recommendations/for-you/"""
+
+    def setUp(self):
+        model_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(model_dir.cleanup)
+        settings_override = override_settings(
+            RECOMMENDATIONS_DIR=model_dir.name,
+            RECOMMENDATIONS_FACTORS=4,
+            RECOMMENDATIONS_ITERATIONS=5,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="pass123"
+        )
+        self.artist = Artist.objects.create(name="Artist", owner=self.user)
+        self.tracks = [
+            Track.objects.create(
+                owner=self.user,
+                name=f"Track {i}",
+                artist=self.artist,
+                duration=100,
+                plays_count=i,
+            )
+            for i in range(6)
+        ]
+        self.url = reverse("recommendations-for-you")
+
+    def _listen(self, user, *tracks):
+        for track in tracks:
+            ListeningEvent.objects.create(
+                user=user, track=track, event_type="play", duration=100
+            )
+
+    def test_for_you_requires_auth(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cold_start_returns_popular_tracks(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"limit": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [t["id"] for t in response.data],
+            [t.id for t in reversed(self.tracks[-3:])],
+        )
+
+    def test_recommends_unseen_co_listened_tracks(self):
+        t = self.tracks
+        fans = [
+            User.objects.create_user(
+                username=f"fan{i}", email=f"fan{i}@example.com", password="pass"
+            )
+            for i in range(4)
+        ]
+        for fan in fans:
+            self._listen(fan, t[0], t[1], t[2])
+        self._listen(self.user, t[0], t[1])
+        Like.objects.create(user=self.user, track=t[0])
+
+        stats = train_recommender()
+        self.assertEqual(stats["users"], 5)
+        self.assertIsNotNone(load_model())
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"limit": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([tr["id"] for tr in response.data], [t[2].id])
+
+        # Прослушанное после обучения модели из подборки пропадает
+        self._listen(self.user, t[2])
+        response = self.client.get(self.url)
+        ids = [tr["id"] for tr in response.data]
+        self.assertNotIn(t[2].id, ids)
+        self.assertNotIn(t[0].id, ids)
+
+    def test_save_model_never_overwrites_live_version(self):
+        """Версия с тем же временем обучения пишется в новый каталог"""
+        root = Path(settings.RECOMMENDATIONS_DIR)
+        trained_at = timezone.now()
+        paths = [
+            save_model(
+                root,
+                trained_at,
+                **{name: np.full((2, 2), value) for name in MODEL_ARRAYS},
+            )
+            for value in range(2)
+        ]
+        self.assertNotEqual(paths[0], paths[1])
+        self.assertEqual(np.load(paths[0] / "item_factors.npy")[0, 0], 0)
+        self.assertEqual((root / CURRENT_LINK).resolve(), paths[1].resolve())
+
+        # Старые версии чистятся, текущая остаётся
+        for _ in range(KEEP_MODELS):
+            path = save_model(
+                root, trained_at, **{name: np.zeros((2, 2)) for name in MODEL_ARRAYS}
+            )
+        versions = list(root.glob("model-*"))
+        self.assertEqual(len(versions), KEEP_MODELS)
+        self.assertIn(path, versions)
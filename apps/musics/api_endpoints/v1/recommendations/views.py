@@ -0,0 +1,51 @@
+from django.conf import settings
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+from apps.musics.models import Track
+from apps.musics.services.recommendations import recommend_track_ids
+from apps.musics.api_endpoints.v1.track.serializers import TrackListSerializer
+
+MAX_LIMIT = 100
+
+
+class ForYouAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        tags=["Recommendations"],
+        summary='Personal "For You" feed',
+        description=(
+            "Tracks recommended for the authenticated user by an implicit-feedback "
+            "ALS model trained on listens and likes. New users get popular tracks."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "limit", int, description=f"Number of tracks (max {MAX_LIMIT})"
+            ),
+        ],
+        responses={200: TrackListSerializer(many=True)},
+    )
+    def get(self, request):
+        try:
+            limit = max(1, min(int(request.query_params["limit"]), MAX_LIMIT))
+        except (KeyError, ValueError):
+            limit = settings.RECOMMENDATIONS_LIMIT
+
+        track_ids = recommend_track_ids(request.user, limit)
+        tracks = (
+            Track.objects.filter(pk__in=track_ids, is_published=True)
+            .select_related("artist", "album")
+            .prefetch_related("genres")
+            .in_bulk()
+        )
+        ordered = [tracks[pk] for pk in track_ids if pk in tracks][:limit]
+        serializer = TrackListSerializer(
+            ordered, many=True, context={"request": request}
+        )
+        return Response(serializer.data)
+
+
+__all__ = ["ForYouAPIView"]
@@ -0,0 +1,38 @@
+from rest_framework import serializers
+
+from apps.musics.models import Album, Artist, Playlist
+from apps.musics.api_endpoints.v1.track.serializers import TrackListSerializer
+
+
+class SearchArtistSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Artist
+        fields = ("id", "name", "slug", "avatar", "total_plays", "is_verified")
+
+
+class SearchAlbumSerializer(serializers.ModelSerializer):
+    artist = serializers.CharField(source="artist.name", read_only=True)
+
+    class Meta:
+        model = Album
+        fields = ("id", "name", "slug", "cover", "release_date", "artist")
+
+
+class SearchPlaylistSerializer(serializers.ModelSerializer):
+    owner = serializers.StringRelatedField()
+
+    class Meta:
+        model = Playlist
+        fields = ("id", "name", "slug", "cover", "owner")
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """Результаты поиска, сгруппированные по типам"""
+
+    tracks = TrackListSerializer(many=True, read_only=True)
+    artists = SearchArtistSerializer(many=True, read_only=True)
+    albums = SearchAlbumSerializer(many=True, read_only=True)
+    playlists = SearchPlaylistSerializer(many=True, read_only=True)
+
+
+__all__ = ["SearchResultSerializer"]
@@ -0,0 +1,96 @@
+from unittest import skipUnless
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.musics.models import Album, Artist, Playlist, Track
+
+User = get_user_model()
+
+
+class SearchAPITestCase(APITestCase):
+    """Тесты для единого поиска по каталогу"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="user", email="user@example.com", password="pass123"
+        )
+        self.artist = Artist.objects.create(name="Imagine Dragons", owner=self.user)
+        self.other_artist = Artist.objects.create(name="Coldplay", owner=self.user)
+        self.album = Album.objects.create(
+            name="Evolve", artist=self.artist, owner=self.user, is_published=True
+        )
+        self.believer = Track.objects.create(
+            owner=self.user,
+            name="Believer",
+            artist=self.artist,
+            album=self.album,
+            duration=204,
+            plays_count=10,
+        )
+        self.thunder = Track.objects.create(
+            owner=self.user,
+            name="Thunder",
+            artist=self.artist,
+            album=self.album,
+            duration=187,
+            plays_count=500,
+        )
+        self.yellow = Track.objects.create(
+            owner=self.user, name="Yellow", artist=self.other_artist, duration=266
+        )
+        Playlist.objects.create(name="Believer vibes", owner=self.user)
+        Playlist.objects.create(
+            name="Believer secret", owner=self.user, is_public=False
+        )
+        self.url = reverse("search")
+
+    def test_search_requires_query(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_search_groups_results(self):
+        response = self.client.get(self.url, {"q": "believer"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            set(response.data), {"query", "tracks", "artists", "albums", "playlists"}
+        )
+        self.assertEqual(response.data["tracks"][0]["id"], self.believer.id)
+        self.assertEqual(
+            [p["name"] for p in response.data["playlists"]], ["Believer vibes"]
+        )
+
+    def test_search_by_artist_and_album_name(self):
+        """Треки находятся по имени артиста и названию альбома"""
+        response = self.client.get(self.url, {"q": "dragons"})
+        track_ids = [t["id"] for t in response.data["tracks"]]
+        self.assertCountEqual(track_ids, [self.believer.id, self.thunder.id])
+        self.assertEqual(response.data["artists"][0]["id"], self.artist.id)
+        # При равной релевантности выше популярный трек
+        self.assertEqual(track_ids[0], self.thunder.id)
+
+        response = self.client.get(self.url, {"q": "evolve"})
+        self.assertEqual(len(response.data["tracks"]), 2)
+        self.assertEqual(response.data["albums"][0]["id"], self.album.id)
+
+    def test_search_limit(self):
+        response = self.client.get(self.url, {"q": "dragons", "limit": 1})
+        self.assertEqual(len(response.data["tracks"]), 1)
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search needs PostgreSQL")
+    def test_search_tolerates_typos_and_prefixes(self):
+        response = self.client.get(self.url, {"q": "beleiver"})
+        self.assertEqual(response.data["tracks"][0]["id"], self.believer.id)
+
+        response = self.client.get(self.url, {"q": "imag drag"})
+        self.assertEqual(len(response.data["tracks"]), 2)
+
+    @skipUnless(connection.vendor == "postgresql", "Full-text search needs PostgreSQL")
+    def test_search_vector_follows_artist_rename(self):
+        self.other_artist.name = "Chris Martin Band"
+        self.other_artist.save()
+        response = self.client.get(self.url, {"q": "martin"})
+        self.assertEqual([t["id"] for t in response.data["tracks"]], [self.yellow.id])
@@ -0,0 +1,48 @@
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+from apps.musics.services.search import search_catalog
+from .serializers import SearchResultSerializer
+
+MAX_QUERY_LENGTH = 100
+MAX_LIMIT = 50
+
+
+class SearchAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        tags=["Search"],
+        summary="Search the catalog",
+        description=(
+            "Full-text, typo tolerant search over tracks, artists, albums and public "
+            "playlists. Results are grouped by type and ranked by relevance and popularity."
+        ),
+        parameters=[
+            OpenApiParameter("q", str, required=True, description="Search query"),
+            OpenApiParameter("limit", int, description="Results per group (max 50)"),
+        ],
+        responses={200: SearchResultSerializer},
+    )
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()[:MAX_QUERY_LENGTH]
+        if not query:
+            return Response(
+                {"q": "This query parameter is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = int(request.query_params["limit"])
+            limit = max(1, min(limit, MAX_LIMIT))
+        except (KeyError, ValueError):
+            limit = None
+
+        results = search_catalog(query, limit=limit)
+        serializer = SearchResultSerializer(results, context={"request": request})
+        return Response({"query": query, **serializer.data})
+
+
+__all__ = ["SearchAPIView"]
@@ -1,7 +1,7 @@
-from rest_framework.pagination import PageNumberPagination
+from apps.shared.paginations.keyset import KeysetPagination
 
 
-class StatsPagination(PageNumberPagination):
+class StatsPagination(KeysetPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
@@ -1,9 +1,19 @@
 from rest_framework import serializers
-from apps.musics.models import Like, ListeningHistory
+from apps.musics.models import Like, ListeningEvent
 from apps.musics.models.track import Track
+from apps.musics.services.likes import get_liked_resolver
+from apps.musics.api_endpoints.v1.track.serializers import LikedTracksListSerializer
+from apps.shared.utils.signed_media import SignedMediaSerializerMixin
+from apps.shared.utils.lean import (
+    LeanDateField,
+    LeanField,
+    LeanMediaField,
+    LeanNested,
+    LeanSerializer,
+)
 
 
-class TrackMiniSerializer(serializers.ModelSerializer):
+class TrackMiniSerializer(SignedMediaSerializerMixin, serializers.ModelSerializer):
     artist_name = serializers.CharField(source="artist.name", read_only=True)
     album_name = serializers.CharField(source="album.name", read_only=True)
     is_liked = serializers.SerializerMethodField()
@@ -22,12 +32,10 @@ class TrackMiniSerializer(serializers.ModelSerializer):
             "album_name",
             "is_liked",
         ]
+        list_serializer_class = LikedTracksListSerializer
 
     def get_is_liked(self, obj):
-        user = self.context.get("request").user
-        if not user.is_authenticated:
-            return False
-        return obj.likes.filter(user=user).exists()
+        return get_liked_resolver(self.context).is_liked(obj.id)
 
 
 class LikeSerializer(serializers.ModelSerializer):
@@ -37,12 +45,61 @@ class LikeSerializer(serializers.ModelSerializer):
         model = Like
         fields = ["id", "track"]
         read_only_fields = ["id", "track"]
+        list_serializer_class = LikedTracksListSerializer
+        liked_track_id_attr = "track_id"
 
 
 class ListeningHistorySerializer(serializers.ModelSerializer):
     track = TrackMiniSerializer(read_only=True)
 
     class Meta:
-        model = ListeningHistory
+        model = ListeningEvent
         fields = ["id", "track", "listened_at", "duration", "additional_info"]
         read_only_fields = ["id", "track", "listened_at"]
+        list_serializer_class = LikedTracksListSerializer
+        liked_track_id_attr = "track_id"
+
+
+# --- Lean-версии для list: из .values(), вывод как у сериализаторов выше ---
+TRACK_MINI_LEAN = LeanNested(
+    "track",
+    {
+        "id": "id",
+        "name": "name",
+        "slug": "slug",
+        "cover": LeanMediaField("cover", Track.cover.field),
+        "duration": "duration",
+        "plays_count": "plays_count",
+        "likes_count": "likes_count",
+        "artist_name": "artist__name",
+        "album_name": LeanField("album__name", omit_null=True),
+    },
+)
+
+
+class LikedTrackLeanSerializer(LeanSerializer):
+    """is_liked вложенного трека — одним prime() резолвера на страницу."""
+
+    def represent(self, rows):
+        rows = list(rows)
+        items = super().represent(rows)
+        resolver = get_liked_resolver(self.context)
+        track_ids = [row["track__id"] for row in rows]
+        resolver.prime(track_ids)
+        for item, track_id in zip(items, track_ids):
+            item["track"]["is_liked"] = resolver.is_liked(track_id)
+        return items
+
+
+class LikeLeanSerializer(LikedTrackLeanSerializer):
+    fields = {"id": "id", "track": TRACK_MINI_LEAN}
+
+
+class ListeningHistoryLeanSerializer(LikedTrackLeanSerializer):
+    fields = {
+        "id": "id",
+        "track": TRACK_MINI_LEAN,
+        "listened_at": LeanDateField("listened_at", serializers.DateTimeField()),
+        "duration": "duration",
+        "additional_info": "additional_info",
+    }
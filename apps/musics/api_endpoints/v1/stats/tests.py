@@ -1,8 +1,24 @@
+import json
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
 from django.urls import reverse
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase
-from apps.musics.models import Track, Like, ListeningHistory, Artist
+from apps.musics.models import Track, Like, ListeningEvent, Artist, Album
+from apps.musics.services import likes
 from apps.users.models import User
+from .serializers import LikeSerializer, ListeningHistorySerializer
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
 
 
 class StatsAPITestCase(APITestCase):
@@ -29,7 +45,7 @@ class StatsAPITestCase(APITestCase):
 
         # Create initial data
         Like.objects.create(user=self.user, track=self.track1)
-        ListeningHistory.objects.create(user=self.user, track=self.track2, duration=60)
+        ListeningEvent.objects.create(user=self.user, track=self.track2, duration=60)
 
     def test_like_list_auth(self):
         """Тестируем получение списка лайков аутентифицированным пользователем"""
@@ -86,7 +102,7 @@ class StatsAPITestCase(APITestCase):
         response = self.client.post(self.history_url, data)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(
-            ListeningHistory.objects.filter(user=self.user, track=self.track1).exists()
+            ListeningEvent.objects.filter(user=self.user, track=self.track1).exists()
         )
 
     def test_history_create_anon(self):
@@ -95,3 +111,208 @@ class StatsAPITestCase(APITestCase):
         data = {"track": self.track1.id, "duration": 90}
         response = self.client.post(self.history_url, data)
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_history_detail_by_pk(self):
+        """Запись истории адресуется по pk события"""
+
+        self.client.force_authenticate(user=self.user)
+        event = ListeningEvent.objects.get(user=self.user, track=self.track2)
+        url = reverse("history-detail", args=[event.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["track"]["id"], self.track2.id)
+
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(ListeningEvent.objects.filter(pk=event.pk).exists())
+
+    def test_history_delete_hides_whole_track(self):
+        """Удаление записи убирает трек из истории, а не только последний повтор"""
+
+        earlier = timezone.now() - timezone.timedelta(hours=1)
+        ListeningEvent.objects.filter(user=self.user).update(listened_at=earlier)
+        ListeningEvent.objects.create(user=self.user, track=self.track2, duration=30)
+        ListeningEvent.objects.create(
+            user=self.user,
+            track=self.track1,
+            duration=10,
+            listened_at=earlier - timezone.timedelta(hours=1),
+        )
+
+        self.client.force_authenticate(user=self.user)
+        latest = self.client.get(self.history_url).data["results"][0]
+        self.assertEqual(latest["track"]["id"], self.track2.id)
+        response = self.client.delete(reverse("history-detail", args=[latest["id"]]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        results = self.client.get(self.history_url).data["results"]
+        self.assertEqual([item["track"]["id"] for item in results], [self.track1.id])
+        self.assertEqual(ListeningEvent.objects.filter(user=self.user).count(), 3)
+
+        # Новое прослушивание снова попадает в историю
+        ListeningEvent.objects.create(
+            user=self.user,
+            track=self.track2,
+            duration=5,
+            listened_at=timezone.now() + timezone.timedelta(seconds=1),
+        )
+        results = self.client.get(self.history_url).data["results"]
+        self.assertEqual(
+            [item["track"]["id"] for item in results], [self.track2.id, self.track1.id]
+        )
+
+    def test_history_clear_keeps_log(self):
+        """Очистка скрывает историю пользователя, но не трогает лог прослушиваний"""
+
+        ListeningEvent.objects.create(
+            user=self.other_user, track=self.track1, duration=20
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.delete(reverse("history-clear"))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self.client.get(self.history_url).data["results"], [])
+        self.assertEqual(ListeningEvent.objects.filter(user=self.user).count(), 1)
+
+        self.client.force_authenticate(user=self.other_user)
+        results = self.client.get(self.history_url).data["results"]
+        self.assertEqual(len(results), 1)
+
+    def test_like_list_constant_queries(self):
+        """Количество запросов списка лайков не зависит от числа треков"""
+
+        self.client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.likes_url)
+        baseline = len(ctx.captured_queries)
+
+        for i in range(10):
+            track = Track.objects.create(
+                owner=self.user, name=f"Extra {i}", artist=self.artist, duration=100
+            )
+            Like.objects.create(user=self.user, track=track)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.likes_url)
+        self.assertEqual(len(ctx.captured_queries), baseline)
+        self.assertEqual(len(response.data["results"]), 11)
+        self.assertTrue(
+            all(like["track"]["is_liked"] for like in response.data["results"])
+        )
+
+    def test_history_latest_per_track(self):
+        """История — последнее прослушивание каждого трека, лог хранит все повторы"""
+
+        now = timezone.now()
+        ListeningEvent.objects.create(
+            user=self.user, track=self.track2, duration=30, listened_at=now
+        )
+        ListeningEvent.objects.create(
+            user=self.user,
+            track=self.track1,
+            duration=10,
+            listened_at=now + timezone.timedelta(minutes=1),
+        )
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.history_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data["results"]
+        self.assertEqual(
+            [item["track"]["id"] for item in results], [self.track1.id, self.track2.id]
+        )
+        self.assertEqual(results[1]["duration"], 30)
+        self.assertEqual(ListeningEvent.objects.filter(user=self.user).count(), 3)
+
+    def _serialized(self, serializer_class, queryset, url):
+        """Вывод DRF-сериализатора — эталон для lean-пути списков."""
+        request = RequestFactory().get(url)
+        request.user = self.user
+        data = serializer_class(queryset, many=True, context={"request": request}).data
+        return json.loads(JSONRenderer().render(data))
+
+    def _add_album_track(self):
+        album = Album.objects.create(
+            name="Album 1", artist=self.artist, owner=self.user
+        )
+        track = Track.objects.create(
+            owner=self.user,
+            name="Track 3",
+            artist=self.artist,
+            album=album,
+            duration=90,
+        )
+        Track.objects.filter(pk=track.pk).update(cover="tracks/covers/3.jpg")
+        return track
+
+    def test_like_list_matches_serializer(self):
+        """Lean-список лайков совпадает с LikeSerializer, в т.ч. без альбома"""
+
+        Like.objects.create(user=self.user, track=self._add_album_track())
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.likes_url)
+        expected = self._serialized(
+            LikeSerializer,
+            Like.objects.filter(user=self.user).order_by("-created_at", "-id"),
+            self.likes_url,
+        )
+        self.assertEqual(response.json()["results"], expected)
+        self.assertNotIn("album_name", expected[1]["track"])
+
+    def test_history_list_matches_serializer(self):
+        """Lean-история совпадает с ListeningHistorySerializer"""
+
+        ListeningEvent.objects.create(
+            user=self.user,
+            track=self._add_album_track(),
+            duration=45,
+            additional_info={"device": "web", "shuffle": True},
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.history_url)
+        expected = self._serialized(
+            ListeningHistorySerializer,
+            ListeningEvent.objects.latest_per_track(self.user),
+            self.history_url,
+        )
+        self.assertEqual(response.json()["results"], expected)
+        self.assertEqual(len(expected), 2)
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+class LikedSetWarmingTestCase(SimpleTestCase):
+    """Прогрев набора лайков в Redis не теряет лайк, пришедший во время прогрева"""
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        self.user = SimpleNamespace(pk=7, is_authenticated=True)
+        patcher = mock.patch.object(
+            likes, "get_redis_connection", return_value=self.redis
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _snapshot(self, track_ids, on_read=None):
+        like = mock.Mock()
+
+        def values_list(*args, **kwargs):
+            if on_read:
+                on_read()
+            return list(track_ids)
+
+        like.objects.filter.return_value.values_list.side_effect = values_list
+        return mock.patch.object(likes, "Like", like)
+
+    def test_like_committed_during_warming(self):
+        key = likes.LIKED_SET_KEY.format(self.user.pk)
+        # Лайк трека 2 коммитится, пока прогрев читает БД, и в снимок не попадает
+        with self._snapshot(
+            [1], lambda: likes._update_liked_set(self.user.pk, "sadd", 2)
+        ):
+            self.assertEqual(likes.get_liked_track_ids(self.user, [1, 2]), {1})
+        self.assertFalse(self.redis.exists(key))
+
+        with self._snapshot([1, 2]):
+            self.assertEqual(likes.get_liked_track_ids(self.user, [1, 2]), {1, 2})
+        self.assertTrue(self.redis.exists(key))
+        self.assertFalse(self.redis.keys("musics:likes:user:7:*"))
@@ -4,9 +4,22 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
-from apps.musics.models import Like, ListeningHistory
+from django.utils import timezone
+
+from apps.musics.models import (
+    Like,
+    ListeningEvent,
+    ListeningHistory,
+    ListeningHistoryHide,
+)
+from apps.shared.views.prerendered import LeanListMixin
 from .paginations import StatsPagination
-from .serializers import LikeSerializer, ListeningHistorySerializer
+from .serializers import (
+    LikeLeanSerializer,
+    LikeSerializer,
+    ListeningHistoryLeanSerializer,
+    ListeningHistorySerializer,
+)
 
 
 @extend_schema_view(
@@ -29,17 +42,16 @@ from .serializers import LikeSerializer, ListeningHistorySerializer
         responses={204: OpenApiResponse(description="No Content")},
     ),
 )
-class LikeViewSet(ModelViewSet):
+class LikeViewSet(LeanListMixin, ModelViewSet):
     serializer_class = LikeSerializer
+    lean_serializer_class = LikeLeanSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StatsPagination
 
     def get_queryset(self):
         qs = Like.objects.filter(user=self.request.user)
-        return (
-            qs.select_related("track", "user")
-            .prefetch_related("track__likes")
-            .order_by("-created_at")
+        return qs.select_related("track__artist", "track__album").order_by(
+            "-created_at"
         )
 
     def perform_create(self, serializer):
@@ -54,36 +66,54 @@ class LikeViewSet(ModelViewSet):
         responses={200: ListeningHistorySerializer(many=True)},
     ),
 )
-class ListeningHistoryViewSet(ModelViewSet):
+class ListeningHistoryViewSet(LeanListMixin, ModelViewSet):
     serializer_class = ListeningHistorySerializer
+    lean_serializer_class = ListeningHistoryLeanSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StatsPagination
-    lookup_field = "slug"
+    # Записи истории — события ListeningEvent, у них нет slug
+    lookup_field = "pk"
 
     def get_queryset(self):
-        qs = ListeningHistory.objects.filter(user=self.request.user).order_by(
-            "-listened_at"
-        )[:50]
-        return qs.select_related("track", "user").prefetch_related("track__likes")
+        # Последнее прослушивание каждого трека, выведенное из лога ListeningEvent
+        qs = ListeningEvent.objects.latest_per_track(self.request.user)
+        return qs.select_related("track__artist", "track__album")
 
     # create можно оставить, но обычно записи создаются автоматически при play()
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def perform_destroy(self, instance):
+        # Запись истории — трек целиком: удаление одного события показало бы
+        # предыдущее прослушивание того же трека. Лог остаётся для агрегатов
+        _hide_history(self.request.user, instance.track_id)
+
     @action(detail=False, methods=["delete"], url_path="clear", url_name="clear")
     @extend_schema(
         tags=["Listening History"],
         summary="Clear listening history",
-        description="Delete all listening history records for the authenticated user.",
+        description=(
+            "Hide all listening history records of the authenticated user. "
+            "Listens stay in the log used for charts and recommendations."
+        ),
         responses={204: OpenApiResponse(description="No Content")},
     )
     def clear(self, request, *args, **kwargs):
         user = request.user
-        deleted_count, _ = ListeningHistory.objects.filter(user=user).delete()
+        cleared_count = self.get_queryset().count()
+        _hide_history(user)
+        ListeningHistory.objects.filter(user=user).delete()
         return Response(
-            {"message": f"Cleared {deleted_count} listening history records."},
+            {"message": f"Cleared {cleared_count} listening history records."},
             status=204,
         )
 
 
+def _hide_history(user, track_id=None):
+    """Скрывает из истории прослушивания трека (или все) до текущего момента."""
+    ListeningHistoryHide.objects.update_or_create(
+        user=user, track_id=track_id, defaults={"hidden_at": timezone.now()}
+    )
+
+
 __all__ = ["LikeViewSet", "ListeningHistoryViewSet"]
@@ -1,26 +1,61 @@
-from rest_framework import serializers
-from apps.musics.models import Track, Like as TrackLike, Genre
-
+import logging
 
-class GenreSerializer(serializers.ModelSerializer):
+from django.conf import settings
+from django.db import models, transaction
+from rest_framework import serializers
+from apps.musics.models import Album, Track, Genre
+from apps.musics.services.likes import get_liked_resolver
+from apps.musics.tasks.metadata import extract_track_metadata
+from apps.shared.utils.audio import AudioFormatError, probe_audio
+from apps.shared.utils.lean import (
+    LeanDateField,
+    LeanMany,
+    LeanMediaField,
+    LeanNested,
+    LeanSerializer,
+)
+from apps.shared.utils.signed_media import SignedMediaSerializerMixin
+from apps.shared.utils.sparse import SparseFieldsSerializerMixin
+
+logger = logging.getLogger(__name__)
+
+
+class LikedTracksListSerializer(serializers.ListSerializer):
+    """
+    Перед сериализацией списка одним запросом узнаёт, какие треки лайкнуты.
+    Id трека берётся из атрибута Meta.liked_track_id_attr дочернего сериализатора.
+    """
+
+    def to_representation(self, data):
+        items = list(
+            data.all() if isinstance(data, models.manager.BaseManager) else data
+        )
+        attr = getattr(self.child.Meta, "liked_track_id_attr", "id")
+        get_liked_resolver(self.context).prime([getattr(item, attr) for item in items])
+        return super().to_representation(items)
+
+
+class GenreSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ["id", "name", "slug"]
 
 
-class ArtistSerializer(serializers.ModelSerializer):
+class ArtistSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Track.artist.field.related_model  # это Artist
         fields = ["id", "name", "slug"]
 
 
-class AlbumSerializer(serializers.ModelSerializer):
+class AlbumSerializer(SparseFieldsSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Track.album.field.related_model  # это Album
         fields = ["id", "name", "slug", "cover", "release_date"]
 
 
-class TrackListSerializer(serializers.ModelSerializer):
+class TrackListSerializer(
+    SignedMediaSerializerMixin, SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     artist = ArtistSerializer(read_only=True)
     album = AlbumSerializer(read_only=True)
     is_liked = serializers.SerializerMethodField()
@@ -45,25 +80,58 @@ class TrackListSerializer(serializers.ModelSerializer):
             "plays_count",
             "likes_count",
         ]
+        list_serializer_class = LikedTracksListSerializer
 
     def get_is_liked(self, obj):
-        user = self.context.get("request").user
-        if not user.is_authenticated:
-            return False
-        return TrackLike.objects.filter(user=user, track=obj).exists()
+        return get_liked_resolver(self.context).is_liked(obj.id)
 
 
-class TrackDetailSerializer(serializers.ModelSerializer):
+class TrackLeanSerializer(LeanSerializer):
+    """TrackListSerializer без is_liked из .values() — для JSON-фрагментов списка."""
+
+    fields = {
+        "id": "id",
+        "name": "name",
+        "slug": "slug",
+        "description": "description",
+        "release_date": LeanDateField("release_date"),
+        "artist": LeanNested("artist", {"id": "id", "name": "name", "slug": "slug"}),
+        "album": LeanNested(
+            "album",
+            {
+                "id": "id",
+                "name": "name",
+                "slug": "slug",
+                "cover": LeanMediaField("cover", Album.cover.field),
+                "release_date": LeanDateField("release_date"),
+            },
+            allow_null=True,
+        ),
+        "audio": LeanMediaField("audio", Track.audio.field),
+        "cover": LeanMediaField("cover", Track.cover.field),
+        "duration": "duration",
+        "genres": LeanMany(Track.genres, {"id": "id", "name": "name", "slug": "slug"}),
+        "is_published": "is_published",
+        "plays_count": "plays_count",
+        "likes_count": "likes_count",
+    }
+
+
+class TrackDetailSerializer(
+    SignedMediaSerializerMixin, SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     artist = ArtistSerializer(read_only=True)
     album = AlbumSerializer(read_only=True)
     genres = GenreSerializer(many=True, read_only=True)
 
     class Meta:
         model = Track
-        fields = "__all__"
+        exclude = ["search_vector"]
 
 
-class TrackCreateUpdateSerializer(serializers.ModelSerializer):
+class TrackCreateUpdateSerializer(
+    SignedMediaSerializerMixin, serializers.ModelSerializer
+):
     owner = serializers.HiddenField(default=serializers.CurrentUserDefault())
     genres = serializers.PrimaryKeyRelatedField(queryset=Genre.objects.all(), many=True)
 
@@ -74,9 +142,52 @@ class TrackCreateUpdateSerializer(serializers.ModelSerializer):
             "artist",
             "album",
             "duration",
+            "bitrate",
             "audio",
             "cover",
             "genres",
             "owner",
             "is_published",
         ]
+        read_only_fields = ["bitrate"]
+        # Вычисляется из заголовков audio; от клиента — только если файл не разобрать
+        extra_kwargs = {"duration": {"required": False}}
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        audio = attrs.get("audio")
+        self._scan_audio_later = False
+        if audio is not None:
+            # Без Xing/VBRI длительность MP3 — оценка; мелкие файлы сразу
+            # проходятся по кадрам, крупные — в фоновой задаче после сохранения
+            scan = audio.size <= settings.AUDIO_METADATA_SCAN_MAX_BYTES
+            try:
+                info = probe_audio(audio, audio.size, scan=scan)
+            except AudioFormatError:
+                info = None
+            finally:
+                audio.seek(0)
+            if info is not None:
+                attrs["duration"] = info.seconds
+                attrs["bitrate"] = info.bitrate
+                self._scan_audio_later = not info.exact
+        # Track.duration — NOT NULL: без неё create упал бы IntegrityError (500)
+        if self.instance is None and attrs.get("duration") is None:
+            raise serializers.ValidationError(
+                {"duration": "Cannot be read from the audio file, send it."}
+            )
+        return attrs
+
+    def save(self, **kwargs):
+        track = super().save(**kwargs)
+        if getattr(self, "_scan_audio_later", False):
+            transaction.on_commit(lambda: _enqueue_metadata(track.pk))
+        return track
+
+
+def _enqueue_metadata(track_id):
+    try:
+        extract_track_metadata.delay(track_id)
+    except Exception:
+        # Брокер недоступен: остаётся оценка, уточнит backfill_track_metadata
+        logger.exception("Failed to enqueue metadata of track %s", track_id)
@@ -1,16 +1,56 @@
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import uuid
+import wave
+from unittest import mock
+
+import numpy as np
+
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError, connection, transaction
+from django.test import RequestFactory, override_settings
+from django.db.models import F, Q
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from apps.musics.models import Track, Artist, Album
+from apps.musics.models import (
+    Track,
+    Artist,
+    Album,
+    Genre,
+    Like,
+    ListeningEvent,
+    Playlist,
+    SimilarityBuild,
+    TrackSimilarity,
+    TrackWaveform,
+)
+from apps.musics.services.counters import reconcile_counters
+from apps.musics.services.events import flush_local_events, ingest_events, write_events
+from apps.musics.services.metadata import update_track_metadata
+from apps.musics.services.similarity import build_track_similarities
+from apps.musics.services.transcoding import TranscodingError, build_track_renditions
+from apps.musics.services.waveforms import build_track_waveform
+from apps.shared.utils.waveform import decode_waveform
+from .serializers import TrackListSerializer
 
 User = get_user_model()
 
 
 class TrackAPITestCase(APITestCase):
     def setUp(self):
+        # События из локального буфера не должны перетекать в другие тесты
+        self.addCleanup(flush_local_events)
         self.user = User.objects.create_user(
             username="user", email="user@example.com", password="pass123"
         )
@@ -63,7 +103,7 @@ class TrackAPITestCase(APITestCase):
         response = self.client.get(self.list_url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
-        results = response.data
+        results = response.data["results"]
         self.assertEqual(len(results), 2)  # только опубликованные
         names = {t["name"] for t in results}
         self.assertEqual(names, {"Track One", "Other Song"})
@@ -76,6 +116,139 @@ class TrackAPITestCase(APITestCase):
         self.assertEqual(response.data["name"], self.track1.name)
         self.assertEqual(response.data["artist_name"], self.artist.name)
 
+    @override_settings(
+        LISTENING_EVENTS_LOCAL_BUFFER_SIZE=100,
+        LISTENING_EVENTS_LOCAL_FLUSH_INTERVAL=3600,
+    )
+    def test_retrieve_queues_listening_event(self):
+        """Просмотр трека ничего не пишет в БД, событие пишет консьюмер очереди"""
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(self.detail_url(self.track1.slug))
+        self.assertFalse(
+            [q for q in ctx.captured_queries if "INSERT" in q["sql"].upper()]
+        )
+        self.client.get(self.detail_url(self.track1.slug))
+        self.assertFalse(ListeningEvent.objects.exists())
+
+        ingest_events()
+        events = ListeningEvent.objects.filter(user=self.user, track=self.track1)
+        self.assertEqual(events.count(), 2)
+        self.assertEqual(events.first().event_type, "view")
+
+    def test_write_events_is_idempotent(self):
+        """Повторная доставка пачки событий не создаёт дублей"""
+        batch = [
+            {
+                "id": uuid.uuid4().hex,
+                "e": "play",
+                "u": self.user.id,
+                "t": self.track1.id,
+                "ts": "1700000000.5",
+            }
+        ]
+        write_events(batch)
+        write_events(batch)
+        self.assertEqual(ListeningEvent.objects.filter(event_type="play").count(), 1)
+
+    def test_write_events_skips_orphans(self):
+        """События удалённого трека и битые события не валят пачку"""
+        gone = Track.objects.create(
+            owner=self.user, name="Gone", artist=self.artist, duration=100
+        )
+        gone_id = gone.id
+        gone.delete()
+
+        def event(track_id, **extra):
+            return {
+                "id": uuid.uuid4().hex,
+                "e": "play",
+                "u": self.user.id,
+                "t": track_id,
+                "ts": "1700000000.5",
+                **extra,
+            }
+
+        batch = [event(self.track1.id), event(gone_id), event("x"), event(1, e="?")]
+        self.assertEqual(write_events(batch), 1)
+        self.assertEqual(ListeningEvent.objects.get().track_id, self.track1.id)
+
+    def test_skip_track(self):
+        url = reverse("track-skip", kwargs={"slug": self.track1.slug})
+        response = self.client.post(url, {"duration": 12})
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        ingest_events()
+        event = ListeningEvent.objects.get(event_type="skip")
+        self.assertEqual(event.duration, 12)
+
+    def test_similar_uses_precomputed_neighbours(self):
+        """/similar/ отдаёт соседей по совместным прослушиваниям"""
+        track3 = Track.objects.create(
+            owner=self.user, name="Third", artist=self.artist, duration=100
+        )
+        listeners = [self.user] + [
+            User.objects.create_user(
+                username=f"listener{i}", email=f"l{i}@example.com", password="pass"
+            )
+            for i in range(2)
+        ]
+        for listener in listeners:
+            ListeningEvent.objects.create(user=listener, track=self.track1)
+            ListeningEvent.objects.create(user=listener, track=self.track2)
+        for listener in listeners[:2]:
+            ListeningEvent.objects.create(user=listener, track=track3)
+
+        self.assertEqual(build_track_similarities(), 3)
+        url = reverse("track-similar", args=[self.track1.slug])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [t["id"] for t in response.data], [self.track2.id, track3.id]
+        )
+
+        # Инкремент: трек с новыми прослушиваниями и его соседи, сходство симметрично
+        ListeningEvent.objects.create(user=listeners[2], track=track3)
+        self.assertEqual(build_track_similarities(), 3)
+        self.assertEqual(
+            TrackSimilarity.objects.get(track=self.track1, similar_track=track3).score,
+            TrackSimilarity.objects.get(track=track3, similar_track=self.track1).score,
+        )
+
+        # Прослушивания, выпавшие из окна, тоже делают трек грязным
+        SimilarityBuild.objects.update(
+            started_at=F("started_at") - timezone.timedelta(days=2)
+        )
+        ListeningEvent.objects.filter(track=track3).update(
+            listened_at=timezone.now()
+            - timezone.timedelta(days=settings.SIMILAR_TRACKS_WINDOW_DAYS + 1)
+        )
+        self.assertEqual(build_track_similarities(), 3)
+        self.assertFalse(
+            TrackSimilarity.objects.filter(
+                Q(track=track3) | Q(similar_track=track3)
+            ).exists()
+        )
+
+    def test_similar_fallback_follows_genre_changes(self):
+        """Запасной /similar/ по жанрам сбрасывается, когда жанры меняются"""
+        rock = Genre.objects.create(name="Rock")
+        self.track1.genres.add(rock)
+        track3 = Track.objects.create(
+            owner=self.user,
+            name="Third",
+            artist=Artist.objects.create(name="Artist 2", owner=self.user),
+            duration=100,
+            is_published=True,
+        )
+        url = reverse("track-similar", args=[self.track1.slug])
+        response = self.client.get(url)
+        self.assertEqual([t["id"] for t in response.data], [self.track2.id])
+
+        track3.genres.add(rock)
+        response = self.client.get(url)
+        self.assertCountEqual(
+            [t["id"] for t in response.data], [self.track2.id, track3.id]
+        )
+
     # ---------------- Auth Create & Update ----------------
     def test_create_track_anon(self):
         """Тестируем создание трека анонимным пользователем (должно быть запрещено)"""
@@ -110,6 +283,82 @@ class TrackAPITestCase(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertTrue(Track.objects.filter(name="Track 3").exists())
 
+    def _wav(self, seconds):
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(8000)
+            w.writeframes(b"\x00" * 2 * 8000 * seconds)
+        return buffer.getvalue()
+
+    def test_create_track_reads_duration_from_audio(self):
+        """duration и bitrate берутся из заголовков файла, а не от клиента"""
+        audio_file = SimpleUploadedFile("audio3.wav", self._wav(3), "audio/wav")
+        data = {
+            "name": "Track 3",
+            "artist": self.artist.id,
+            "duration": 100,
+            "audio": audio_file,
+        }
+        response = self._auth_post(self.list_url, data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["duration"], 3)
+        self.assertEqual(response.data["bitrate"], 128)
+        track = Track.objects.get(name="Track 3")
+        self.assertEqual(track.audio.read(), self._wav(3))
+
+        # Нечитаемый файл без duration — ошибка валидации
+        data = {
+            "name": "Track 4",
+            "artist": self.artist.id,
+            "audio": SimpleUploadedFile("audio4.mp3", b"file_content"),
+        }
+        response = self._auth_post(self.list_url, data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("duration", response.data)
+        self.assertFalse(Track.objects.filter(name="Track 4").exists())
+
+        # Клиентская duration — запасной вариант для нечитаемого файла
+        data["duration"] = 42
+        data["audio"] = SimpleUploadedFile("audio4.mp3", b"file_content")
+        response = self._auth_post(self.list_url, data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["duration"], 42)
+
+    @override_settings(
+        AUDIO_METADATA_SCAN_MAX_BYTES=0, TRANSCODING_ENABLED=False, WAVEFORM_ENABLED=False
+    )
+    def test_large_mp3_is_measured_in_background(self):
+        # CBR без Xing: 200 кадров 128 kbps — оценка в запросе, точный проход в задаче
+        frame = b"\xff\xfb\x90\x00" + b"\x00" * 413
+        data = {
+            "name": "Track 3",
+            "artist": self.artist.id,
+            "audio": SimpleUploadedFile("audio3.mp3", frame * 200),
+        }
+        with mock.patch(
+            "apps.musics.api_endpoints.v1.track.serializers.extract_track_metadata"
+        ) as task, self.captureOnCommitCallbacks(execute=True):
+            response = self._auth_post(self.list_url, data, format="multipart")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        track = Track.objects.get(name="Track 3")
+        task.delay.assert_called_once_with(track.pk)
+
+    def test_update_track_metadata_refreshes_playlists(self):
+        playlist = Playlist.objects.create(name="Mix", owner=self.user)
+        playlist.tracks.add(self.track1, self.track2)
+        name = default_storage.save("tracks/audio/five.wav", io.BytesIO(self._wav(5)))
+        Track.objects.filter(pk=self.track1.pk).update(audio=name)
+
+        self.assertEqual(update_track_metadata([self.track1.pk, self.track2.pk]), 1)
+        self.track1.refresh_from_db()
+        self.assertEqual((self.track1.duration, self.track1.bitrate), (5, 128))
+        playlist.refresh_from_db()
+        self.assertEqual(playlist.total_duration, 5 + 150)
+        # Повторный проход ничего не меняет
+        self.assertEqual(update_track_metadata([self.track1.pk]), 0)
+
     # ---------------- Play & Like ----------------
     def test_play_increment(self):
         """Тестируем увеличение счетчика прослушиваний"""
@@ -122,10 +371,24 @@ class TrackAPITestCase(APITestCase):
         self.track1.refresh_from_db()
         self.assertEqual(self.track1.plays_count, 1)
 
+    def test_play_propagates_to_album_and_artist(self):
+        """Без Redis прослушивание пишется сразу в трек, альбом и артиста"""
+        response = self._auth_post(self.play_url(self.track1.slug))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["plays_count"], 1)
+        # Контракт ответа прежний — полный TrackDetailSerializer
+        self.assertEqual(response.data["slug"], self.track1.slug)
+        self.assertEqual(response.data["name"], self.track1.name)
+        self.album.refresh_from_db()
+        self.artist.refresh_from_db()
+        self.assertEqual(self.album.plays_count, 1)
+        self.assertEqual(self.artist.total_plays, 1)
+
     def test_like_increment(self):
         """Тестируем увеличение счетчика лайков"""
         try:
-            response = self._auth_post(self.like_url(self.track1.slug))
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self._auth_post(self.like_url(self.track1.slug))
         except Exception:
             self.skipTest("Endpoint track-like не реализован")
             return
@@ -133,17 +396,511 @@ class TrackAPITestCase(APITestCase):
         self.track1.refresh_from_db()
         self.assertEqual(self.track1.likes_count, 1)
 
+    def test_like_propagates_to_album_and_artist(self):
+        """Лайк и его снятие доходят до альбома и артиста"""
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._auth_post(self.like_url(self.track1.slug))
+        self.assertEqual(response.data["likes_count"], 1)
+        self.album.refresh_from_db()
+        self.artist.refresh_from_db()
+        self.assertEqual((self.album.likes_count, self.artist.total_likes), (1, 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self._auth_post(self.like_url(self.track1.slug))
+        self.assertEqual(response.data["likes_count"], 0)
+        self.artist.refresh_from_db()
+        self.assertEqual(self.artist.total_likes, 0)
+
+    def test_like_cascades_skip_per_like_track_loads(self):
+        """Каскадное удаление лайков не грузит трек и не двигает счётчики удаляемого"""
+        listeners = [
+            User.objects.create_user(
+                username=f"fan{i}", email=f"fan{i}@example.com", password="pass"
+            )
+            for i in range(3)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            for listener in listeners:
+                Like.objects.create(user=listener, track=self.track1)
+
+        # Лайки пользователя снимаются одним батчем, вместе с альбомом и артистом
+        with self.captureOnCommitCallbacks(execute=True):
+            listeners[0].delete()
+        self.track1.refresh_from_db()
+        self.album.refresh_from_db()
+        self.artist.refresh_from_db()
+        self.assertEqual(self.track1.likes_count, 2)
+        self.assertEqual((self.album.likes_count, self.artist.total_likes), (2, 2))
+
+        track = Track.objects.get(pk=self.track1.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            track.delete()
+        self.assertFalse(
+            [
+                q
+                for q in ctx.captured_queries
+                if q["sql"].startswith("UPDATE")
+                or q["sql"].startswith('SELECT "musics_tracks"')
+            ]
+        )
+
+    def test_like_rollback_keeps_counters(self):
+        """Откат транзакции с лайком не двигает счётчики"""
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Like.objects.create(user=self.user, track=self.track1)
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+        self.track1.refresh_from_db()
+        self.artist.refresh_from_db()
+        self.assertEqual((self.track1.likes_count, self.artist.total_likes), (0, 0))
+
+    def test_reconcile_counters(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Like.objects.create(user=self.user, track=self.track2)
+        Track.objects.filter(pk=self.track1.pk).update(plays_count=7, likes_count=5)
+        Track.objects.filter(pk=self.track2.pk).update(plays_count=3)
+
+        report = reconcile_counters(fix=False)
+        self.assertEqual(report["track:likes"], {"rows": 1, "drift": 5})
+        self.assertEqual(report["artist:plays"], {"rows": 1, "drift": 10})
+
+        reconcile_counters()
+        self.artist.refresh_from_db()
+        self.album.refresh_from_db()
+        self.assertEqual((self.artist.total_plays, self.artist.total_likes), (10, 1))
+        self.assertEqual((self.album.plays_count, self.album.likes_count), (7, 0))
+        self.assertFalse(any(r["rows"] for r in reconcile_counters().values()))
+
     # ---------------- Filters & Search ----------------
     def test_filter_by_artist(self):
         """Тестируем фильтрацию треков по артисту"""
         response = self.client.get(self.list_url, {"artist": self.artist.id})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
+        self.assertEqual(len(response.data["results"]), 2)
 
     def test_search_by_name(self):
         """Тестируем поиск треков по имени"""
         response = self.client.get(self.list_url, {"search": "Track One"})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        results = response.data
+        results = response.data["results"]
         self.assertEqual(len(results), 1)
         self.assertEqual(results[0]["name"], "Track One")
+
+    # ---------------- Query budget ----------------
+    def _count_list_queries(self):
+        # Валидатор conditional GET кэшируется — каждый замер считает его заново
+        cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response
+
+    def test_list_tracks_constant_queries(self):
+        """Количество запросов списка треков не зависит от размера страницы"""
+        baseline, _ = self._count_list_queries()
+
+        genre = Genre.objects.create(name="Rock")
+        for i in range(10):
+            track = Track.objects.create(
+                owner=self.user,
+                name=f"Extra {i}",
+                artist=self.artist,
+                album=self.album,
+                duration=100,
+            )
+            track.genres.add(genre)
+            if i % 2:
+                Like.objects.create(user=self.user, track=track)
+
+        queries, response = self._count_list_queries()
+        self.assertEqual(queries, baseline)
+        liked = {t["name"] for t in response.data["results"] if t["is_liked"]}
+        self.assertEqual(liked, {f"Extra {i}" for i in range(1, 10, 2)})
+
+    # ---------------- Conditional GET ----------------
+    def test_retrieve_track_not_modified(self):
+        """Повторный запрос с ETag получает 304; лайк меняет валидатор пользователя"""
+        cache.clear()
+        url = self.detail_url(self.track1.slug)
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertIn("Authorization", response["Vary"])
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+        # Лайк сдвигает тег likes:<user> — валидатор пересчитывается сразу
+        self._auth_post(self.like_url(self.track1.slug))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_tracks_not_modified_since(self):
+        """If-Modified-Since по max(updated_at) списка; новый трек меняет валидатор"""
+        cache.clear()
+        response = self.client.get(self.list_url)
+        last_modified = response["Last-Modified"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.list_url, HTTP_IF_MODIFIED_SINCE=last_modified
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Тот же updated_at, что у существующего трека: валидатор ловит и COUNT
+        Track.objects.create(
+            owner=self.user,
+            name="New",
+            artist=self.artist,
+            duration=100,
+            is_published=True,
+        )
+        Track.objects.filter(name="New").update(updated_at=self.track1.updated_at)
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    # ---------------- Anonymous response cache ----------------
+    def test_anonymous_list_served_from_response_cache(self):
+        """Аноним получает готовые байты из кэша; ключ не зависит от порядка параметров"""
+        cache.clear()
+        self.client.force_authenticate(user=None)
+        response = self.client.get(self.list_url + "?ordering=duration&search=")
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.list_url + "?search=&ordering=duration")
+        self.assertEqual(cached["X-Cache"], "HIT")
+        self.assertEqual(cached.content, response.content)
+        self.assertIn("Accept-Language", cached["Vary"])
+
+        # Другой язык — другой ключ
+        response = self.client.get(
+            self.list_url, {"ordering": "duration"}, HTTP_ACCEPT_LANGUAGE="ru"
+        )
+        self.assertEqual(response["X-Cache"], "MISS")
+
+        # Правка каталога сбрасывает запись через тег "tracks"
+        Track.objects.create(
+            owner=self.user,
+            name="Fresh",
+            artist=self.artist,
+            duration=90,
+            is_published=True,
+        )
+        response = self.client.get(self.list_url, {"ordering": "duration"})
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["results"][0]["name"], "Fresh")
+
+    def test_authenticated_requests_bypass_response_cache(self):
+        response = self.client.get(self.detail_url(self.track1.slug))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("X-Cache", response)
+
+    # ---------------- Keyset pagination ----------------
+    def test_list_tracks_keyset_pagination(self):
+        """Курсоры проходят одинаковые plays_count без пропусков и дублей"""
+        for i in range(23):
+            Track.objects.create(
+                owner=self.user,
+                name=f"Page {i}",
+                artist=self.artist,
+                duration=100 + i,
+                plays_count=i % 3,
+            )
+        expected = list(
+            Track.objects.filter(is_published=True)
+            .order_by("-plays_count", "-id")
+            .values_list("id", flat=True)
+        )
+
+        pages, url = [], self.list_url + "?page_size=7"
+        while url:
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append([t["id"] for t in response.data["results"]])
+            if len(pages) == 1:
+                first_page_queries = len(ctx.captured_queries)
+            else:
+                # Дальние страницы стоят столько же запросов, сколько первая
+                self.assertEqual(len(ctx.captured_queries), first_page_queries)
+            url = response.data["next"]
+        self.assertEqual([pk for page in pages for pk in page], expected)
+        self.assertEqual([len(page) for page in pages], [7, 7, 7, 4])
+
+        response = self.client.get(response.data["previous"])
+        self.assertEqual([t["id"] for t in response.data["results"]], pages[-2])
+
+    def test_list_tracks_rejects_foreign_cursor(self):
+        response = self.client.get(self.list_url, {"page_size": 1})
+        cursor = response.data["next"].split("cursor=")[1]
+        response = self.client.get(self.list_url, {"cursor": cursor + "x"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        # Курсор другой сортировки тоже недействителен
+        response = self.client.get(
+            self.list_url, {"cursor": cursor, "ordering": "duration"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    # ---------------- JSON fragment cache ----------------
+    def test_list_fragments_match_serializer(self):
+        """Склеенные фрагменты дают то же, что TrackListSerializer"""
+        Like.objects.create(user=self.user, track=self.track2)
+        self.track1.genres.add(Genre.objects.create(name="Rock"))
+        cache.clear()
+        for _ in range(2):
+            response = self.client.get(self.list_url)
+            request = RequestFactory().get(self.list_url)
+            request.user = self.user
+            expected = TrackListSerializer(
+                Track.objects.filter(is_published=True).order_by("-plays_count", "-id"),
+                many=True,
+                context={"request": request},
+            ).data
+            self.assertEqual(response.json()["results"], expected)
+            self.assertEqual(response["Content-Type"], "application/json")
+
+    def test_warm_list_skips_serializer_queries(self):
+        self.client.get(self.list_url)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url, {"ordering": "duration"})
+        self.assertEqual(len(response.data["results"]), 2)
+        # Артист, альбом и жанры уже во фрагментах
+        self.assertFalse(
+            [q for q in ctx.captured_queries if "musics_genre" in q["sql"]]
+        )
+
+    def test_list_fragments_follow_nested_changes(self):
+        self.client.get(self.list_url)
+        self.artist.name = "Renamed"
+        self.artist.save()
+        self.track2.genres.add(Genre.objects.create(name="Jazz"))
+        response = self.client.get(self.list_url)
+        self.assertEqual(
+            {t["artist"]["name"] for t in response.data["results"]}, {"Renamed"}
+        )
+        track2 = next(t for t in response.data["results"] if t["id"] == self.track2.id)
+        self.assertEqual([g["name"] for g in track2["genres"]], ["Jazz"])
+
+    # ---------------- ?fields= / ?include= ----------------
+    def test_sparse_fields_trim_response_and_select(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.list_url, {"fields": "id,name,artist.name"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        for track in response.data["results"]:
+            self.assertEqual(set(track), {"id", "name", "artist"})
+            self.assertEqual(track["artist"], {"name": "Artist 1"})
+        page_sql = next(
+            q["sql"]
+            for q in ctx.captured_queries
+            if '"musics_tracks"."name"' in q["sql"]
+        )
+        self.assertNotIn('"musics_tracks"."description"', page_sql)
+        self.assertNotIn('"musics_albums"', page_sql)
+        self.assertFalse(any("musics_genres" in q["sql"] for q in ctx.captured_queries))
+
+    def test_sparse_include_drops_relations(self):
+        self.track1.genres.add(Genre.objects.create(name="Rock"))
+        url = self.detail_url(self.track1.slug)
+        response = self.client.get(url, {"include": "album"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["album"]["name"], "Album 1")
+        self.assertNotIn("artist", response.data)
+        self.assertNotIn("genres", response.data)
+        self.assertIn("lyrics", response.data)
+
+        full = self.client.get(url)
+        self.assertEqual(full.data["genres"][0]["name"], "Rock")
+
+    def test_sparse_unknown_field(self):
+        response = self.client.get(
+            self.list_url, {"fields": "name,secret", "include": "name"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+        self.assertIn("include", response.data)
+
+    # ---------------- Stream ----------------
+    def test_stream_range(self):
+        url = reverse("track-stream", args=[self.track1.slug])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(b"".join(response.streaming_content), b"file_content")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+        response = self.client.get(url, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(b"".join(response.streaming_content), b"le_c")
+        self.assertEqual(response["Content-Range"], "bytes 2-5/12")
+        self.assertEqual(response["Content-Length"], "4")
+
+        response = self.client.get(url, HTTP_RANGE="bytes=-3")
+        self.assertEqual(b"".join(response.streaming_content), b"ent")
+
+        response = self.client.get(url, HTTP_RANGE="bytes=100-")
+        self.assertEqual(
+            response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+        )
+        self.assertEqual(response["Content-Range"], "bytes */12")
+
+    @override_settings(MEDIA_ACCEL_REDIRECT=True)
+    def test_stream_accel_redirect(self):
+        url = reverse("track-stream", args=[self.track1.slug])
+        response = self.client.get(url, HTTP_RANGE="bytes=2-5")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response["X-Accel-Redirect"], f"/protected-media/{self.track1.audio.name}"
+        )
+        self.assertEqual(response["Content-Type"], "audio/mpeg")
+        self.assertEqual(response.content, b"")
+
+    def test_stream_access(self):
+        Track.objects.filter(pk=self.track2.pk).update(is_published=False)
+        response = self.client.get(reverse("track-stream", args=[self.track2.slug]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.client.force_authenticate(user=None)
+        response = self.client.get(reverse("track-stream", args=[self.track1.slug]))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(MEDIA_SIGNING_SECRET="s3cret")
+    def test_signed_media_urls(self):
+        detail = self.client.get(self.detail_url(self.track1.slug)).data
+        self.assertIn("md5=", detail["audio"])
+        self.assertIn("tier=free", detail["audio"])
+
+        # Фрагменты списка — свои для каждого уровня подписки
+        listed = self.client.get(self.list_url).data["results"]
+        track1 = next(t for t in listed if t["id"] == self.track1.id)
+        self.assertEqual(track1["audio"], detail["audio"])
+
+        self.user.subscription_type = User.SubscriptionTypeChoices.PREMIUM
+        self.user.save()
+        listed = self.client.get(self.list_url).data["results"]
+        self.assertTrue(all("tier=premium" in t["audio"] for t in listed))
+
+    # ---------------- HLS renditions ----------------
+    def _fake_ffmpeg(self, returncode=0):
+        """subprocess.run для ffmpeg: два сегмента и плейлист на каждый выход"""
+
+        def run(command, **kwargs):
+            for arg in command:
+                if arg.endswith("index.m3u8"):
+                    output = os.path.dirname(arg)
+                    for name in ("00000.ts", "00001.ts"):
+                        with open(os.path.join(output, name), "wb") as f:
+                            f.write(b"ts")
+                    with open(arg, "w") as f:
+                        f.write(
+                            "#EXTM3U\n#EXTINF:6.0,\n00000.ts\n"
+                            "#EXTINF:6.0,\n00001.ts\n#EXT-X-ENDLIST\n"
+                        )
+            return subprocess.CompletedProcess(command, returncode, b"", b"boom")
+
+        return mock.patch("subprocess.run", side_effect=run)
+
+    def _media_root(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        return override_settings(MEDIA_ROOT=root)
+
+    @override_settings(TRANSCODING_BITRATES=[64, 128, 256])
+    def test_transcode_is_idempotent(self):
+        Track.objects.filter(pk=self.track1.pk).update(bitrate=192)
+        with self._media_root(), self._fake_ffmpeg() as run:
+            self.assertEqual(build_track_renditions(self.track1.pk), 2)
+            # Один проход ffmpeg на все битрейты, без апскейла выше исходного
+            self.assertEqual(run.call_count, 1)
+            self.assertEqual(build_track_renditions(self.track1.pk), 0)
+            self.assertEqual(run.call_count, 1)
+
+            renditions = list(self.track1.renditions.all())
+            self.assertEqual([r.bitrate for r in renditions], [64, 128])
+            self.assertTrue(all(r.status == "ready" for r in renditions))
+            self.assertEqual(renditions[0].segments, 2)
+            self.assertTrue(default_storage.exists(renditions[0].playlist))
+
+    def test_transcode_failure_is_retried(self):
+        with self._media_root(), self._fake_ffmpeg(returncode=1):
+            with self.assertRaises(TranscodingError):
+                build_track_renditions(self.track1.pk)
+        self.assertTrue(
+            all(r.status == "failed" for r in self.track1.renditions.all())
+        )
+        self.assertIn("boom", self.track1.renditions.first().error)
+
+        # Повтор задачи собирает упавшие версии заново
+        with self._media_root(), self._fake_ffmpeg():
+            built = build_track_renditions(self.track1.pk)
+        self.assertEqual(built, len(settings.TRANSCODING_BITRATES))
+
+    @override_settings(TRANSCODING_BITRATES=[64, 128], MEDIA_SIGNING_SECRET="s3cret")
+    def test_stream_prefers_renditions(self):
+        url = reverse("track-stream", args=[self.track1.slug])
+        with self._media_root(), self._fake_ffmpeg():
+            build_track_renditions(self.track1.pk)
+
+            response = self.client.get(url)
+            self.assertEqual(response["Content-Type"], "application/vnd.apple.mpegurl")
+            master = response.content.decode().splitlines()
+            self.assertEqual(master[0], "#EXTM3U")
+            self.assertIn(f"http://testserver{url}hls/128/", master)
+
+            def hls_url(bitrate):
+                return reverse("track-stream-hls", args=[self.track1.slug, bitrate])
+
+            response = self.client.get(hls_url(64))
+            segments = [
+                line
+                for line in response.content.decode().splitlines()
+                if not line.startswith("#")
+            ]
+            self.assertEqual(len(segments), 2)
+            self.assertTrue(
+                segments[0].startswith(
+                    "http://testserver/media/tracks/hls/"
+                    f"{self.track1.pk}/64k/00000.ts?md5="
+                )
+            )
+            response = self.client.get(hls_url(256))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        # Исходный файл по-прежнему доступен
+        response = self.client.get(url, {"original": "1"})
+        self.assertEqual(b"".join(response.streaming_content), b"file_content")
+
+    # ---------------- Waveform ----------------
+    def test_waveform(self):
+        pcm = np.arange(-20000, 20000, 4, dtype="<i2").tobytes()
+        decoded = subprocess.CompletedProcess([], 0, pcm, b"")
+        with mock.patch("subprocess.run", return_value=decoded) as run:
+            self.assertTrue(build_track_waveform(self.track1.pk))
+            # Волна текущего audio уже есть — повторно не декодируем
+            self.assertFalse(build_track_waveform(self.track1.pk))
+        self.assertEqual(run.call_count, 1)
+
+        url = reverse("track-waveform", args=[self.track1.slug])
+        self.client.force_authenticate(user=None)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/octet-stream")
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn(
+            f"max-age={settings.WAVEFORM_MAX_AGE}", response["Cache-Control"]
+        )
+        _, _, peaks = decode_waveform(response.content)
+        self.assertEqual(len(peaks), 2 * TrackWaveform.objects.get().buckets)
+        self.assertEqual((peaks.min(), peaks.max()), (-79, 78))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Пики старого файла после замены audio не отдаются
+        Track.objects.filter(pk=self.track1.pk).update(audio="tracks/audio/new.mp3")
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
@@ -1,25 +1,49 @@
+import time
+
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.utils import timezone
-from django.core.cache import cache
-from django.db.models import F
+from django.conf import settings
 from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from rest_framework import filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework import status
-from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiParameter,
+    OpenApiResponse,
+)
 
-from apps.musics.models import Track, Like as TrackLike
-from apps.musics.models.stats import ListeningHistory
+from apps.musics.models import Track, TrackWaveform, Like as TrackLike
+from apps.musics.models.stats import ListeningEvent
+from apps.musics.services.counters import get_pending_delta, record_play
+from apps.musics.services.events import track_event
+from apps.musics.services.fragments import get_track_fragments, with_field
+from apps.musics.services.likes import get_liked_resolver
+from apps.musics.services.transcoding import (
+    master_playlist,
+    media_playlist,
+    ready_renditions,
+)
 from .serializers import (
     TrackListSerializer,
     TrackDetailSerializer,
     TrackCreateUpdateSerializer,
 )
-from apps.shared.paginations.base import SmallResultsSetPagination
+from apps.shared.paginations.keyset import KeysetPagination
 from apps.shared.permissions.base import IsOwnerOrReadOnly
+from apps.shared.utils.tagged_cache import get_or_set_tagged
+from apps.shared.views.conditional import ConditionalGetMixin
+from apps.shared.utils.signed_media import MediaSigner
+from apps.shared.views.media import media_response, playlist_response
+from apps.shared.views.prerendered import FragmentListMixin
+from apps.shared.views.response_cache import AnonymousResponseCacheMixin
+from apps.shared.views.sparse import SPARSE_PARAMETERS, SparseFieldsetMixin
 
 
 @extend_schema_view(
@@ -27,12 +51,14 @@ from apps.shared.permissions.base import IsOwnerOrReadOnly
         tags=["Tracks"],
         summary="Get all tracks",
         description="Retrieve a list of all published tracks.",
+        parameters=SPARSE_PARAMETERS,
         responses={200: TrackListSerializer(many=True)},
     ),
     retrieve=extend_schema(
         tags=["Tracks"],
         summary="Get track details",
         description="Retrieve detailed information about a specific track by ID.",
+        parameters=SPARSE_PARAMETERS,
         responses={200: TrackDetailSerializer},
     ),
     create=extend_schema(
@@ -63,9 +89,16 @@ from apps.shared.permissions.base import IsOwnerOrReadOnly
         responses={204: OpenApiResponse(description="Track successfully deleted")},
     ),
 )
-class TrackViewSet(ModelViewSet):
+class TrackViewSet(
+    ConditionalGetMixin,
+    AnonymousResponseCacheMixin,
+    SparseFieldsetMixin,
+    FragmentListMixin,
+    ModelViewSet,
+):
     queryset = Track.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
+    pagination_class = KeysetPagination
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -76,10 +109,49 @@ class TrackViewSet(ModelViewSet):
     search_fields = ["name", "artist__name", "album__name"]
     ordering_fields = ["plays_count", "likes_count", "duration"]
     ordering = ["-plays_count"]
+    # В ответе есть is_liked — валидатор свой у каждого пользователя
+    vary_on_user = True
+    validator_tags = ("tracks",)
+    sparse_relations = {"artist": "artist", "album": "album", "genres": "genres"}
 
     def get_queryset(self):
         qs = Track.objects.filter(is_published=True)
-        return qs.select_related("artist", "album").order_by("-plays_count")
+        return (
+            qs.select_related("artist", "album")
+            .prefetch_related("genres")
+            .order_by("-plays_count")
+        )
+
+    def get_validator_tags(self):
+        tags = super().get_validator_tags()
+        if self.request.user.is_authenticated:
+            tags.append(f"likes:{self.request.user.pk}")
+        return tags
+
+    def get_validator_querysets(self):
+        querysets = super().get_validator_querysets()
+        if self.request.user.is_authenticated:
+            querysets.append(TrackLike.objects.filter(user=self.request.user))
+        return querysets
+
+    def use_list_fragments(self):
+        # Фрагменты — полный элемент списка; ?fields=/?include= идут через сериализатор
+        return not self.get_sparse_fieldset()
+
+    def get_fragment_queryset(self, queryset):
+        # Пагинации нужны только ключ сортировки и updated_at — остальное во фрагментах
+        fields = [f.lstrip("-") for f in queryset.query.order_by]
+        return queryset.values(*dict.fromkeys(["id", "updated_at", *fields]))
+
+    def get_list_fragments(self, page):
+        # Фрагменты общие для всех; персональный только is_liked
+        fragments = get_track_fragments(page, self.request)
+        resolver = get_liked_resolver(self.get_serializer_context())
+        resolver.prime(list(fragments))
+        return [
+            with_field(fragment, "is_liked", resolver.is_liked(pk))
+            for pk, fragment in fragments.items()
+        ]
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -94,23 +166,17 @@ class TrackViewSet(ModelViewSet):
         serializer.save(owner=self.request.user)
 
     def retrieve(self, request, *args, **kwargs):
+        if not request.user.is_authenticated:
+            # У анонима нет событий — ответ может прийти из кэша без запросов к БД
+            return super().retrieve(request, *args, **kwargs)
         track = self.get_object()
 
-        # Сохраняем историю прослушивания, если пользователь аутентифицирован
-        if request.user.is_authenticated:
-            ListeningHistory.objects.update_or_create(
-                user=request.user,
-                track=track,
-                defaults={
-                    "listened_at": timezone.now(),
-                    # Можно передать duration или дополнительные поля
-                    # "duration": request.data.get("duration"),
-                    # "additional_info": {"device": "web", "source": "track_page"}
-                },
-            )
+        # Только чтение: событие просмотра пишет в БД консьюмер очереди
+        track_event(request.user, track, ListeningEvent.EventTypeChoices.VIEW)
 
-        serializer = self.get_serializer(track)
-        return Response(serializer.data)
+        return self.conditional_response(
+            request, lambda: Response(self.get_serializer(track).data)
+        )
 
     # def list(self, request, *args, **kwargs):
     #     queryset = self.filter_queryset(self.get_queryset())
@@ -124,16 +190,134 @@ class TrackViewSet(ModelViewSet):
     #     serializer = self.get_serializer(page or queryset, many=True, context={"user": user, "liked_tracks": liked_tracks})
     #     return self.get_paginated_response(serializer.data) if page else Response(serializer.data)
     
-    @transaction.atomic
     @action(detail=True, methods=["post"], url_path="play", permission_classes=[IsAuthenticated])
     def play(self, request, slug=None):
+        # Счётчик буферизуется в Redis и сбрасывается в БД задачей flush_play_counters;
+        # в ответе, как и раньше, полный трек с учётом ещё не сброшенного буфера
         track = self.get_object()
-        track.plays_count = F('plays_count') + 1
-        track.save(update_fields=["plays_count"])
-        track.refresh_from_db()
+        track.plays_count = record_play(track)
+        track_event(request.user, track, ListeningEvent.EventTypeChoices.PLAY)
         serializer = self.get_serializer(track)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
+    @extend_schema(
+        tags=["Tracks"],
+        summary="Stream track audio",
+        description=(
+            "HLS master playlist when the track has transcoded renditions, "
+            "otherwise (or with ?original=1) the audio file; "
+            "the file supports HTTP Range requests."
+        ),
+        parameters=[
+            OpenApiParameter("original", bool, required=False),
+        ],
+        responses={
+            (200, "application/vnd.apple.mpegurl"): OpenApiResponse(
+                description="HLS master playlist"
+            ),
+            (200, "audio/*"): OpenApiResponse(description="Whole file"),
+            (206, "audio/*"): OpenApiResponse(description="Requested byte range"),
+        },
+    )
+    @action(detail=True, methods=["get"], url_path="stream", permission_classes=[IsAuthenticated])
+    def stream(self, request, slug=None):
+        # Доступ проверяется один раз, байты (и Range при перемотке) отдаёт nginx
+        track = self.get_object()
+        if not track.audio:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        if request.query_params.get("original") not in ("1", "true"):
+            renditions = list(ready_renditions(track))
+            if renditions:
+                return playlist_response(
+                    master_playlist(
+                        renditions,
+                        lambda bitrate: request.build_absolute_uri(f"hls/{bitrate}/"),
+                    )
+                )
+        return media_response(request, track.audio.name, track.audio.storage)
+
+    @extend_schema(
+        tags=["Tracks"],
+        summary="HLS rendition playlist",
+        description="Media playlist of one bitrate with signed segment URLs.",
+        responses={
+            (200, "application/vnd.apple.mpegurl"): OpenApiResponse(
+                description="HLS media playlist"
+            ),
+        },
+    )
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path=r"stream/hls/(?P<bitrate>\d+)",
+        url_name="stream-hls",
+        permission_classes=[IsAuthenticated],
+    )
+    def stream_hls(self, request, slug=None, bitrate=None):
+        track = self.get_object()
+        rendition = ready_renditions(track).filter(bitrate=bitrate).first()
+        if rendition is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        signer = MediaSigner.from_request(request)
+        max_age = settings.MEDIA_STREAM_MAX_AGE
+        if signer.secret:
+            # Плейлист не должен пережить подписи сегментов в нём
+            max_age = min(max_age, max(signer.expires - int(time.time()), 0))
+        return playlist_response(
+            media_playlist(rendition, track.audio.storage, signer), max_age
+        )
+
+    @extend_schema(
+        tags=["Tracks"],
+        summary="Track waveform peaks",
+        description=(
+            "Min/max peaks of the track audio in the audiowaveform .dat (v1) "
+            "binary format, readable by waveform-data.js. Long-lived, validated by ETag."
+        ),
+        responses={
+            (200, "application/octet-stream"): OpenApiResponse(description="Peaks"),
+            304: OpenApiResponse(description="Not modified"),
+        },
+    )
+    @action(detail=True, methods=["get"], url_path="waveform")
+    def waveform(self, request, slug=None):
+        # Один запрос: волна опубликованного трека, посчитанная из его текущего audio
+        waveform = (
+            TrackWaveform.objects.filter(
+                track__slug=slug, track__is_published=True, source=F("track__audio")
+            )
+            .only("data", "updated_at")
+            .first()
+        )
+        if waveform is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        # Пики меняются только с пересчётом, а пересчёт — только с заменой файла
+        etag = f'"{waveform.pk:x}-{int(waveform.updated_at.timestamp()):x}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(
+                bytes(waveform.data), content_type="application/octet-stream"
+            )
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=settings.WAVEFORM_MAX_AGE)
+        return response
+
+    @action(detail=True, methods=["post"], url_path="skip", permission_classes=[IsAuthenticated])
+    def skip(self, request, slug=None):
+        track = self.get_object()
+        duration = request.data.get("duration")
+        try:
+            duration = int(duration) if duration is not None else None
+        except (TypeError, ValueError):
+            return Response(
+                {"duration": "A valid integer is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        track_event(
+            request.user, track, ListeningEvent.EventTypeChoices.SKIP, duration
+        )
+        return Response(status=status.HTTP_202_ACCEPTED)
+
     @transaction.atomic
     @action(detail=True, methods=["post"], url_path="like", permission_classes=[IsAuthenticated])
     def like(self, request, slug=None):
@@ -148,30 +332,50 @@ class TrackViewSet(ModelViewSet):
             user=request.user, track=track
         )
 
+        # Счётчики трека, альбома и артиста обновляет сигнал через буфер дельт
         if created:
-            track.likes_count = F('likes_count') + 1
             is_liked = True
         else:
+            # Трек уже загружен: сигнал возьмёт из него id альбома и артиста
+            like_obj.track = track
             like_obj.delete()
-            track.likes_count = F('likes_count') - 1
             is_liked = False
 
-        track.save(update_fields=['likes_count'])
+        # Дельта этого запроса попадёт в буфер только после коммита
         track.refresh_from_db()
+        track.likes_count += get_pending_delta("track:likes", track.id) + (
+            1 if is_liked else -1
+        )
 
         serializer = self.get_serializer(track)
         data = serializer.data
         data["is_liked"] = is_liked
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return Response(data, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["get"], url_path="similar", permission_classes=[IsAuthenticated])
     def similar(self, request, slug=None):
         track = self.get_object()
-        cache_key = f"similar_{track.id}"
-        similar_tracks = cache.get(cache_key)
+        # Соседи по совместным прослушиваниям считаются офлайн (build_track_similarities)
+        similar_tracks = list(
+            self.get_queryset().similar_to(track)[: settings.SIMILAR_TRACKS_LIMIT]
+        )
         if not similar_tracks:
-            similar_tracks = Track.objects.get_similar_tracks(track, limit=10)
-            cache.set(cache_key, similar_tracks, 60*5)
+            # Запасной вариант по жанрам и артисту: сбрасывается при их изменении
+            ids = get_or_set_tagged(
+                f"similar_{track.id}",
+                lambda: list(
+                    Track.objects.get_similar_tracks(track, limit=10).values_list(
+                        "pk", flat=True
+                    )
+                ),
+                tags=[
+                    f"track:{track.id}",
+                    f"artist:{track.artist_id}",
+                    *(f"genre:{pk}" for pk in track.genres.values_list("pk", flat=True)),
+                ],
+            )
+            tracks = self.get_queryset().in_bulk(ids)
+            similar_tracks = [tracks[pk] for pk in ids if pk in tracks]
         serializer = self.get_serializer(similar_tracks, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.musics.models import Track
+from apps.musics.services.metadata import update_track_metadata
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill Track.duration and Track.bitrate from audio headers (MP3 "
+        "frames/Xing/VBRI, FLAC STREAMINFO, WAV, Ogg). By default only tracks "
+        "without a bitrate; reads just the first and last KB of each file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Re-read every track")
+        parser.add_argument(
+            "--scan",
+            action="store_true",
+            help="Walk all MP3 frames when there is no Xing/VBRI header (exact, slower)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        tracks = Track.objects.exclude(audio="")
+        if not options["all"]:
+            tracks = tracks.filter(bitrate__isnull=True)
+        track_ids = list(tracks.order_by("pk").values_list("pk", flat=True))
+
+        started = time.perf_counter()
+        batch_size = options["batch_size"]
+        updated = 0
+        for i in range(0, len(track_ids), batch_size):
+            batch = track_ids[i : i + batch_size]
+            updated += update_track_metadata(batch, scan=options["scan"])
+            self.stdout.write(f"{i + len(batch)}/{len(track_ids)} tracks read")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {updated} of {len(track_ids)} tracks "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        )
@@ -0,0 +1,99 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import F
+
+from apps.musics.models import Album, Artist, Track
+from apps.musics.services.counters import flush_counters, record_play
+from apps.shared.utils.redis import get_redis_connection
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark hot-row play counting: synchronous UPDATE + refresh (old /play/) "
+        "vs the Redis write-behind buffer. Mutates counters — run it on staging only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--track", type=str, help="Track slug (defaults to the most played one)"
+        )
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument("--workers", type=int, default=16)
+
+    def handle(self, *args, **options):
+        track = self._get_track(options["track"])
+        total, workers = options["requests"], options["workers"]
+        originals = (
+            (Track, track.pk, "plays_count", track.plays_count),
+            (
+                Album,
+                track.album_id,
+                "plays_count",
+                track.album and track.album.plays_count,
+            ),
+            (Artist, track.artist_id, "total_plays", track.artist.total_plays),
+        )
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"Track '{track.slug}' (id={track.pk}), {total} plays, {workers} workers"
+            )
+        )
+
+        def sync_play(_):
+            with transaction.atomic():
+                Track.objects.filter(pk=track.pk).update(
+                    plays_count=F("plays_count") + 1
+                )
+                Track.objects.get(pk=track.pk)
+
+        def buffered_play(_):
+            record_play(track)
+
+        self._report("sync UPDATE", self._run(sync_play, total, workers), total)
+
+        if get_redis_connection() is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "Cache backend is not Redis: buffered path writes through, skipping it."
+                )
+            )
+        else:
+            self._report(
+                "write-behind", self._run(buffered_play, total, workers), total
+            )
+            started = time.perf_counter()
+            flush_counters()
+            self.stdout.write(f"flush: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+        for model, pk, column, value in originals:
+            model.objects.filter(pk=pk).update(**{column: value})
+
+    def _get_track(self, slug):
+        qs = Track.objects.select_related("artist", "album")
+        track = (
+            qs.filter(slug=slug).first()
+            if slug
+            else qs.order_by("-plays_count").first()
+        )
+        if track is None:
+            raise CommandError(
+                "No track to benchmark, seed data with `seed_music` first."
+            )
+        return track
+
+    def _run(self, func, total, workers):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(func, range(total)))
+        return time.perf_counter() - started
+
+    def _report(self, label, elapsed, total):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label:>14}: {elapsed:.2f}s, {total / elapsed:,.0f} plays/s"
+            )
+        )
@@ -0,0 +1,138 @@
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from scipy import sparse
+
+from apps.musics.services.als import als_step, top_k_items
+from apps.musics.services.recommendations import (
+    RecommenderModel,
+    build_candidates,
+    save_model,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the ALS recommender on synthetic implicit feedback: training time "
+        "per iteration, candidate generation and per-request scoring latency "
+        "from memory-mapped factors. Does not touch the database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1_000_000)
+        parser.add_argument("--tracks", type=int, default=500_000)
+        parser.add_argument("--per-user", type=int, default=30)
+        parser.add_argument("--factors", type=int, default=64)
+        parser.add_argument("--iterations", type=int, default=2)
+        parser.add_argument("--candidates", type=int, default=200)
+        parser.add_argument(
+            "--candidate-users",
+            type=int,
+            default=20_000,
+            help="Users to generate candidates for (the rest is extrapolated)",
+        )
+        parser.add_argument("--requests", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        n_users, n_tracks = options["users"], options["tracks"]
+        factors = options["factors"]
+        rng = np.random.default_rng(0)
+
+        started = time.perf_counter()
+        confidence = self._synthetic_feedback(
+            rng, n_users, n_tracks, options["per_user"]
+        )
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"{n_users:,} users x {n_tracks:,} tracks, {confidence.nnz:,} "
+                f"interactions, {factors} factors "
+                f"(generated in {time.perf_counter() - started:.1f}s)"
+            )
+        )
+
+        users = rng.normal(scale=0.01, size=(n_users, factors)).astype(np.float32)
+        items = rng.normal(scale=0.01, size=(n_tracks, factors)).astype(np.float32)
+        item_confidence = confidence.T.tocsr()
+        timings = []
+        for _ in range(options["iterations"]):
+            started = time.perf_counter()
+            users = als_step(confidence, items, 0.05)
+            items = als_step(item_confidence, users, 0.05)
+            timings.append(time.perf_counter() - started)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"ALS iteration: {statistics.mean(timings):.1f}s "
+                f"(x{options['iterations']})"
+            )
+        )
+
+        sample = min(options["candidate_users"], n_users)
+        started = time.perf_counter()
+        sample_candidates = build_candidates(
+            users[:sample], items, confidence[:sample], options["candidates"]
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"candidates: {elapsed:.1f}s for {sample:,} users, "
+                f"~{elapsed * n_users / sample / 60:.1f} min for all"
+            )
+        )
+
+        # Для замера запросов кандидаты остальных пользователей не важны
+        candidates = np.zeros((n_users, sample_candidates.shape[1]), dtype=np.int32)
+        candidates[:sample] = sample_candidates
+        with tempfile.TemporaryDirectory() as root:
+            path = save_model(
+                Path(root),
+                timezone.now(),
+                user_ids=np.arange(n_users, dtype=np.int64),
+                track_ids=np.arange(n_tracks, dtype=np.int64),
+                user_factors=users,
+                item_factors=items,
+                candidates=candidates,
+            )
+            model = RecommenderModel(
+                path=path,
+                trained_at=timezone.now(),
+                **{
+                    name: np.load(path / f"{name}.npy", mmap_mode="r")
+                    for name in (
+                        "user_ids",
+                        "track_ids",
+                        "user_factors",
+                        "item_factors",
+                        "candidates",
+                    )
+                },
+            )
+            latencies = []
+            for user_id in rng.integers(0, sample, options["requests"]):
+                started = time.perf_counter()
+                model.score_candidates(int(user_id))
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        latencies.sort()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"request scoring: p50 {statistics.median(latencies):.3f} ms, "
+                f"p95 {latencies[int(len(latencies) * 0.95)]:.3f} ms"
+            )
+        )
+        top = top_k_items(users[:1], items, 10)
+        self.stdout.write(f"sanity: top-10 for user 0 -> {top[0].tolist()}")
+
+    def _synthetic_feedback(self, rng, n_users, n_tracks, per_user):
+        """Популярность треков по Zipf, число взаимодействий пользователя — Пуассон."""
+        counts = rng.poisson(per_user, n_users).clip(1)
+        rows = np.repeat(np.arange(n_users), counts)
+        cols = (rng.zipf(1.3, counts.sum()) - 1) % n_tracks
+        data = (20 * np.log1p(rng.exponential(1.0, counts.sum()))).astype(np.float32)
+        matrix = sparse.csr_matrix((data, (rows, cols)), shape=(n_users, n_tracks))
+        matrix.sum_duplicates()
+        return matrix
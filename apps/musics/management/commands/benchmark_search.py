@@ -0,0 +1,132 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Q
+from faker import Faker
+
+from apps.musics.models import Album, Artist, Track
+from apps.musics.services.search import update_search_vectors
+
+SEED_CHUNK_SIZE = 10_000
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark catalog search: the old icontains path (SearchFilter on name, "
+        "artist__name, album__name) vs PostgreSQL full-text + trigram search. "
+        "--seed N bulk-inserts N synthetic tracks first (e.g. --seed 1000000)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--limit", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Full-text search is available on PostgreSQL only.")
+        if options["seed"]:
+            self._seed(options["seed"])
+
+        names = list(
+            Track.objects.order_by("?").values_list("name", flat=True)[
+                : options["queries"]
+            ]
+        )
+        if not names:
+            raise CommandError("No tracks to search, use --seed first.")
+        queries = [random.choice(name.split()) for name in names]
+        limit = options["limit"]
+        published = Track.objects.filter(is_published=True)
+
+        def icontains(q):
+            return list(
+                published.filter(
+                    Q(name__icontains=q)
+                    | Q(artist__name__icontains=q)
+                    | Q(album__name__icontains=q)
+                )
+                .select_related("artist", "album")
+                .order_by("-plays_count")[:limit]
+            )
+
+        def full_text(q):
+            return list(published.search(q).select_related("artist", "album")[:limit])
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"{published.count():,} tracks, {len(queries)} queries, top {limit}"
+            )
+        )
+        self._report("icontains", self._measure(icontains, queries))
+        self._report("full-text", self._measure(full_text, queries))
+
+    def _seed(self, total):
+        fake = Faker()
+        words = fake.get_words_list()
+        user, _ = get_user_model().objects.get_or_create(
+            username="search-benchmark",
+            defaults={"email": "search-benchmark@example.com"},
+        )
+        artists = Artist.objects.bulk_create(
+            Artist(name=f"{fake.name()} {i}", owner=user)
+            for i in range(max(total // 100, 1))
+        )
+        albums = Album.objects.bulk_create(
+            Album(
+                name=" ".join(random.choices(words, k=2)).title(),
+                artist=random.choice(artists),
+                owner=user,
+                is_published=True,
+            )
+            for _ in range(max(total // 10, 1))
+        )
+
+        created = 0
+        while created < total:
+            size = min(SEED_CHUNK_SIZE, total - created)
+            tracks = []
+            for _ in range(size):
+                album = random.choice(albums)
+                tracks.append(
+                    Track(
+                        name=" ".join(random.choices(words, k=3)).capitalize(),
+                        artist=album.artist,
+                        album=album,
+                        owner=user,
+                        duration=random.randint(60, 420),
+                        plays_count=int(random.paretovariate(1.2) * 10),
+                        audio="tracks/audio/benchmark.mp3",
+                    )
+                )
+            Track.objects.bulk_create(tracks, ignore_conflicts=True)
+            created += size
+            self.stdout.write(f"seeded {created:,}/{total:,} tracks", ending="\r")
+        self.stdout.write("")
+
+        # bulk_create не вызывает сигналы
+        update_search_vectors()
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def _measure(self, func, queries):
+        timings = []
+        for q in queries:
+            started = time.perf_counter()
+            func(q)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def _report(self, label, timings):
+        timings.sort()
+        p95 = timings[min(int(len(timings) * 0.95), len(timings) - 1)]
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label:>10}: p50 {statistics.median(timings):.1f} ms, "
+                f"p95 {p95:.1f} ms, max {timings[-1]:.1f} ms"
+            )
+        )
@@ -0,0 +1,117 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+
+from apps.musics.api_endpoints.v1.stats.serializers import (
+    LikeLeanSerializer,
+    LikeSerializer,
+    ListeningHistoryLeanSerializer,
+    ListeningHistorySerializer,
+)
+from apps.musics.api_endpoints.v1.track.serializers import (
+    TrackLeanSerializer,
+    TrackListSerializer,
+)
+from apps.musics.models import Like, ListeningEvent, Track
+from apps.shared.utils.lean import dumps
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark list serialization: ModelSerializer + JSONRenderer over model "
+        "instances vs the lean path (.values() + LeanSerializer + dumps). "
+        "Reports rows/sec for tracks, likes and listening history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--user", help="username for likes/history")
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        users = get_user_model().objects.all()
+        user = (
+            users.filter(username=options["user"]).first()
+            if options["user"]
+            else users.filter(likes__isnull=False).first() or users.first()
+        )
+        if user is None:
+            raise CommandError("No users found, run seed_music first.")
+        # Медиа-URL строятся от хоста запроса, он должен быть в ALLOWED_HOSTS
+        host = next(
+            (h.lstrip(".") for h in settings.ALLOWED_HOSTS if h and "*" not in h), None
+        )
+        request = RequestFactory().get("/api/v1/", HTTP_HOST=host or "localhost")
+        request.user = user
+        context = {"request": request}
+
+        cases = [
+            (
+                "tracks",
+                Track.objects.filter(is_published=True)
+                .select_related("artist", "album")
+                .prefetch_related("genres")
+                .order_by("-plays_count", "-id"),
+                TrackListSerializer,
+                TrackLeanSerializer,
+            ),
+            (
+                "likes",
+                Like.objects.filter(user=user)
+                .select_related("track__artist", "track__album")
+                .order_by("-created_at", "-id"),
+                LikeSerializer,
+                LikeLeanSerializer,
+            ),
+            (
+                "history",
+                ListeningEvent.objects.latest_per_track(user).select_related(
+                    "track__artist", "track__album"
+                ),
+                ListeningHistorySerializer,
+                ListeningHistoryLeanSerializer,
+            ),
+        ]
+        renderer = JSONRenderer()
+        for label, queryset, serializer_class, lean_class in cases:
+            queryset = queryset[:rows]
+
+            def drf():
+                data = serializer_class(queryset.all(), many=True, context=context).data
+                return renderer.render(data)
+
+            def lean():
+                page = lean_class.values(queryset.all())
+                return [dumps(item) for item in lean_class(context).represent(page)]
+
+            count = len(queryset)
+            if not count:
+                self.stdout.write(self.style.WARNING(f"{label:>8}: no rows, skipped"))
+                continue
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{label}: {count} rows"))
+            self._report("drf", count, self._measure(drf, repeat))
+            self._report("lean", count, self._measure(lean, repeat))
+
+    def _measure(self, func, repeat):
+        func()  # прогрев: шаблоны запросов, кэш поколений
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def _report(self, label, count, timings):
+        median = statistics.median(timings)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label:>8}: p50 {median * 1000:.1f} ms, "
+                f"{count / median:,.0f} rows/s"
+            )
+        )
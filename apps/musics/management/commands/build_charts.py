@@ -0,0 +1,55 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.musics.models import Chart
+from apps.musics.services.charts import (
+    build_charts,
+    period_bounds,
+    rollup_daily_plays,
+    update_album_listens,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Roll up daily track plays and build weekly/monthly charts "
+        "(overall, per genre and per language). --days N backfills the last N days."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date", help="Last day to process, YYYY-MM-DD (default: yesterday)"
+        )
+        parser.add_argument("--days", type=int, default=1)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            last = (
+                date.fromisoformat(options["date"])
+                if options["date"]
+                else timezone.localdate() - timedelta(days=1)
+            )
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        days = [last - timedelta(days=n) for n in reversed(range(options["days"]))]
+        for day in days:
+            rollup_daily_plays(day)
+
+        # Периоды строятся по порядку, чтобы previous_position опирался на свежие чарты
+        built = 0
+        for period in Chart.PeriodChoices.values:
+            for period_start in sorted({period_bounds(period, day)[0] for day in days}):
+                built += build_charts(period, period_start)
+        update_album_listens(last)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rolled up {len(days)} days, built {built} charts "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        )
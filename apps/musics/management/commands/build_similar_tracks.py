@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.musics.services.similarity import build_track_similarities
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute top-K similar tracks from co-listening and likes. "
+        "Incremental by default: only tracks with new listens/likes since the last run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Recompute every track")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        updated = build_track_similarities(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated neighbours of {updated} tracks "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        )
@@ -0,0 +1,85 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import Exists, OuterRef
+
+from apps.musics.models import Track, TrackWaveform
+from apps.musics.services.transcoding import TranscodingError
+from apps.musics.services.waveforms import build_track_waveform
+
+
+def _init_worker():
+    # spawn: свой django.setup(); fork: соединения родителя не переиспользуем
+    django.setup()
+    connections.close_all()
+
+
+def _build_chunk(track_ids, force):
+    built, errors = 0, []
+    for track_id in track_ids:
+        try:
+            built += build_track_waveform(track_id, force=force)
+        except TranscodingError as exc:
+            errors.append(f"Track {track_id}: {exc}")
+    return built, errors
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute waveform peaks for tracks without one for their current audio, "
+        "decoding in parallel worker processes (ffmpeg + NumPy)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Worker processes (default: CPU count)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=20)
+        parser.add_argument(
+            "--force", action="store_true", help="Recompute existing waveforms too"
+        )
+
+    def handle(self, *args, **options):
+        tracks = Track.objects.exclude(audio="")
+        if not options["force"]:
+            tracks = tracks.exclude(
+                Exists(
+                    TrackWaveform.objects.filter(
+                        track=OuterRef("pk"), source=OuterRef("audio")
+                    )
+                )
+            )
+        track_ids = list(tracks.order_by("pk").values_list("pk", flat=True))
+        size = options["chunk_size"]
+        chunks = [track_ids[i : i + size] for i in range(0, len(track_ids), size)]
+
+        started = time.perf_counter()
+        built = failed = 0
+        # Родитель отдаёт соединение до fork, чтобы дети не делили его сокет
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=max(options["processes"], 1), initializer=_init_worker
+        ) as pool:
+            futures = [
+                pool.submit(_build_chunk, chunk, options["force"]) for chunk in chunks
+            ]
+            for done, future in enumerate(as_completed(futures), 1):
+                chunk_built, errors = future.result()
+                built += chunk_built
+                failed += len(errors)
+                for error in errors:
+                    self.stderr.write(error)
+                self.stdout.write(f"{done}/{len(chunks)} chunks")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Built {built} waveforms for {len(track_ids)} tracks, {failed} failed, "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        )
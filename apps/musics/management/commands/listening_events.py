@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from apps.musics.services.events import get_events_stats, ingest_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Show back-pressure metrics of the listening event queue "
+        "(depth, pending, lag) and optionally drain it into ListeningEvent."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--drain",
+            action="store_true",
+            help="Consume the queue until it is empty",
+        )
+
+    def handle(self, *args, **options):
+        if options["drain"]:
+            total = 0
+            while processed := ingest_events():
+                total += processed
+            self.stdout.write(self.style.SUCCESS(f"Ingested {total} events"))
+
+        stats = get_events_stats()
+        for name, value in stats.items():
+            self.stdout.write(f"{name:>13}: {value}")
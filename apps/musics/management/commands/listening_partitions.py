@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.musics.services.partitions import (
+    drop_expired_listening_partitions,
+    ensure_listening_partitions,
+    list_listening_partitions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Create monthly ListeningEvent partitions ahead of time "
+        "and drop the ones older than the retention period (PostgreSQL only)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--ahead",
+            type=int,
+            default=settings.LISTENING_PARTITIONS_AHEAD,
+            help="How many months ahead to create partitions for",
+        )
+        parser.add_argument(
+            "--retain",
+            type=int,
+            default=settings.LISTENING_RETENTION_MONTHS,
+            help="How many months of history to keep",
+        )
+        parser.add_argument(
+            "--no-drop", action="store_true", help="Do not drop expired partitions"
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            self.stdout.write(
+                self.style.WARNING("ListeningEvent is partitioned on PostgreSQL only.")
+            )
+            return
+
+        for name in ensure_listening_partitions(options["ahead"]):
+            self.stdout.write(self.style.SUCCESS(f"Created {name}"))
+
+        if not options["no_drop"]:
+            for name in drop_expired_listening_partitions(options["retain"]):
+                self.stdout.write(self.style.WARNING(f"Dropped {name}"))
+
+        partitions = list_listening_partitions()
+        self.stdout.write(f"{len(partitions)} partitions: {', '.join(partitions)}")
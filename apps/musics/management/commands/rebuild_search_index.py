@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.musics.services.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Track.search_vector for the whole catalog, e.g. after bulk "
+        "imports that bypass signals or after changing SEARCH_CONFIG (PostgreSQL only)."
+    )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            self.stdout.write(
+                self.style.WARNING("Full-text search is available on PostgreSQL only.")
+            )
+            return
+        update_search_vectors()
+        self.stdout.write(self.style.SUCCESS("Search vectors rebuilt."))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.musics.services.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute track likes and album/artist play and like totals with "
+        "set-based SQL, report drift and fix it (--dry-run only reports)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        report = reconcile_counters(fix=not options["dry_run"])
+        for target, stats in report.items():
+            style = self.style.WARNING if stats["rows"] else self.style.SUCCESS
+            self.stdout.write(
+                style(f"{target:>13}: {stats['rows']} rows, drift {stats['drift']}")
+            )
+        self.stdout.write(f"Done in {time.perf_counter() - started:.1f}s")
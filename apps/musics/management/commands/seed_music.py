@@ -2,7 +2,7 @@ import random
 from datetime import timedelta
 
 from django.core.management.base import BaseCommand
-from django.db import transaction, IntegrityError
+from django.db import IntegrityError
 from django.utils.text import slugify
 from django.utils import timezone
 from django.apps import apps
@@ -46,7 +46,7 @@ class Command(BaseCommand):
 
         PlaylistTrack = None
         Like = None
-        ListeningHistory = None
+        ListeningEvent = None
         try:
             PlaylistTrack = apps.get_model("musics", "PlaylistTrack")
         except LookupError:
@@ -56,7 +56,7 @@ class Command(BaseCommand):
         except LookupError:
             pass
         try:
-            ListeningHistory = apps.get_model("musics", "ListeningHistory")
+            ListeningEvent = apps.get_model("musics", "ListeningEvent")
         except LookupError:
             pass
 
@@ -65,8 +65,8 @@ class Command(BaseCommand):
         # 🔹 Очистка данных
         if do_flush:
             self.stdout.write(self.style.WARNING("Flushing existing musics data..."))
-            if ListeningHistory:
-                ListeningHistory.objects.all().delete()
+            if ListeningEvent:
+                ListeningEvent.objects.all().delete()
             if Like:
                 Like.objects.all().delete()
             if PlaylistTrack:
@@ -205,9 +205,9 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f"Created {len(like_bulk)} likes"))
 
         # ------------------------------
-        # 7) ListeningHistory
+        # 7) ListeningEvent
         # ------------------------------
-        if ListeningHistory:
+        if ListeningEvent:
             hist_bulk = []
             for _ in range(history_count):
                 user = random.choice(users_qs)
@@ -217,18 +217,14 @@ class Command(BaseCommand):
                 )
                 duration = random.randint(10, getattr(track, "duration", 300))
                 hist_bulk.append(
-                    ListeningHistory(
+                    ListeningEvent(
                         user=user,
                         track=track,
                         listened_at=listened_at,
                         duration=duration,
                     )
                 )
-            # bulk_create в маленьких пачках для избежания ошибок транзакции
-            batch_size = 50
-            for i in range(0, len(hist_bulk), batch_size):
-                with transaction.atomic():
-                    ListeningHistory.objects.bulk_create(hist_bulk[i : i + batch_size])
+            ListeningEvent.objects.bulk_create(hist_bulk, batch_size=1000)
             self.stdout.write(
                 self.style.SUCCESS(
                     f"Created {len(hist_bulk)} listening history records"
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Exists, OuterRef
+
+from apps.musics.models import Track, TrackRendition
+from apps.musics.services.transcoding import TranscodingError, build_track_renditions
+from apps.musics.tasks.transcoding import transcode_track
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue HLS transcoding for tracks without ready renditions of their "
+        "current audio (--all: every track, done renditions are skipped)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Queue every track")
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Transcode in this process instead of the transcoding queue",
+        )
+
+    def handle(self, *args, **options):
+        tracks = Track.objects.exclude(audio="")
+        if not options["all"]:
+            tracks = tracks.exclude(
+                Exists(
+                    TrackRendition.objects.filter(
+                        track=OuterRef("pk"),
+                        source=OuterRef("audio"),
+                        status=TrackRendition.StatusChoices.READY,
+                    )
+                )
+            )
+        track_ids = list(tracks.order_by("pk").values_list("pk", flat=True))
+
+        failed = 0
+        for track_id in track_ids:
+            if not options["sync"]:
+                transcode_track.delay(track_id)
+                continue
+            try:
+                build_track_renditions(track_id)
+            except TranscodingError as exc:
+                failed += 1
+                self.stderr.write(f"Track {track_id}: {exc}")
+
+        verb = "Transcoded" if options["sync"] else "Queued"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{verb} {len(track_ids) - failed} tracks, {failed} failed"
+            )
+        )
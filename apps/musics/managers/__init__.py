@@ -1,2 +1,5 @@
+from .album import *  # noqa
+from .artist import *  # noqa
 from .playlist import *  # noqa
 from .track import *  # noqa
+from .stats import *  # noqa
@@ -0,0 +1,13 @@
+from django.db import models
+
+from .artist import published_count
+
+
+class AlbumQuerySet(models.QuerySet):
+    def with_counts(self):
+        """tracks_count (опубликованные треки) в том же запросе."""
+        return self.annotate(tracks_count=published_count("Track", "album"))
+
+
+class AlbumManager(models.Manager.from_queryset(AlbumQuerySet)):
+    pass
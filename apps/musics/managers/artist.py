@@ -0,0 +1,30 @@
+from django.apps import apps
+from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def published_count(model_name, field):
+    """Количество опубликованных объектов, ссылающихся на строку, одним подзапросом."""
+    model = apps.get_model("musics", model_name)
+    subquery = (
+        model.objects.filter(**{field: OuterRef("pk")}, is_published=True)
+        .order_by()
+        .values(field)
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+
+class ArtistQuerySet(models.QuerySet):
+    def with_counts(self):
+        """albums_count и tracks_count (опубликованные) в том же запросе."""
+        return self.annotate(
+            albums_count=published_count("Album", "artist"),
+            tracks_count=published_count("Track", "artist"),
+        )
+
+
+class ArtistManager(models.Manager.from_queryset(ArtistQuerySet)):
+    pass
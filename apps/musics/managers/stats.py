@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+
+class ListeningEventQuerySet(models.QuerySet):
+    """
+    Все выборки ограничены по listened_at константами,
+    чтобы Postgres отсекал лишние месячные партиции ещё на этапе планирования.
+    """
+
+    def between(self, start, end=None):
+        qs = self.filter(listened_at__gte=start)
+        if end is not None:
+            qs = qs.filter(listened_at__lt=end)
+        return qs
+
+    def recent(self, days=None):
+        days = days or settings.LISTENING_HISTORY_DAYS
+        return self.between(timezone.now() - timezone.timedelta(days=days))
+
+    def latest_per_track(self, user, days=None):
+        """
+        Последнее прослушивание каждого трека пользователем (история),
+        кроме скрытого им самим (ListeningHistoryHide).
+        """
+        # Импорт здесь: модели импортируют этот модуль
+        from apps.musics.models import ListeningHistoryHide
+
+        qs = self.recent(days).filter(user=user)
+        newer = qs.filter(
+            track=OuterRef("track"), listened_at__gt=OuterRef("listened_at")
+        )
+        hidden = ListeningHistoryHide.objects.filter(
+            Q(track__isnull=True) | Q(track=OuterRef("track")),
+            user=user,
+            hidden_at__gte=OuterRef("listened_at"),
+        )
+        return qs.filter(~Exists(newer), ~Exists(hidden)).order_by("-listened_at")
+
+
+class ListeningEventManager(models.Manager):
+    def get_queryset(self):
+        return ListeningEventQuerySet(self.model, using=self._db)
+
+    def between(self, *args, **kwargs):
+        return self.get_queryset().between(*args, **kwargs)
+
+    def recent(self, *args, **kwargs):
+        return self.get_queryset().recent(*args, **kwargs)
+
+    def latest_per_track(self, *args, **kwargs):
+        return self.get_queryset().latest_per_track(*args, **kwargs)
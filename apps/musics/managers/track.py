@@ -1,7 +1,14 @@
-from django.db import models
-from django.db.models import Q
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connections, models
+from django.db.models import ExpressionWrapper, F, FloatField, Q, Value
+from django.db.models.functions import Ln
 from django.utils import timezone
 
+_TOKEN_RE = re.compile(r"\w+")
+
 
 class TrackQuerySet(models.QuerySet):
     def popular(self, days=None):
@@ -15,9 +22,51 @@ class TrackQuerySet(models.QuerySet):
         return self.filter(genres__name__iexact=genre)
 
     def search(self, q):
-        return self.filter(
-            Q(name__icontains=q) | Q(artist__name__icontains=q) | Q(album__icontains=q)
+        """
+        Полнотекстовый поиск с опечатками, отсортированный по релевантности.
+
+        PostgreSQL: search_vector @@ префиксный tsquery или триграммное сходство
+        названия (оба по GIN-индексам), score = (ts_rank + similarity)
+        * (1 + SEARCH_POPULARITY_WEIGHT * ln(1 + plays_count)).
+        Остальные БД: icontains по треку, артисту и альбому.
+        """
+        if connections[self.db].vendor != "postgresql":
+            return self.filter(
+                Q(name__icontains=q)
+                | Q(artist__name__icontains=q)
+                | Q(album__name__icontains=q)
+            ).order_by("-plays_count")
+
+        tokens = _TOKEN_RE.findall(q.lower())
+        if not tokens:
+            return self.none()
+        # 'imag drag' -> 'imag:* & drag:*': только \w-токены, синтаксис не сломать
+        query = SearchQuery(
+            " & ".join(f"{token}:*" for token in tokens),
+            search_type="raw",
+            config=settings.SEARCH_CONFIG,
+        )
+        popularity = Value(1.0) + Value(settings.SEARCH_POPULARITY_WEIGHT) * Ln(
+            F("plays_count") + 1
         )
+        return (
+            self.filter(Q(search_vector=query) | Q(name__trigram_similar=q))
+            .annotate(
+                rank=SearchRank(F("search_vector"), query),
+                similarity=TrigramSimilarity("name", q),
+            )
+            .annotate(
+                score=ExpressionWrapper(
+                    (F("rank") + F("similarity")) * popularity,
+                    output_field=FloatField(),
+                )
+            )
+            .order_by("-score", "-plays_count")
+        )
+
+    def similar_to(self, track):
+        """Предрасчитанные соседи трека (TrackSimilarity), от самых похожих."""
+        return self.filter(neighbour_of__track=track).order_by("-neighbour_of__score")
 
     def with_artist_album(self):
         return self.select_related("artist", "album")
@@ -36,6 +85,7 @@ class TrackManager(models.Manager):
     def get_similar_tracks(self, track, limit=10):
         """
         Возвращает похожие треки по жанру или артисту
+        (запасной вариант для треков без предрасчитанных соседей)
         """
         return (
             self.get_queryset()
@@ -47,4 +97,3 @@ class TrackManager(models.Manager):
             .distinct()
             .order_by("-plays_count")[:limit]
         )
-
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.8 on 2026-10-18 00:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0013_alter_album_created_at_alter_album_slug_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CounterFlush",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("batch_id", models.CharField(max_length=64, unique=True)),
+                ("rows", models.PositiveIntegerField(default=0)),
+                ("applied_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "db_table": "musics_counter_flushes",
+            },
+        ),
+    ]
@@ -0,0 +1,122 @@
+# Generated by Django 5.0.8 on 2026-10-18 00:27
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.db.backends.ddl_references import Statement
+
+PARTITIONED_TABLE_SQL = """
+DROP TABLE musics_listening_events;
+
+CREATE TABLE musics_listening_events (
+    id bigint GENERATED BY DEFAULT AS IDENTITY,
+    listened_at timestamp with time zone NOT NULL,
+    duration integer NULL CHECK (duration >= 0),
+    additional_info jsonb NOT NULL,
+    track_id bigint NOT NULL
+        REFERENCES musics_tracks (id) DEFERRABLE INITIALLY DEFERRED,
+    user_id bigint NOT NULL
+        REFERENCES users (id) DEFERRABLE INITIALLY DEFERRED,
+    PRIMARY KEY (id, listened_at)
+) PARTITION BY RANGE (listened_at);
+
+CREATE TABLE musics_listening_events_default
+    PARTITION OF musics_listening_events DEFAULT;
+
+CREATE INDEX musics_list_user_id_8698ab_idx
+    ON musics_listening_events (user_id, listened_at DESC);
+CREATE INDEX musics_list_user_id_d38607_idx
+    ON musics_listening_events (user_id, track_id, listened_at DESC);
+CREATE INDEX musics_list_track_i_612d8d_idx
+    ON musics_listening_events (track_id, listened_at);
+"""
+
+
+def make_partitioned(apps, schema_editor):
+    """
+    В Postgres пересоздаём таблицу как партиционированную по месяцам.
+    Месячные партиции создаёт команда listening_partitions, до этого
+    строки попадают в DEFAULT-партицию и переносятся командой.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    # FK и индексы, отложенные CreateModel, относятся к старой таблице
+    schema_editor.deferred_sql = [
+        sql
+        for sql in schema_editor.deferred_sql
+        if not (
+            isinstance(sql, Statement)
+            and sql.references_table("musics_listening_events")
+        )
+    ]
+    schema_editor.execute(PARTITIONED_TABLE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0014_counterflush"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ListeningEvent",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "listened_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "duration",
+                    models.PositiveIntegerField(
+                        blank=True, help_text="how many seconds listened", null=True
+                    ),
+                ),
+                (
+                    "additional_info",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Additional metadata about the listening session",
+                    ),
+                ),
+                (
+                    "track",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="listening_events",
+                        to="musics.track",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="listening_events",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "musics_listening_events",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-listened_at"],
+                        name="musics_list_user_id_8698ab_idx",
+                    ),
+                    models.Index(
+                        fields=["user", "track", "-listened_at"],
+                        name="musics_list_user_id_d38607_idx",
+                    ),
+                    models.Index(
+                        fields=["track", "listened_at"],
+                        name="musics_list_track_i_612d8d_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(make_partitioned, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+
+def copy_listening_history(apps, schema_editor):
+    """Переносит накопленную историю в append-only лог ListeningEvent."""
+    ListeningHistory = apps.get_model("musics", "ListeningHistory")
+    ListeningEvent = apps.get_model("musics", "ListeningEvent")
+
+    batch = []
+    for row in ListeningHistory.objects.all().iterator(chunk_size=5000):
+        batch.append(
+            ListeningEvent(
+                user_id=row.user_id,
+                track_id=row.track_id,
+                listened_at=row.listened_at,
+                duration=row.duration,
+                additional_info=row.additional_info,
+            )
+        )
+        if len(batch) >= 5000:
+            ListeningEvent.objects.bulk_create(batch)
+            batch = []
+    ListeningEvent.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0015_listeningevent"),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_listening_history, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.8 on 2026-10-18 00:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0016_copy_listening_history"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="listeningevent",
+            name="event_id",
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="listeningevent",
+            name="event_type",
+            field=models.CharField(
+                choices=[("play", "Play"), ("view", "View"), ("skip", "Skip")],
+                default="view",
+                max_length=8,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="listeningevent",
+            constraint=models.UniqueConstraint(
+                fields=("event_id", "listened_at"), name="musics_listening_event_uniq"
+            ),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 5.0.8 on 2026-10-18 00:36
+
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# GIN-индексы живут только в PostgreSQL, поэтому не описаны в Meta.indexes
+SEARCH_INDEXES_SQL = """
+CREATE INDEX IF NOT EXISTS musics_tracks_search_vector_gin
+    ON musics_tracks USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS musics_tracks_name_trgm
+    ON musics_tracks USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS musics_artists_name_trgm
+    ON musics_artists USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS musics_albums_name_trgm
+    ON musics_albums USING gin (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS musics_playlists_name_trgm
+    ON musics_playlists USING gin (name gin_trgm_ops);
+"""
+
+DROP_SEARCH_INDEXES_SQL = """
+DROP INDEX IF EXISTS musics_tracks_search_vector_gin;
+DROP INDEX IF EXISTS musics_tracks_name_trgm;
+DROP INDEX IF EXISTS musics_artists_name_trgm;
+DROP INDEX IF EXISTS musics_albums_name_trgm;
+DROP INDEX IF EXISTS musics_playlists_name_trgm;
+"""
+
+# Конфигурация та же, что у update_search_vectors и TrackManager.search()
+FILL_SEARCH_VECTOR_SQL = """
+UPDATE musics_tracks AS t
+SET search_vector =
+    setweight(to_tsvector(%(config)s::regconfig, coalesce(t.name, '')), 'A')
+    || setweight(to_tsvector(%(config)s::regconfig, coalesce(a.name, '')), 'B')
+    || setweight(to_tsvector(%(config)s::regconfig, coalesce(
+        (SELECT al.name FROM musics_albums AS al WHERE al.id = t.album_id), ''
+    )), 'C')
+FROM musics_artists AS a
+WHERE a.id = t.artist_id;
+"""
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(FILL_SEARCH_VECTOR_SQL, {"config": settings.SEARCH_CONFIG})
+    schema_editor.execute(SEARCH_INDEXES_SQL)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(DROP_SEARCH_INDEXES_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0017_listeningevent_event_id"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="track",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
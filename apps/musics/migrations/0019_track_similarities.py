@@ -0,0 +1,82 @@
+# Generated by Django 5.0.8 on 2026-10-18 00:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0018_track_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SimilarityBuild",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("started_at", models.DateTimeField(db_index=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                ("is_full", models.BooleanField(default=False)),
+                ("tracks_updated", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "musics_similarity_builds",
+                "ordering": ["-started_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="TrackSimilarity",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "similar_track",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbour_of",
+                        to="musics.track",
+                    ),
+                ),
+                (
+                    "track",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="neighbours",
+                        to="musics.track",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "musics_track_similarities",
+                "indexes": [
+                    models.Index(
+                        fields=["track", "-score"],
+                        name="musics_trac_track_i_3cd26a_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="tracksimilarity",
+            constraint=models.UniqueConstraint(
+                fields=("track", "similar_track"), name="unique_track_similarity"
+            ),
+        ),
+    ]
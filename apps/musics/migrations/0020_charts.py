@@ -0,0 +1,156 @@
+# Generated by Django 5.0.8 on 2026-10-18 01:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0019_track_similarities"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChartEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("position", models.PositiveSmallIntegerField()),
+                ("plays", models.PositiveIntegerField(default=0)),
+                (
+                    "previous_position",
+                    models.PositiveSmallIntegerField(blank=True, null=True),
+                ),
+            ],
+            options={
+                "db_table": "musics_chart_entries",
+                "ordering": ["position"],
+            },
+        ),
+        migrations.CreateModel(
+            name="TrackDailyPlays",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("plays", models.PositiveIntegerField(default=0)),
+                ("listeners", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "musics_track_daily_plays",
+            },
+        ),
+        migrations.CreateModel(
+            name="Chart",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("weekly", "Weekly"), ("monthly", "Monthly")],
+                        max_length=8,
+                    ),
+                ),
+                (
+                    "scope",
+                    models.CharField(
+                        choices=[
+                            ("all", "All"),
+                            ("genre", "Genre"),
+                            ("language", "Language"),
+                        ],
+                        default="all",
+                        max_length=8,
+                    ),
+                ),
+                ("key", models.CharField(blank=True, default="", max_length=120)),
+                ("period_start", models.DateField()),
+                ("period_end", models.DateField(help_text="last day of the period")),
+                ("computed_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "Chart",
+                "verbose_name_plural": "Charts",
+                "db_table": "musics_charts",
+                "indexes": [
+                    models.Index(
+                        fields=["period", "-period_start"],
+                        name="musics_char_period_ddbf19_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="chart",
+            constraint=models.UniqueConstraint(
+                fields=("period", "scope", "key", "period_start"),
+                name="unique_chart_per_period",
+            ),
+        ),
+        migrations.AddField(
+            model_name="chartentry",
+            name="chart",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="entries",
+                to="musics.chart",
+            ),
+        ),
+        migrations.AddField(
+            model_name="chartentry",
+            name="track",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="chart_entries",
+                to="musics.track",
+            ),
+        ),
+        migrations.AddField(
+            model_name="trackdailyplays",
+            name="track",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="daily_plays",
+                to="musics.track",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="chartentry",
+            constraint=models.UniqueConstraint(
+                fields=("chart", "position"), name="unique_chart_position"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="trackdailyplays",
+            index=models.Index(fields=["day"], name="musics_trac_day_0cbdb0_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="trackdailyplays",
+            constraint=models.UniqueConstraint(
+                fields=("track", "day"), name="unique_track_daily_plays"
+            ),
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.0.8 on 2026-10-18 01:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0020_charts"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="like",
+            name="musics_like_user_id_f39825_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="listeningevent",
+            name="musics_list_user_id_8698ab_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="track",
+            name="musics_trac_plays_c_72f44d_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="track",
+            name="musics_trac_likes_c_2cbf8f_idx",
+        ),
+        migrations.AddIndex(
+            model_name="like",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="musics_like_user_id_fb0bc1_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="listeningevent",
+            index=models.Index(
+                fields=["user", "-listened_at", "-id"],
+                name="musics_list_user_id_35faee_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playlist",
+            index=models.Index(
+                fields=["-updated_at", "-id"], name="musics_play_updated_7cd119_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="track",
+            index=models.Index(
+                fields=["is_published", "-plays_count", "-id"],
+                name="musics_trac_is_publ_3f44e8_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="track",
+            index=models.Index(
+                fields=["is_published", "-likes_count", "-id"],
+                name="musics_trac_is_publ_b928cc_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="track",
+            index=models.Index(
+                fields=["is_published", "duration", "id"],
+                name="musics_trac_is_publ_bd1cdb_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.0.8 on 2026-10-18 02:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0021_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrackRendition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("bitrate", models.PositiveIntegerField(help_text="kbps")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processing", "Processing"),
+                            ("ready", "Ready"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=10,
+                    ),
+                ),
+                ("source", models.CharField(max_length=255)),
+                ("playlist", models.CharField(blank=True, default="", max_length=255)),
+                ("segments", models.PositiveIntegerField(default=0)),
+                ("size", models.BigIntegerField(default=0, help_text="bytes")),
+                ("error", models.TextField(blank=True, default="")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "track",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="renditions",
+                        to="musics.track",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Track rendition",
+                "verbose_name_plural": "Track renditions",
+                "db_table": "musics_track_renditions",
+                "ordering": ["bitrate"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="trackrendition",
+            constraint=models.UniqueConstraint(
+                fields=("track", "bitrate"), name="unique_track_rendition"
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.0.8 on 2026-10-18 02:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0022_track_renditions"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrackWaveform",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("source", models.CharField(max_length=255)),
+                ("bits", models.PositiveSmallIntegerField(default=8)),
+                ("buckets", models.PositiveIntegerField()),
+                ("data", models.BinaryField()),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "track",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waveform",
+                        to="musics.track",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Track waveform",
+                "verbose_name_plural": "Track waveforms",
+                "db_table": "musics_track_waveforms",
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.0.8 on 2026-10-18 03:08
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("musics", "0023_track_waveforms"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ListeningHistoryHide",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hidden_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "track",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="musics.track",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="listening_history_hides",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "musics_listening_history_hides",
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="listeninghistoryhide",
+            constraint=models.UniqueConstraint(
+                fields=("user", "track"), name="musics_history_hide_track_uniq"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="listeninghistoryhide",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("track__isnull", True)),
+                fields=("user",),
+                name="musics_history_hide_all_uniq",
+            ),
+        ),
+    ]
@@ -4,3 +4,7 @@ from .playlist import *  # noqa
 from .stats import *  # noqa
 from .track import *  # noqa
 from .genres import *  # noqa
+from .recommendations import *  # noqa
+from .charts import *  # noqa
+from .renditions import *  # noqa
+from .waveforms import *  # noqa
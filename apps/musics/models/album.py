@@ -2,8 +2,9 @@ from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
 from django.db import models
 from django.conf import settings
-from django.core.cache import cache
 from apps.shared.models.base import NamedModel
+from apps.musics.managers.album import AlbumManager
+from apps.shared.utils.tagged_cache import get_or_set_tagged
 from .artist import Artist
 
 
@@ -43,6 +44,8 @@ class Album(NamedModel):
     listens_last_week = models.BigIntegerField(default=0)
     listens_last_month = models.BigIntegerField(default=0)
 
+    objects = AlbumManager()
+
     class Meta:
         db_table = "musics_albums"
         indexes = [
@@ -66,16 +69,6 @@ class Album(NamedModel):
             self.slug = slug
         super().save(*args, **kwargs)
 
-    # --- Количество треков ---
-    @property
-    def tracks_count(self):
-        cache_key = f"album_{self.id}_tracks_count"
-        count = cache.get(cache_key)
-        if count is None:
-            count = self.tracks.filter(is_published=True).count()
-            cache.set(cache_key, count, timeout=60)
-        return count
-
     # --- Оптимизированный список треков ---
     def get_tracks(self):
         return self.tracks.filter(is_published=True).select_related("artist", "album").prefetch_related("genres")
@@ -83,12 +76,18 @@ class Album(NamedModel):
     # --- Топовые альбомы по прослушиваниям ---
     @classmethod
     def get_top_albums(cls, limit=10):
-        key = f"top_albums_{limit}"
-        albums = cache.get(key)
-        if albums is None:
-            albums = list(cls.objects.filter(is_published=True).order_by("-plays_count")[:limit])
-            cache.set(key, albums, timeout=60)
-        return albums
+        ids = get_or_set_tagged(
+            f"top_albums_{limit}",
+            lambda: list(
+                cls.objects.filter(is_published=True)
+                .order_by("-plays_count")
+                .values_list("pk", flat=True)[:limit]
+            ),
+            tags=["albums"],
+            timeout=60 * 10,
+        )
+        albums = cls.objects.in_bulk(ids)
+        return [albums[pk] for pk in ids if pk in albums]
 
     def __str__(self):
         return f"{self.name} — {self.artist.name}"
@@ -2,8 +2,9 @@ from django.utils.translation import gettext_lazy as _
 from django.utils.text import slugify
 from django.conf import settings
 from django.db import models
-from django.core.cache import cache
 from apps.shared.models.base import NamedModel
+from apps.musics.managers.artist import ArtistManager
+from apps.shared.utils.tagged_cache import get_or_set_tagged
 
 
 class Artist(NamedModel):
@@ -36,7 +37,9 @@ class Artist(NamedModel):
     total_likes = models.BigIntegerField(default=0, db_index=True)
 
     is_verified = models.BooleanField(default=False, verbose_name=_("Verified artist"))
-    
+
+    objects = ArtistManager()
+
     class Meta:
         db_table = "musics_artists"
         indexes = [
@@ -62,15 +65,18 @@ class Artist(NamedModel):
     # --- Кэш популярных артистов ---
     @classmethod
     def get_top_artists(cls, limit=10):
-        cache_key = f"top_artists_{limit}"
-        artists = cache.get(cache_key)
-        if artists is None:
-            artists = list(
+        ids = get_or_set_tagged(
+            f"top_artists_{limit}",
+            lambda: list(
                 cls.objects.filter(is_verified=True)
-                .order_by("-total_plays", "-followers_count")[:limit]
-            )
-            cache.set(cache_key, artists, timeout=60)
-        return artists
+                .order_by("-total_plays", "-followers_count")
+                .values_list("pk", flat=True)[:limit]
+            ),
+            tags=["artists"],
+            timeout=60 * 10,
+        )
+        artists = cls.objects.in_bulk(ids)
+        return [artists[pk] for pk in ids if pk in artists]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,99 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .track import Track
+
+
+class TrackDailyPlays(models.Model):
+    """
+    Суточный роллап прослушиваний трека (ListeningEvent с event_type=play).
+    Чарты и счётчики «за неделю/месяц» суммируют эти строки, а не сырой лог.
+    """
+
+    track = models.ForeignKey(
+        Track, on_delete=models.CASCADE, related_name="daily_plays"
+    )
+    day = models.DateField()
+    plays = models.PositiveIntegerField(default=0)
+    listeners = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "musics_track_daily_plays"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["track", "day"], name="unique_track_daily_plays"
+            )
+        ]
+        indexes = [models.Index(fields=["day"])]
+
+    def __str__(self):
+        return f"{self.track_id} on {self.day}: {self.plays}"
+
+
+class Chart(models.Model):
+    """Предрасчитанный чарт за неделю или месяц: общий, по жанру или по языку."""
+
+    class PeriodChoices(models.TextChoices):
+        WEEKLY = "weekly", _("Weekly")
+        MONTHLY = "monthly", _("Monthly")
+
+    class ScopeChoices(models.TextChoices):
+        ALL = "all", _("All")
+        GENRE = "genre", _("Genre")
+        LANGUAGE = "language", _("Language")
+
+    period = models.CharField(max_length=8, choices=PeriodChoices.choices)
+    scope = models.CharField(
+        max_length=8, choices=ScopeChoices.choices, default=ScopeChoices.ALL
+    )
+    # slug жанра или код языка; пусто для общего чарта
+    key = models.CharField(max_length=120, blank=True, default="")
+    period_start = models.DateField()
+    period_end = models.DateField(help_text="last day of the period")
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "musics_charts"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period", "scope", "key", "period_start"],
+                name="unique_chart_per_period",
+            )
+        ]
+        indexes = [models.Index(fields=["period", "-period_start"])]
+        verbose_name = _("Chart")
+        verbose_name_plural = _("Charts")
+
+    def __str__(self):
+        scope = f"{self.scope}:{self.key}" if self.key else self.scope
+        return f"{self.period} {scope} from {self.period_start}"
+
+
+class ChartEntry(models.Model):
+    chart = models.ForeignKey(Chart, on_delete=models.CASCADE, related_name="entries")
+    position = models.PositiveSmallIntegerField()
+    track = models.ForeignKey(
+        Track, on_delete=models.CASCADE, related_name="chart_entries"
+    )
+    plays = models.PositiveIntegerField(default=0)
+    # Позиция в чарте предыдущего периода; None — новинка
+    previous_position = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    class Meta:
+        db_table = "musics_chart_entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["chart", "position"], name="unique_chart_position"
+            )
+        ]
+        ordering = ["position"]
+
+    def __str__(self):
+        return f"#{self.position} {self.track_id}"
+
+    @property
+    def change(self):
+        """На сколько позиций трек поднялся (+) или опустился (-)."""
+        if self.previous_position is None:
+            return None
+        return self.previous_position - self.position
@@ -54,6 +54,7 @@ class Playlist(NamedModel):
         indexes = [
             models.Index(fields=["owner", "is_public"]),
             models.Index(fields=["slug"]),
+            models.Index(fields=["-updated_at", "-id"]),
         ]
         verbose_name = _("Playlist")
         verbose_name_plural = _("Playlists")
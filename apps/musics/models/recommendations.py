@@ -0,0 +1,46 @@
+from django.db import models
+
+from .track import Track
+
+
+class TrackSimilarity(models.Model):
+    """
+    Top-K соседей трека по совместным прослушиваниям (item-item cosine).
+    Строки пересчитывает офлайн-задача build_track_similarities.
+    """
+
+    track = models.ForeignKey(
+        Track, on_delete=models.CASCADE, related_name="neighbours"
+    )
+    similar_track = models.ForeignKey(
+        Track, on_delete=models.CASCADE, related_name="neighbour_of"
+    )
+    score = models.FloatField()
+
+    class Meta:
+        db_table = "musics_track_similarities"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["track", "similar_track"], name="unique_track_similarity"
+            )
+        ]
+        indexes = [models.Index(fields=["track", "-score"])]
+
+    def __str__(self):
+        return f"{self.track_id} ~ {self.similar_track_id} ({self.score:.3f})"
+
+
+class SimilarityBuild(models.Model):
+    """Запуск пересчёта похожих треков; started_at — водяной знак для инкремента."""
+
+    started_at = models.DateTimeField(db_index=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    is_full = models.BooleanField(default=False)
+    tracks_updated = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = "musics_similarity_builds"
+        ordering = ["-started_at"]
+
+    def __str__(self):
+        return f"Similarity build at {self.started_at} ({self.tracks_updated} tracks)"
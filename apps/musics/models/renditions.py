@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .track import Track
+
+
+class TrackRendition(models.Model):
+    """
+    HLS-версия трека в одном битрейте: плейлист index.m3u8 и сегменты в
+    хранилище рядом с ним. source — имя исходного audio, из которого она
+    собрана: после замены файла версия считается устаревшей.
+    """
+
+    class StatusChoices(models.TextChoices):
+        PENDING = "pending", _("Pending")
+        PROCESSING = "processing", _("Processing")
+        READY = "ready", _("Ready")
+        FAILED = "failed", _("Failed")
+
+    track = models.ForeignKey(
+        Track, on_delete=models.CASCADE, related_name="renditions"
+    )
+    bitrate = models.PositiveIntegerField(help_text="kbps")
+    status = models.CharField(
+        max_length=10, choices=StatusChoices.choices, default=StatusChoices.PENDING
+    )
+    source = models.CharField(max_length=255)
+    playlist = models.CharField(max_length=255, blank=True, default="")
+    segments = models.PositiveIntegerField(default=0)
+    size = models.BigIntegerField(default=0, help_text="bytes")
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "musics_track_renditions"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["track", "bitrate"], name="unique_track_rendition"
+            )
+        ]
+        ordering = ["bitrate"]
+        verbose_name = _("Track rendition")
+        verbose_name_plural = _("Track renditions")
+
+    def __str__(self):
+        return f"{self.track_id} @ {self.bitrate}k: {self.status}"
@@ -1,6 +1,8 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from .track import Track
+from apps.musics.managers.stats import ListeningEventManager
 
 
 class Like(models.Model):
@@ -15,7 +17,7 @@ class Like(models.Model):
         unique_together = (("user", "track"),)
         indexes = [
             models.Index(fields=["track", "created_at"]),
-            models.Index(fields=["user", "created_at"]),
+            models.Index(fields=["user", "-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -51,3 +53,117 @@ class ListeningHistory(models.Model):
 
     def __str__(self):
         return f"{self.user} listened to {self.track} at {self.listened_at}"
+
+
+class ListeningEvent(models.Model):
+    """
+    Append-only лог прослушиваний: каждое прослушивание — отдельная строка.
+    В Postgres таблица партиционирована по месяцам (PARTITION BY RANGE listened_at),
+    партиции заранее создаёт и удаляет команда listening_partitions.
+    Первичный ключ в БД — (id, listened_at), как того требует партиционирование.
+    Строки пишет пачками консьюмер очереди событий (services.events),
+    event_id делает эту запись идемпотентной.
+    """
+
+    class EventTypeChoices(models.TextChoices):
+        PLAY = "play", "Play"
+        VIEW = "view", "View"
+        SKIP = "skip", "Skip"
+
+    id = models.BigAutoField(primary_key=True)
+    event_id = models.UUIDField(null=True, blank=True, editable=False)
+    event_type = models.CharField(
+        max_length=8,
+        choices=EventTypeChoices.choices,
+        default=EventTypeChoices.VIEW,
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="listening_events",
+    )
+    track = models.ForeignKey(
+        Track, on_delete=models.CASCADE, related_name="listening_events"
+    )
+    listened_at = models.DateTimeField(default=timezone.now)
+    duration = models.PositiveIntegerField(
+        null=True, blank=True, help_text="how many seconds listened"
+    )
+    additional_info = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Additional metadata about the listening session",
+    )
+
+    objects = ListeningEventManager()
+
+    class Meta:
+        db_table = "musics_listening_events"
+        indexes = [
+            models.Index(fields=["user", "-listened_at", "-id"]),
+            models.Index(fields=["user", "track", "-listened_at"]),
+            models.Index(fields=["track", "listened_at"]),
+        ]
+        constraints = [
+            # Уникальность в партиционированной таблице обязана включать listened_at
+            models.UniqueConstraint(
+                fields=["event_id", "listened_at"],
+                name="musics_listening_event_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} listened to {self.track_id} at {self.listened_at}"
+
+
+class ListeningHistoryHide(models.Model):
+    """
+    Скрытая пользователем часть истории: прослушивания трека (или всей
+    истории, если track пуст) не позже hidden_at не показываются.
+    Сам лог ListeningEvent не трогается — по нему считаются чарты,
+    похожие треки и рекомендации, а чистит его только удаление партиций.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="listening_history_hides",
+    )
+    track = models.ForeignKey(
+        Track,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    hidden_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "musics_listening_history_hides"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "track"], name="musics_history_hide_track_uniq"
+            ),
+            models.UniqueConstraint(
+                fields=["user"],
+                condition=models.Q(track__isnull=True),
+                name="musics_history_hide_all_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} hid {self.track_id or 'all'} at {self.hidden_at}"
+
+
+class CounterFlush(models.Model):
+    """Отметка о применённом батче счётчиков (защита от двойного сброса)."""
+
+    batch_id = models.CharField(max_length=64, unique=True)
+    rows = models.PositiveIntegerField(default=0)
+    applied_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        db_table = "musics_counter_flushes"
+
+    def __str__(self):
+        return f"{self.batch_id} ({self.rows} rows)"
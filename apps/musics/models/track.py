@@ -3,13 +3,14 @@ from django.utils.text import slugify
 from django.db import models
 from django.db.models import F
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MinValueValidator
 from apps.shared.models.base import NamedModel
 from .artist import Artist
 from .album import Album
 from .genres import Genre
 from apps.musics.managers.track import TrackManager
-from django.core.cache import cache
+from apps.shared.utils.tagged_cache import get_or_set_tagged, invalidate_tags
  
 
 class Track(NamedModel):
@@ -83,13 +84,19 @@ class Track(NamedModel):
 
     is_published = models.BooleanField(verbose_name=_("Is published"), default=True, db_index=True)
 
+    # Денормализованный tsvector (название, артист, альбом) для поиска в PostgreSQL.
+    # Пересчитывается сигналами, GIN-индексы создаёт миграция 0018 (только PostgreSQL)
+    search_vector = SearchVectorField(null=True, editable=False)
+
     objects = TrackManager()
 
     class Meta:
         db_table = "musics_tracks"
+        # Ключи keyset-пагинации списка треков: фильтр is_published, сортировка + id
         indexes = [
-            models.Index(fields=["-plays_count", "is_published"]),
-            models.Index(fields=["-likes_count", "is_published"]),
+            models.Index(fields=["is_published", "-plays_count", "-id"]),
+            models.Index(fields=["is_published", "-likes_count", "-id"]),
+            models.Index(fields=["is_published", "duration", "id"]),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -116,11 +123,11 @@ class Track(NamedModel):
 
     def increment_play(self):
         Track.objects.filter(id=self.id).update(plays_count=F("plays_count") + 1)
-        cache.delete(f"track_{self.id}_stats")
+        invalidate_tags(f"track:{self.id}")
 
     def increment_like(self):
         Track.objects.filter(id=self.id).update(likes_count=F("likes_count") + 1)
-        cache.delete(f"track_{self.id}_stats")
+        invalidate_tags(f"track:{self.id}")
     
     def increment_download(self):
         Track.objects.filter(id=self.id).update(download_count=F("download_count") + 1)
@@ -128,32 +135,35 @@ class Track(NamedModel):
     @property
     def stats(self):
         """Возвращает данные о треке с кэшем."""
-        key = f"track_{self.id}_stats"
-        data = cache.get(key)
-        if data is None:
-            data = {
+        return get_or_set_tagged(
+            f"track_{self.id}_stats",
+            lambda: {
                 "plays": self.plays_count,
                 "likes": self.likes_count,
                 "downloads": self.download_count,
                 "duration": self.duration,
                 "album": self.album_name,
-            }
-            cache.set(key, data, timeout=30)
-        return data
+            },
+            tags=[f"track:{self.id}"],
+        )
     
     # --- Кэш топ треков ---
     @classmethod
     def get_top_tracks(cls, limit=10):
-        """Кэшированный список популярных треков."""
-        key = f"top_tracks_{limit}"
-        top_tracks = cache.get(key)
-        if top_tracks is None:
-            top_tracks = list(
+        """Кэшированный список популярных треков (в кэше — только id)."""
+        # Тег "tracks" ловит изменения каталога, TTL — дрейф plays_count
+        ids = get_or_set_tagged(
+            f"top_tracks_{limit}",
+            lambda: list(
                 cls.objects.filter(is_published=True)
-                .order_by("-plays_count")[:limit]
-            )
-            cache.set(key, top_tracks, timeout=60)
-        return top_tracks
+                .order_by("-plays_count")
+                .values_list("pk", flat=True)[:limit]
+            ),
+            tags=["tracks"],
+            timeout=60 * 10,
+        )
+        tracks = cls.objects.in_bulk(ids)
+        return [tracks[pk] for pk in ids if pk in tracks]
 
     # --- Свойства для сериализатора ---
     @property
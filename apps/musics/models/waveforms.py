@@ -0,0 +1,29 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .track import Track
+
+
+class TrackWaveform(models.Model):
+    """
+    Пики (min/max) аудио трека для отрисовки волны: готовый ответ
+    /tracks/{slug}/waveform/ в формате .dat audiowaveform, несколько KB.
+    source — имя audio, из которого посчитаны пики.
+    """
+
+    track = models.OneToOneField(
+        Track, on_delete=models.CASCADE, related_name="waveform"
+    )
+    source = models.CharField(max_length=255)
+    bits = models.PositiveSmallIntegerField(default=8)
+    buckets = models.PositiveIntegerField()
+    data = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "musics_track_waveforms"
+        verbose_name = _("Track waveform")
+        verbose_name_plural = _("Track waveforms")
+
+    def __str__(self):
+        return f"{self.track_id}: {self.buckets} x {self.bits} bit"
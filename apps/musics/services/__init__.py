@@ -0,0 +1,13 @@
+from .als import *  # noqa
+from .charts import *  # noqa
+from .counters import *  # noqa
+from .events import *  # noqa
+from .fragments import *  # noqa
+from .likes import *  # noqa
+from .metadata import *  # noqa
+from .partitions import *  # noqa
+from .recommendations import *  # noqa
+from .search import *  # noqa
+from .similarity import *  # noqa
+from .transcoding import *  # noqa
+from .waveforms import *  # noqa
@@ -0,0 +1,119 @@
+import numpy as np
+from scipy import sparse
+
+# Верхняя граница памяти под векторы y_i наблюдаемых пар одной пачки строк
+ALS_BATCH_BYTES = 256 * 1024 * 1024
+ALS_CG_STEPS = 3
+
+
+def train_als(
+    confidence,
+    factors=64,
+    iterations=10,
+    regularization=0.05,
+    cg_steps=ALS_CG_STEPS,
+    seed=0,
+):
+    """
+    Implicit ALS (Hu, Koren, Volinsky 2008), векторизованный на NumPy/SciPy.
+
+    confidence — CSR user×item с (c_ui - 1) для наблюдаемых пар (p_ui = 1).
+    Возвращает (user_factors, item_factors) в float32.
+    """
+    confidence = sparse.csr_matrix(confidence, dtype=np.float32)
+    n_users, n_items = confidence.shape
+    rng = np.random.default_rng(seed)
+    users = rng.normal(scale=0.01, size=(n_users, factors)).astype(np.float32)
+    items = rng.normal(scale=0.01, size=(n_items, factors)).astype(np.float32)
+    item_confidence = confidence.T.tocsr()
+
+    for _ in range(iterations):
+        users = als_step(confidence, items, regularization, users, cg_steps)
+        items = als_step(item_confidence, users, regularization, items, cg_steps)
+    return users, items
+
+
+def als_step(confidence, fixed, regularization, current=None, cg_steps=ALS_CG_STEPS):
+    """
+    Один полушаг ALS: для каждой строки confidence приближённо решает
+    (Y^T Y + Y_u^T (C_u - I) Y_u + λI) x_u = Y_u^T C_u p_u
+    несколькими шагами сопряжённых градиентов, стартуя с current.
+    Все строки пачки решаются одновременно: произведение A_u·p считается
+    через gram-матрицу и разреженное умножение, без матриц f×f на строку.
+    """
+    n_rows, factors = confidence.shape[0], fixed.shape[1]
+    fixed = np.ascontiguousarray(fixed, dtype=np.float32)
+    gram = fixed.T @ fixed + regularization * np.eye(factors, dtype=np.float32)
+    if current is None:
+        solved = np.zeros((n_rows, factors), dtype=np.float32)
+    else:
+        solved = np.array(current, dtype=np.float32)
+
+    max_nnz = max(ALS_BATCH_BYTES // (factors * 4), 1)
+    indptr = confidence.indptr
+    start = 0
+    while start < n_rows:
+        # Сколько строк помещается в пачку по числу ненулевых элементов
+        end = int(np.searchsorted(indptr, indptr[start] + max_nnz, side="right")) - 1
+        end = min(max(end, start + 1), n_rows)
+        solved[start:end] = _conjugate_gradient(
+            confidence[start:end], fixed, gram, solved[start:end], cg_steps
+        )
+        start = end
+    return solved
+
+
+def top_k_items(user_vectors, item_factors, k, exclude=None):
+    """
+    Индексы k лучших предметов для каждой строки user_vectors, по убыванию скора.
+    exclude — CSR (строки как у user_vectors) с предметами, которые нужно пропустить.
+    """
+    scores = user_vectors @ item_factors.T
+    if exclude is not None:
+        rows = np.repeat(np.arange(exclude.shape[0]), np.diff(exclude.indptr))
+        scores[rows, exclude.indices] = -np.inf
+    k = min(k, scores.shape[1])
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    best_scores = np.take_along_axis(scores, best, axis=1)
+    order = np.argsort(-best_scores, axis=1)
+    best = np.take_along_axis(best, order, axis=1)
+    # Если непросмотренных предметов меньше k, хвост добивается -1
+    best[np.isneginf(np.take_along_axis(best_scores, order, axis=1))] = -1
+    return best
+
+
+def _conjugate_gradient(confidence, fixed, gram, x, steps):
+    rows = np.repeat(np.arange(confidence.shape[0]), np.diff(confidence.indptr))
+    vectors = fixed[confidence.indices]
+
+    def apply(p):
+        # A_u p_u = (Y^T Y + λI) p_u + Y_u^T ((c_u - 1) ⊙ (Y_u p_u))
+        dots = np.einsum("nf,nf->n", vectors, p[rows])
+        weighted = sparse.csr_matrix(
+            (confidence.data * dots, confidence.indices, confidence.indptr),
+            shape=confidence.shape,
+        )
+        return p @ gram + weighted @ fixed
+
+    # b_u = Y_u^T C_u p_u: для наблюдаемых пар c_ui = (c_ui - 1) + 1
+    target = sparse.csr_matrix(
+        (confidence.data + 1, confidence.indices, confidence.indptr),
+        shape=confidence.shape,
+    )
+    residual = target @ fixed - apply(x)
+    direction = residual.copy()
+    norm = np.einsum("nf,nf->n", residual, residual)
+    for _ in range(steps):
+        applied = apply(direction)
+        curvature = np.einsum("nf,nf->n", direction, applied)
+        alpha = np.divide(norm, curvature, out=np.zeros_like(norm), where=curvature > 0)
+        x += alpha[:, None] * direction
+        residual -= alpha[:, None] * applied
+        new_norm = np.einsum("nf,nf->n", residual, residual)
+        beta = np.divide(new_norm, norm, out=np.zeros_like(norm), where=norm > 0)
+        direction = residual + beta[:, None] * direction
+        norm = new_norm
+    return x
+
+
+__all__ = ["train_als", "als_step", "top_k_items"]
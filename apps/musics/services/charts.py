@@ -0,0 +1,197 @@
+import heapq
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.musics.models import (
+    Album,
+    Chart,
+    ChartEntry,
+    ListeningEvent,
+    Track,
+    TrackDailyPlays,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def rollup_daily_plays(day=None):
+    """
+    Пересчитывает TrackDailyPlays за день day (по умолчанию — сегодня)
+    из лога ListeningEvent. Идемпотентно: строки дня заменяются целиком.
+    Возвращает количество треков с прослушиваниями.
+    """
+    day = day or timezone.localdate()
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    rows = (
+        ListeningEvent.objects.between(start, start + timedelta(days=1))
+        .filter(event_type=ListeningEvent.EventTypeChoices.PLAY)
+        .values("track_id")
+        .annotate(plays=Count("id"), listeners=Count("user_id", distinct=True))
+        .order_by()
+    )
+    objs = [
+        TrackDailyPlays(
+            track_id=row["track_id"],
+            day=day,
+            plays=row["plays"],
+            listeners=row["listeners"],
+        )
+        for row in rows.iterator(chunk_size=10_000)
+    ]
+    with transaction.atomic():
+        TrackDailyPlays.objects.filter(day=day).delete()
+        TrackDailyPlays.objects.bulk_create(objs, batch_size=5000)
+    return len(objs)
+
+
+def period_bounds(period, day):
+    """(первый день, день после последнего) недели или месяца, содержащего day."""
+    if period == Chart.PeriodChoices.WEEKLY:
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=7)
+    start = day.replace(day=1)
+    return start, (start + timedelta(days=32)).replace(day=1)
+
+
+def build_charts(period, day=None):
+    """
+    Строит чарты периода period, содержащего day (по умолчанию — вчера):
+    общий, по каждому жанру и по каждому языку, top CHARTS_SIZE треков
+    по сумме суточных роллапов. previous_position берётся из чартов
+    предыдущего периода. Незавершённый период пересчитывается каждый день.
+    Возвращает количество построенных чартов.
+    """
+    day = day or timezone.localdate() - timedelta(days=1)
+    start, end = period_bounds(period, day)
+    previous_start, _ = period_bounds(period, start - timedelta(days=1))
+    in_period = Q(day__gte=start, day__lt=end)
+
+    totals = (
+        TrackDailyPlays.objects.filter(in_period, track__is_published=True)
+        .values("track_id", "track__language")
+        .annotate(total=Sum("plays"))
+        .order_by()
+    )
+    scopes = defaultdict(list)
+    for row in totals.iterator(chunk_size=10_000):
+        item = (row["track_id"], row["total"])
+        scopes[(Chart.ScopeChoices.ALL, "")].append(item)
+        language = (row["track__language"] or "").strip().lower()
+        if language:
+            scopes[(Chart.ScopeChoices.LANGUAGE, language)].append(item)
+    plays = dict(scopes.get((Chart.ScopeChoices.ALL, ""), []))
+
+    track_genres = (
+        Track.genres.through.objects.filter(
+            track__daily_plays__day__gte=start, track__daily_plays__day__lt=end
+        )
+        .values_list("track_id", "genre__slug")
+        .distinct()
+    )
+    for track_id, slug in track_genres.iterator(chunk_size=10_000):
+        if track_id in plays:
+            scopes[(Chart.ScopeChoices.GENRE, slug)].append((track_id, plays[track_id]))
+
+    previous = defaultdict(dict)
+    for scope, key, track_id, position in ChartEntry.objects.filter(
+        chart__period=period, chart__period_start=previous_start
+    ).values_list("chart__scope", "chart__key", "track_id", "position"):
+        previous[(scope, key)][track_id] = position
+
+    with transaction.atomic():
+        Chart.objects.filter(period=period, period_start=start).delete()
+        charts = Chart.objects.bulk_create(
+            Chart(
+                period=period,
+                scope=scope,
+                key=key,
+                period_start=start,
+                period_end=end - timedelta(days=1),
+            )
+            for scope, key in scopes
+        )
+        entries = []
+        for chart, (scope_key, items) in zip(charts, scopes.items()):
+            # При равных прослушиваниях выше трек с меньшим id — порядок стабилен
+            top = heapq.nsmallest(
+                settings.CHARTS_SIZE, items, key=lambda item: (-item[1], item[0])
+            )
+            last = previous.get(scope_key, {})
+            entries.extend(
+                ChartEntry(
+                    chart=chart,
+                    position=position,
+                    track_id=track_id,
+                    plays=total,
+                    previous_position=last.get(track_id),
+                )
+                for position, (track_id, total) in enumerate(top, start=1)
+            )
+        ChartEntry.objects.bulk_create(entries, batch_size=5000)
+
+    logger.info("Built %s %s charts from %s", len(charts), period, start)
+    return len(charts)
+
+
+def update_album_listens(day=None):
+    """
+    Заполняет Album.listens_last_week / listens_last_month суммой
+    суточных роллапов треков альбома за 7 и 30 дней, заканчивая днём day.
+    Возвращает количество альбомов с прослушиваниями.
+    """
+    day = day or timezone.localdate()
+    week_start, month_start = day - timedelta(days=6), day - timedelta(days=29)
+    rows = (
+        TrackDailyPlays.objects.filter(
+            day__gte=month_start, day__lte=day, track__album__isnull=False
+        )
+        .values("track__album_id")
+        .annotate(
+            month=Sum("plays"),
+            week=Sum("plays", filter=Q(day__gte=week_start)),
+        )
+        .order_by()
+    )
+    albums = [
+        Album(
+            pk=row["track__album_id"],
+            listens_last_week=row["week"] or 0,
+            listens_last_month=row["month"],
+        )
+        for row in rows.iterator(chunk_size=10_000)
+    ]
+    with transaction.atomic():
+        Album.objects.filter(
+            Q(listens_last_week__gt=0) | Q(listens_last_month__gt=0)
+        ).update(listens_last_week=0, listens_last_month=0)
+        Album.objects.bulk_update(
+            albums, ["listens_last_week", "listens_last_month"], batch_size=1000
+        )
+    return len(albums)
+
+
+def refresh_charts(day=None):
+    """
+    Ежедневная сборка: закрывает роллап за day (по умолчанию — вчера),
+    строит недельные и месячные чарты и обновляет счётчики альбомов.
+    """
+    day = day or timezone.localdate() - timedelta(days=1)
+    rollup_daily_plays(day)
+    built = sum(build_charts(period, day) for period in Chart.PeriodChoices.values)
+    update_album_listens(day)
+    return built
+
+
+__all__ = [
+    "rollup_daily_plays",
+    "period_bounds",
+    "build_charts",
+    "update_album_listens",
+    "refresh_charts",
+]
@@ -0,0 +1,321 @@
+import logging
+import uuid
+from collections import defaultdict
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Abs, Coalesce
+from django.utils import timezone
+from redis.exceptions import RedisError, ResponseError
+
+from apps.musics.models import Album, Artist, CounterFlush, Like, Track
+from apps.musics.services.fragments import mark_fragments_stale
+from apps.shared.utils.redis import get_redis_connection
+from apps.shared.utils.tagged_cache import invalidate_tags_on_commit
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "musics:counters:pending"
+FLUSHING_KEY = "musics:counters:flushing"
+FLUSH_LOCK_KEY = "musics:counters:flush-lock"
+FLUSH_LOCK_TIMEOUT = 300
+BATCH_FIELD = "__batch__"
+FLUSH_CHUNK_SIZE = 1000
+
+# Поле в hash "<цель>:<id>" -> (модель, колонка счётчика)
+COUNTER_TARGETS = {
+    "track:plays": (Track, "plays_count"),
+    "album:plays": (Album, "plays_count"),
+    "artist:plays": (Artist, "total_plays"),
+    "track:likes": (Track, "likes_count"),
+    "album:likes": (Album, "likes_count"),
+    "artist:likes": (Artist, "total_likes"),
+}
+
+
+def record_play(track):
+    """
+    Засчитывает прослушивание трека (write-behind).
+
+    Дельты для трека, альбома и артиста копятся в Redis и сбрасываются
+    в БД задачей flush_play_counters. Без Redis пишем сразу в БД.
+    Возвращает plays_count с учётом ещё не сброшенного буфера.
+    """
+    deltas = _target_deltas("plays", 1, [(track.id, track.artist_id, track.album_id)])
+    pending = _buffer(deltas)
+    if pending is not None:
+        return track.plays_count + pending[("track:plays", track.id)]
+    apply_deltas(deltas)
+    track.refresh_from_db(fields=["plays_count"])
+    return track.plays_count
+
+
+def record_like(track_id, delta=1, artist_id=None, album_id=None):
+    """
+    Засчитывает лайк (delta=1) или его снятие (delta=-1) тем же буфером,
+    что и прослушивания: трек, альбом и артист обновляются одним батчем.
+    Принимает id, а не трек: сигналы Like не загружают Track ради счётчика.
+    Без artist_id/album_id меняется только счётчик трека — агрегаты
+    альбома и артиста выправит reconcile_counters.
+    """
+    record_likes([(track_id, artist_id, album_id)], delta)
+
+
+def record_likes(tracks, delta=1):
+    """record_like для пачки (track_id, artist_id, album_id) одним pipeline."""
+    deltas = _target_deltas("likes", delta, tracks)
+    if deltas and _buffer(deltas) is None:
+        apply_deltas(deltas)
+
+
+def get_pending_delta(target, pk):
+    """Ещё не сброшенная в БД дельта счётчика (0 без Redis)."""
+    redis = get_redis_connection()
+    if redis is None:
+        return 0
+    try:
+        return int(redis.hget(PENDING_KEY, f"{target}:{pk}") or 0)
+    except RedisError:
+        return 0
+
+
+def _target_deltas(counter, delta, tracks):
+    deltas = defaultdict(int)
+    for track_id, artist_id, album_id in tracks:
+        for target, pk in (
+            ("track", track_id),
+            ("artist", artist_id),
+            ("album", album_id),
+        ):
+            if pk:
+                deltas[(f"{target}:{counter}", pk)] += delta
+    return dict(deltas)
+
+
+def _buffer(deltas):
+    """
+    Добавляет дельты в pending-hash -> {(цель, id): накопленная дельта}.
+    None — Redis нет или он недоступен, писать нужно сразу в БД.
+    """
+    redis = get_redis_connection()
+    if redis is None:
+        return None
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for (target, pk), value in deltas.items():
+            pipe.hincrby(PENDING_KEY, f"{target}:{pk}", value)
+        return dict(zip(deltas, pipe.execute()))
+    except RedisError:
+        logger.exception("Counter buffer is unavailable, writing through")
+        return None
+
+
+def flush_counters():
+    """
+    Сбрасывает накопленные в Redis дельты в БД.
+
+    Crash-safe: pending-hash атомарно переименовывается во flushing-hash
+    и получает batch id. Применение батча фиксируется в CounterFlush в той же
+    транзакции, поэтому повторный flush после падения воркера дочитает
+    оставшийся flushing-hash, но не посчитает его дважды.
+    Возвращает количество обновлённых счётчиков.
+    """
+    redis = get_redis_connection()
+    if redis is None:
+        return 0
+
+    lock = redis.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        if not redis.exists(FLUSHING_KEY):
+            try:
+                redis.rename(PENDING_KEY, FLUSHING_KEY)
+            except ResponseError:
+                # pending-hash ещё не создан — сбрасывать нечего
+                return 0
+
+        redis.hsetnx(FLUSHING_KEY, BATCH_FIELD, uuid.uuid4().hex)
+        raw = redis.hgetall(FLUSHING_KEY)
+        batch_id = raw.pop(BATCH_FIELD.encode()).decode()
+        deltas = _parse_deltas(raw)
+
+        try:
+            with transaction.atomic():
+                CounterFlush.objects.create(batch_id=batch_id, rows=len(deltas))
+                apply_deltas(deltas)
+        except IntegrityError:
+            logger.warning("Counter batch %s is already applied, dropping it", batch_id)
+        else:
+            # Счётчики есть в JSON-фрагментах треков: их перерендерит отдельная
+            # задача refresh_counter_fragments — не в запросе и не под этой блокировкой
+            mark_fragments_stale(
+                {pk for (target, pk) in deltas if target.startswith("track:")}
+            )
+
+        redis.delete(FLUSHING_KEY)
+    finally:
+        lock.release()
+
+    return len(deltas)
+
+
+def apply_deltas(deltas):
+    """Применяет дельты {(цель, id): дельта} пачками по моделям."""
+    grouped = defaultdict(dict)
+    for (target, pk), delta in deltas.items():
+        if delta:
+            grouped[target][pk] = delta
+
+    for target, items in grouped.items():
+        model, column = COUNTER_TARGETS[target]
+        bulk_increment(model, column, items)
+
+    # "track:plays" -> тег кэша "track:<id>" (статистика трека, альбома, артиста)
+    invalidate_tags_on_commit(
+        *{
+            f"{target.split(':')[0]}:{pk}"
+            for target, items in grouped.items()
+            for pk in items
+        }
+    )
+
+
+def bulk_increment(model, column, deltas):
+    """
+    UPDATE ... FROM (VALUES ...) пачками по FLUSH_CHUNK_SIZE строк.
+    Строки сортируются по id, чтобы параллельные flush не ловили deadlock.
+    updated_at сдвигается вместе со счётчиком — на нём держится conditional GET.
+    На не-Postgres БД (dev, sqlite) — построчный UPDATE через F().
+    """
+    items = sorted(deltas.items())
+    if connection.vendor != "postgresql":
+        for pk, delta in items:
+            model.objects.filter(pk=pk).update(
+                **{column: F(column) + delta, "updated_at": timezone.now()}
+            )
+        return
+
+    qn = connection.ops.quote_name
+    table, column = qn(model._meta.db_table), qn(column)
+    with connection.cursor() as cursor:
+        for start in range(0, len(items), FLUSH_CHUNK_SIZE):
+            chunk = items[start : start + FLUSH_CHUNK_SIZE]
+            values = ", ".join(["(%s::bigint, %s::bigint)"] * len(chunk))
+            cursor.execute(
+                f"UPDATE {table} AS t "
+                f"SET {column} = t.{column} + v.delta, updated_at = now() "
+                f"FROM (VALUES {values}) AS v(id, delta) WHERE t.id = v.id",
+                [value for pair in chunk for value in pair],
+            )
+
+
+def reconcile_counters(fix=True):
+    """
+    Сверяет счётчики с точными значениями, посчитанными одним UPDATE/SELECT
+    на цель: likes_count трека — по таблице лайков, счётчики альбома
+    и артиста — по сумме счётчиков их треков. plays_count трека не сверяется:
+    лог прослушиваний хранится не вечно.
+
+    Пока идёт сверка, flush не выполняется (общая блокировка). Треки с ещё
+    не сброшенными в БД лайками пропускаются — их дельта ещё в пути.
+    Возвращает {цель: {"rows": ..., "drift": ...}} — расхождения до исправления.
+    """
+    redis = get_redis_connection()
+    lock = None
+    if redis is not None:
+        lock = redis.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT)
+        if not lock.acquire(blocking=True, blocking_timeout=60):
+            logger.warning("Counter flush is running, reconciliation skipped")
+            return {}
+    try:
+        in_flight = _buffered_ids(redis, "track:likes")
+        report = {}
+        for target, exact in _exact_counters().items():
+            model, column = COUNTER_TARGETS[target]
+            drifted = model.objects.filter(~Q(**{column: exact}))
+            if target == "track:likes" and in_flight:
+                drifted = drifted.exclude(pk__in=in_flight)
+
+            report[target] = drifted.aggregate(
+                rows=Count("pk"), drift=Coalesce(Sum(Abs(exact - F(column))), 0)
+            )
+            if report[target]["rows"]:
+                logger.warning(
+                    "Counter %s drifted on %s rows by %s in total",
+                    target,
+                    report[target]["rows"],
+                    report[target]["drift"],
+                )
+                if fix:
+                    drifted.update(**{column: exact, "updated_at": timezone.now()})
+        return report
+    finally:
+        if lock is not None:
+            lock.release()
+
+
+def _exact_counters():
+    """
+    Точные значения счётчиков как коррелированные подзапросы.
+    Порядок важен: лайки альбома и артиста считаются по уже исправленным трекам.
+    """
+
+    def total(model, group_by, expression):
+        subquery = (
+            model.objects.filter(**{group_by: OuterRef("pk")})
+            .order_by()
+            .values(group_by)
+            .annotate(total=expression)
+            .values("total")
+        )
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), 0)
+
+    return {
+        "track:likes": total(Like, "track", Count("pk")),
+        "album:plays": total(Track, "album", Sum("plays_count")),
+        "album:likes": total(Track, "album", Sum("likes_count")),
+        "artist:plays": total(Track, "artist", Sum("plays_count")),
+        "artist:likes": total(Track, "artist", Sum("likes_count")),
+    }
+
+
+def _buffered_ids(redis, target):
+    if redis is None:
+        return set()
+    prefix = f"{target}:".encode()
+    ids = set()
+    for key in (PENDING_KEY, FLUSHING_KEY):
+        for field in redis.hkeys(key):
+            if field.startswith(prefix):
+                ids.add(int(field[len(prefix) :]))
+    return ids
+
+
+def purge_counter_flushes(days=7):
+    """Удаляет старые отметки о применённых батчах."""
+    since = timezone.now() - timezone.timedelta(days=days)
+    deleted, _ = CounterFlush.objects.filter(applied_at__lt=since).delete()
+    return deleted
+
+
+def _parse_deltas(raw):
+    deltas = {}
+    for field, value in raw.items():
+        target, pk = field.decode().rsplit(":", 1)
+        if target in COUNTER_TARGETS:
+            deltas[(target, int(pk))] = int(value)
+    return deltas
+
+
+__all__ = [
+    "record_play",
+    "record_like",
+    "record_likes",
+    "get_pending_delta",
+    "flush_counters",
+    "apply_deltas",
+    "bulk_increment",
+    "reconcile_counters",
+    "purge_counter_flushes",
+]
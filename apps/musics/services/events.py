@@ -0,0 +1,309 @@
+import atexit
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from redis.exceptions import RedisError, ResponseError
+
+from apps.musics.models import ListeningEvent, Track
+from apps.shared.utils.redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+EVENTS_STREAM_KEY = "musics:events"
+EVENTS_GROUP = "musics-ingest"
+# Сообщения упавших консьюмеров забираем после такого простоя
+EVENTS_CLAIM_IDLE_MS = 60 * 1000
+
+EVENT_TYPES = set(ListeningEvent.EventTypeChoices.values)
+
+# Локальный буфер процесса — на случай, когда Redis нет или он недоступен
+_local_buffer = deque()
+_local_lock = threading.Lock()
+_local_flushed_at = time.monotonic()
+
+
+def track_event(user, track, event_type, duration=None):
+    """
+    Ставит событие прослушивания в очередь на запись.
+
+    В запросе нет записи в БД: компактное событие уходит в Redis stream,
+    откуда его пачками пишет задача ingest_listening_events. Без Redis
+    события копятся в локальном буфере процесса и пишутся в БД пачкой.
+    """
+    if user is None or not user.is_authenticated:
+        return
+    event = {
+        "id": uuid.uuid4().hex,
+        "e": event_type,
+        "u": user.pk,
+        "t": track.pk,
+        "ts": f"{time.time():.6f}",
+    }
+    if duration is not None:
+        event["d"] = int(duration)
+
+    redis = get_redis_connection()
+    if redis is not None:
+        try:
+            _xadd(redis, event)
+            return
+        except RedisError:
+            logger.exception("Event stream is unavailable, buffering locally")
+
+    with _local_lock:
+        _local_buffer.append(event)
+        due = (
+            len(_local_buffer) >= settings.LISTENING_EVENTS_LOCAL_BUFFER_SIZE
+            or time.monotonic() - _local_flushed_at
+            >= settings.LISTENING_EVENTS_LOCAL_FLUSH_INTERVAL
+        )
+    if due:
+        flush_local_events()
+
+
+def flush_local_events():
+    """
+    Сбрасывает локальный буфер: в stream, если Redis снова доступен, иначе в БД.
+    Возвращает количество сброшенных событий.
+    """
+    global _local_flushed_at
+    with _local_lock:
+        events = list(_local_buffer)
+        _local_buffer.clear()
+        _local_flushed_at = time.monotonic()
+    if not events:
+        return 0
+
+    redis = get_redis_connection()
+    if redis is not None:
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for event in events:
+                _xadd(pipe, event)
+            pipe.execute()
+            return len(events)
+        except RedisError:
+            logger.exception("Event stream is unavailable, writing events to the DB")
+
+    # event_id уникален, поэтому частично ушедшая в stream пачка не задвоится
+    write_events(events)
+    return len(events)
+
+
+def ingest_events(batch_size=None, max_batches=None, block_ms=None):
+    """
+    Консьюмер stream: читает события пачками через consumer group,
+    пишет их bulk_create и подтверждает (XACK + XDEL) только после коммита.
+
+    Идемпотентен: у события есть event_id, вставка идёт с ON CONFLICT DO NOTHING,
+    поэтому повторная доставка после падения воркера не создаёт дублей.
+    Возвращает количество обработанных событий.
+    """
+    redis = get_redis_connection()
+    if redis is None:
+        return flush_local_events()
+
+    batch_size = batch_size or settings.LISTENING_EVENTS_BATCH_SIZE
+    max_batches = max_batches or settings.LISTENING_EVENTS_MAX_BATCHES
+    consumer = f"{socket.gethostname()}-{os.getpid()}"
+    _ensure_group(redis)
+
+    # Сначала дочитываем то, что взяли и не подтвердили упавшие консьюмеры
+    _, entries, *_ = redis.xautoclaim(
+        EVENTS_STREAM_KEY,
+        EVENTS_GROUP,
+        consumer,
+        min_idle_time=EVENTS_CLAIM_IDLE_MS,
+        count=batch_size,
+    )
+    processed = _process_entries(redis, entries)
+
+    for _ in range(max_batches):
+        response = redis.xreadgroup(
+            EVENTS_GROUP,
+            consumer,
+            {EVENTS_STREAM_KEY: ">"},
+            count=batch_size,
+            block=block_ms,
+        )
+        entries = response[0][1] if response else []
+        if not entries:
+            break
+        processed += _process_entries(redis, entries)
+        if len(entries) < batch_size:
+            break
+
+    _check_backlog(get_events_stats(redis))
+    return processed
+
+
+def write_events(events):
+    """
+    Пишет события (словари формата track_event) в ListeningEvent одной пачкой.
+
+    Битые события и события удалённых с тех пор треков и пользователей
+    пропускаются: ignore_conflicts не спасает от нарушения FK, и одна такая
+    запись валила бы всю пачку, а неподтверждённая пачка возвращается
+    через xautoclaim первой и навсегда останавливает приём.
+    Если трек удалят между проверкой и вставкой, пачка упадёт один раз,
+    а повторная доставка её перепроверит.
+    """
+    objs = []
+    for event in events:
+        event = {_decode(key): _decode(value) for key, value in event.items()}
+        try:
+            if event.get("e") not in EVENT_TYPES:
+                raise ValueError(event.get("e"))
+            obj = ListeningEvent(
+                event_id=uuid.UUID(event["id"]),
+                event_type=event["e"],
+                user_id=int(event["u"]),
+                track_id=int(event["t"]),
+                listened_at=datetime.fromtimestamp(
+                    float(event["ts"]), tz=dt_timezone.utc
+                ),
+                duration=int(event["d"]) if event.get("d") is not None else None,
+            )
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Skipping malformed listening event %s", event)
+            continue
+        objs.append(obj)
+
+    track_ids = set(
+        Track.objects.filter(pk__in={obj.track_id for obj in objs}).values_list(
+            "pk", flat=True
+        )
+    )
+    user_ids = set(
+        get_user_model()
+        .objects.filter(pk__in={obj.user_id for obj in objs})
+        .values_list("pk", flat=True)
+    )
+    existing = [
+        obj for obj in objs if obj.track_id in track_ids and obj.user_id in user_ids
+    ]
+    if len(existing) < len(objs):
+        logger.warning(
+            "Skipping %s listening events of deleted tracks or users",
+            len(objs) - len(existing),
+        )
+    ListeningEvent.objects.bulk_create(
+        existing,
+        batch_size=settings.LISTENING_EVENTS_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return len(existing)
+
+
+def get_events_stats(redis=None):
+    """
+    Метрики back-pressure очереди событий:
+    depth — событий в stream (не подтверждённые + ещё не прочитанные),
+    pending — взяты консьюмерами, но не подтверждены,
+    lag_seconds — возраст самого старого события в очереди,
+    local_buffer — событий в локальном буфере этого процесса.
+    """
+    stats = {
+        "depth": 0,
+        "pending": 0,
+        "lag_seconds": 0.0,
+        "local_buffer": len(_local_buffer),
+    }
+    redis = redis or get_redis_connection()
+    if redis is None:
+        return stats
+
+    pipe = redis.pipeline(transaction=False)
+    pipe.xlen(EVENTS_STREAM_KEY)
+    pipe.xrange(EVENTS_STREAM_KEY, count=1)
+    depth, oldest = pipe.execute()
+    stats["depth"] = depth
+    if oldest:
+        oldest_ms = int(_decode(oldest[0][0]).split("-")[0])
+        stats["lag_seconds"] = round(max(time.time() - oldest_ms / 1000, 0), 3)
+    try:
+        for group in redis.xinfo_groups(EVENTS_STREAM_KEY):
+            if _decode(group["name"]) == EVENTS_GROUP:
+                stats["pending"] = group["pending"]
+    except ResponseError:
+        # stream ещё не создан
+        pass
+    return stats
+
+
+def _xadd(redis, event):
+    # Подтверждённые события удаляются из stream (XDEL), поэтому обрезка
+    # по MAXLEN выбросила бы только ещё не прочитанные. По умолчанию stream
+    # не обрезается, а растущую очередь видно по _check_backlog.
+    maxlen = settings.LISTENING_EVENTS_STREAM_MAXLEN
+    if maxlen:
+        redis.xadd(EVENTS_STREAM_KEY, event, maxlen=maxlen, approximate=True)
+    else:
+        redis.xadd(EVENTS_STREAM_KEY, event)
+
+
+def _check_backlog(stats):
+    maxlen = settings.LISTENING_EVENTS_STREAM_MAXLEN
+    if maxlen and stats["depth"] >= maxlen:
+        logger.error(
+            "Listening event backlog reached LISTENING_EVENTS_STREAM_MAXLEN: "
+            "%(depth)s events, lag %(lag_seconds)ss; unread events are being trimmed",
+            stats,
+        )
+    elif stats["depth"] >= settings.LISTENING_EVENTS_BACKLOG_WARNING:
+        logger.warning(
+            "Listening event backlog: %(depth)s events, lag %(lag_seconds)ss", stats
+        )
+
+
+def _process_entries(redis, entries):
+    entries = [(entry_id, fields) for entry_id, fields in entries if fields]
+    if not entries:
+        return 0
+    write_events([fields for _, fields in entries])
+
+    ids = [entry_id for entry_id, _ in entries]
+    pipe = redis.pipeline()
+    pipe.xack(EVENTS_STREAM_KEY, EVENTS_GROUP, *ids)
+    pipe.xdel(EVENTS_STREAM_KEY, *ids)
+    pipe.execute()
+    return len(entries)
+
+
+def _ensure_group(redis):
+    try:
+        redis.xgroup_create(EVENTS_STREAM_KEY, EVENTS_GROUP, id="0", mkstream=True)
+    except ResponseError as exc:
+        if "BUSYGROUP" not in str(exc):
+            raise
+
+
+def _decode(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _flush_at_exit():
+    try:
+        flush_local_events()
+    except Exception:
+        logger.exception("Lost buffered listening events on shutdown")
+
+
+atexit.register(_flush_at_exit)
+
+
+__all__ = [
+    "track_event",
+    "flush_local_events",
+    "ingest_events",
+    "write_events",
+    "get_events_stats",
+]
@@ -0,0 +1,152 @@
+import hashlib
+import time
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from redis.exceptions import RedisError
+
+from apps.musics.models import Track
+from apps.shared.utils.lean import dumps
+from apps.shared.utils.redis import get_redis_connection
+from apps.shared.utils.signed_media import MediaSigner
+
+logger = logging.getLogger(__name__)
+
+FRAGMENT_KEY = "track-fragment:{}:{}"
+# Варианты (уровень подписки + базовый URL), под которыми фрагменты
+# запрашивались: для них их и прогреваем
+VARIANTS_KEY = "track-fragment:variants"
+VARIANT_TTL = 60 * 60 * 24
+# Треки со сдвинутыми счётчиками, ждущие перерендера (refresh_stale_fragments)
+STALE_FRAGMENTS_KEY = "track-fragment:stale"
+
+
+def get_track_fragments(rows, request):
+    """
+    Публичные JSON-фрагменты треков (без is_liked): {id: байты} в порядке rows.
+
+    Фрагменты читаются одним get_many (MGET) под ключом id трека и
+    варианта медиа-URL (базовый URL и уровень подписки в подписи); в записи
+    лежат updated_at и срок подписи, с которыми она отрендерена —
+    устаревшие и отсутствующие рендерятся одной пачкой и пишутся одним
+    set_many. rows — строки .values() с id и updated_at.
+    """
+    signer = MediaSigner.from_request(request)
+    variant = _variant(signer)
+    _remember_variant(variant)
+    keys = {row["id"]: _key(variant, row["id"]) for row in rows}
+    cached = cache.get_many(list(keys.values()))
+
+    fragments, stale = {}, []
+    for row in rows:
+        entry = cached.get(keys[row["id"]])
+        if entry is not None and entry[0] == _stamp(row["updated_at"], signer):
+            fragments[row["id"]] = entry[1]
+        else:
+            stale.append(row["id"])
+    if stale:
+        fragments.update(_render_and_store(stale, signer))
+    # Трек, удалённый между пагинацией и рендером, пропускаем
+    return {row["id"]: fragments[row["id"]] for row in rows if row["id"] in fragments}
+
+
+def refresh_track_fragments(track_ids):
+    """
+    Заново рендерит фрагменты треков для всех недавних вариантов —
+    пачкой, вне запроса (после сброса счётчиков). Возвращает число фрагментов.
+    """
+    rendered = 0
+    for variant in cache.get(VARIANTS_KEY, {}):
+        tier, _, base = variant.partition(" ")
+        rendered += len(_render_and_store(track_ids, MediaSigner(base, tier)))
+    return rendered
+
+
+def mark_fragments_stale(track_ids):
+    """
+    Ставит треки в очередь на перерендер — одной командой Redis, чтобы
+    flush счётчиков не рендерил под своей блокировкой. Без Redis ничего
+    не делает: устаревший фрагмент перерендерит первый же запрос списка.
+    """
+    track_ids = list(track_ids)
+    redis = get_redis_connection()
+    if redis is None or not track_ids:
+        return
+    try:
+        redis.sadd(STALE_FRAGMENTS_KEY, *track_ids)
+    except RedisError:
+        logger.exception("Could not queue track fragments for refresh")
+
+
+def refresh_stale_fragments(limit=None):
+    """
+    Перерендеривает не больше limit (TRACK_FRAGMENT_REFRESH_LIMIT) треков
+    из очереди mark_fragments_stale. SPOP забирает id атомарно, поэтому
+    параллельные запуски не рендерят одно и то же; остаток дождётся
+    следующего сброса счётчиков. Возвращает число фрагментов.
+    """
+    redis = get_redis_connection()
+    if redis is None:
+        return 0
+    limit = limit or settings.TRACK_FRAGMENT_REFRESH_LIMIT
+    track_ids = [int(pk) for pk in redis.spop(STALE_FRAGMENTS_KEY, limit)]
+    return refresh_track_fragments(track_ids) if track_ids else 0
+
+
+def with_field(fragment, name, value):
+    """Дописывает поле в конец JSON-объекта фрагмента: {...} -> {...,"name":value}."""
+    return b"%s,%s:%s}" % (fragment[:-1], dumps(name), dumps(value))
+
+
+def _render_and_store(track_ids, signer):
+    # Импорт здесь: сериализаторы API импортируют сервисы
+    from apps.musics.api_endpoints.v1.track.serializers import TrackLeanSerializer
+
+    rows = list(
+        TrackLeanSerializer.values(Track.objects.filter(pk__in=track_ids), "updated_at")
+    )
+    items = TrackLeanSerializer({"media_signer": signer}).represent(rows)
+    variant = _variant(signer)
+    entries, fragments = {}, {}
+    for row, item in zip(rows, items):
+        fragments[row["id"]] = dumps(item)
+        entries[_key(variant, row["id"])] = (
+            _stamp(row["updated_at"], signer),
+            fragments[row["id"]],
+        )
+    cache.set_many(entries, settings.TRACK_FRAGMENT_TIMEOUT)
+    return fragments
+
+
+def _variant(signer):
+    return f"{signer.tier} {signer.base}"
+
+
+def _key(variant, pk):
+    return FRAGMENT_KEY.format(hashlib.md5(variant.encode()).hexdigest()[:8], pk)
+
+
+def _stamp(updated_at, signer):
+    # Подписанные URL во фрагменте устаревают вместе со сроком подписи
+    return f"{updated_at.isoformat()}|{signer.version}"
+
+
+def _remember_variant(variant):
+    variants = cache.get(VARIANTS_KEY) or {}
+    now = time.time()
+    # Обновляем реестр не чаще раза в час на вариант
+    if now - variants.get(variant, 0) > 60 * 60:
+        variants = {v: seen for v, seen in variants.items() if now - seen < VARIANT_TTL}
+        variants[variant] = now
+        cache.set(VARIANTS_KEY, variants, VARIANT_TTL)
+
+
+__all__ = [
+    "get_track_fragments",
+    "refresh_track_fragments",
+    "mark_fragments_stale",
+    "refresh_stale_fragments",
+    "with_field",
+]
@@ -0,0 +1,166 @@
+import logging
+import uuid
+from contextlib import suppress
+
+from django.db import transaction
+from redis.exceptions import RedisError
+
+from apps.musics.models import Like
+from apps.shared.utils.redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+LIKED_SET_KEY = "musics:likes:user:{}"
+LIKED_SET_TTL = 60 * 60
+# Служебный элемент: благодаря ему пустой набор лайков тоже живёт в Redis
+LIKED_SET_SENTINEL = 0
+# Метка идущего прогрева (токен прогревающего) и его черновой набор
+LIKED_SET_WARMING_KEY = "musics:likes:user:{}:warming"
+LIKED_SET_DRAFT_KEY = "musics:likes:user:{}:draft:{}"
+LIKED_SET_WARMING_TTL = 60
+
+# SADD/SREM только в уже прогретый набор, иначе в Redis окажется неполный набор.
+# Если набор как раз прогревается, его снимок из БД мог не увидеть это
+# изменение — метка снимается, и прогрев свой набор не опубликует
+_UPDATE_IF_EXISTS = """
+if redis.call('exists', KEYS[1]) == 1 then
+    return redis.call(ARGV[1], KEYS[1], ARGV[2])
+end
+redis.call('del', KEYS[2])
+return 0
+"""
+
+# Публикует черновик прогрева, только если метка всё ещё его
+_PUBLISH_DRAFT = """
+if redis.call('get', KEYS[2]) == ARGV[1] then
+    redis.call('del', KEYS[2])
+    redis.call('rename', KEYS[3], KEYS[1])
+    redis.call('expire', KEYS[1], ARGV[2])
+    return 1
+end
+redis.call('del', KEYS[3])
+return 0
+"""
+
+
+def get_liked_track_ids(user, track_ids):
+    """
+    Какие из track_ids лайкнул пользователь.
+    Один SMISMEMBER в Redis (набор прогревается из БД при промахе)
+    или один запрос к БД, если Redis недоступен.
+    """
+    track_ids = list(set(track_ids))
+    if not track_ids or user is None or not user.is_authenticated:
+        return set()
+
+    redis = get_redis_connection()
+    if redis is not None:
+        try:
+            return _get_liked_from_redis(redis, user, track_ids)
+        except RedisError:
+            logger.exception("Liked set is unavailable, falling back to the DB")
+
+    return set(
+        Like.objects.filter(user=user, track_id__in=track_ids).values_list(
+            "track_id", flat=True
+        )
+    )
+
+
+def add_liked_track(user_id, track_id):
+    """Добавляет трек в набор лайков пользователя после коммита транзакции."""
+    transaction.on_commit(lambda: _update_liked_set(user_id, "sadd", track_id))
+
+
+def remove_liked_track(user_id, track_id):
+    """Убирает трек из набора лайков пользователя после коммита транзакции."""
+    transaction.on_commit(lambda: _update_liked_set(user_id, "srem", track_id))
+
+
+class LikedTracksResolver:
+    """
+    Лайки пользователя в рамках одного запроса.
+    prime() разрешает пачку id одним запросом, is_liked() читает из памяти.
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._liked = {}
+
+    def prime(self, track_ids):
+        missing = [pk for pk in track_ids if pk not in self._liked]
+        if not missing:
+            return
+        liked = get_liked_track_ids(self.user, missing)
+        self._liked.update((pk, pk in liked) for pk in missing)
+
+    def is_liked(self, track_id):
+        if self.user is None or not self.user.is_authenticated:
+            return False
+        if track_id not in self._liked:
+            self.prime([track_id])
+        return self._liked[track_id]
+
+
+def get_liked_resolver(context):
+    """Резолвер лайков из контекста сериализатора (один на запрос)."""
+    resolver = context.get("liked_resolver")
+    if resolver is None:
+        request = context.get("request")
+        resolver = LikedTracksResolver(getattr(request, "user", None))
+        context["liked_resolver"] = resolver
+    return resolver
+
+
+def _get_liked_from_redis(redis, user, track_ids):
+    key = LIKED_SET_KEY.format(user.pk)
+    pipe = redis.pipeline(transaction=False)
+    pipe.exists(key)
+    pipe.smismember(key, track_ids)
+    exists, flags = pipe.execute()
+    if exists:
+        return {pk for pk, flag in zip(track_ids, flags) if flag}
+
+    # Метка ставится до чтения БД: лайк, закоммиченный после неё, снимет
+    # метку в _update_liked_set, и неполный снимок не попадёт в Redis
+    token = uuid.uuid4().hex
+    warming_key = LIKED_SET_WARMING_KEY.format(user.pk)
+    draft_key = LIKED_SET_DRAFT_KEY.format(user.pk, token)
+    redis.set(warming_key, token, ex=LIKED_SET_WARMING_TTL)
+
+    liked = set(Like.objects.filter(user=user).values_list("track_id", flat=True))
+    pipe = redis.pipeline()
+    pipe.sadd(draft_key, LIKED_SET_SENTINEL, *liked)
+    pipe.expire(draft_key, LIKED_SET_WARMING_TTL)
+    pipe.eval(_PUBLISH_DRAFT, 3, key, warming_key, draft_key, token, LIKED_SET_TTL)
+    pipe.execute()
+    return liked.intersection(track_ids)
+
+
+def _update_liked_set(user_id, command, track_id):
+    redis = get_redis_connection()
+    if redis is None:
+        return
+    try:
+        redis.eval(
+            _UPDATE_IF_EXISTS,
+            2,
+            LIKED_SET_KEY.format(user_id),
+            LIKED_SET_WARMING_KEY.format(user_id),
+            command,
+            track_id,
+        )
+    except RedisError:
+        # Набор мог разойтись с БД — удаляем, он прогреется заново
+        logger.exception("Failed to update liked set of user %s", user_id)
+        with suppress(RedisError):
+            redis.delete(LIKED_SET_KEY.format(user_id))
+
+
+__all__ = [
+    "get_liked_track_ids",
+    "add_liked_track",
+    "remove_liked_track",
+    "LikedTracksResolver",
+    "get_liked_resolver",
+]
@@ -0,0 +1,79 @@
+import logging
+
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.musics.models import Playlist, Track
+from apps.shared.utils.audio import AudioFormatError, probe_audio
+from apps.shared.utils.tagged_cache import invalidate_tags_on_commit
+
+logger = logging.getLogger(__name__)
+
+
+def read_audio_info(field_file, scan=False):
+    """AudioInfo файла из хранилища: читаются только начало и конец (Range у S3)."""
+    storage = field_file.storage
+    with storage.open(field_file.name, "rb") as f:
+        return probe_audio(f, storage.size(field_file.name), scan=scan)
+
+
+def update_track_metadata(track_ids, scan=True):
+    """
+    duration и bitrate треков из заголовков их аудио. Меняются только
+    разошедшиеся треки, одним bulk_update; total_duration их плейлистов
+    пересчитывается. Нечитаемые файлы пропускаются с предупреждением.
+    Возвращает количество обновлённых треков.
+    """
+    now = timezone.now()
+    changed = []
+    tracks = (
+        Track.objects.filter(pk__in=track_ids)
+        .exclude(audio="")
+        .only("id", "audio", "duration", "bitrate")
+    )
+    for track in tracks.iterator(chunk_size=500):
+        try:
+            info = read_audio_info(track.audio, scan=scan)
+        except (AudioFormatError, OSError) as exc:
+            logger.warning("Cannot read audio of track %s: %s", track.pk, exc)
+            continue
+        if (track.duration, track.bitrate) != (info.seconds, info.bitrate):
+            track.duration, track.bitrate = info.seconds, info.bitrate
+            track.updated_at = now
+            changed.append(track)
+
+    if changed:
+        Track.objects.bulk_update(
+            changed, ["duration", "bitrate", "updated_at"], batch_size=500
+        )
+        changed_ids = [track.pk for track in changed]
+        refresh_playlist_durations(changed_ids)
+        invalidate_tags_on_commit(*(f"track:{pk}" for pk in changed_ids), "tracks")
+    return len(changed)
+
+
+def refresh_playlist_durations(track_ids):
+    """Playlist.total_duration плейлистов с этими треками — одним UPDATE."""
+    playlist_ids = list(
+        Playlist.objects.filter(tracks__in=track_ids)
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+    if not playlist_ids:
+        return 0
+    totals = (
+        Track.objects.filter(in_playlists=OuterRef("pk"), is_published=True)
+        .order_by()
+        .values("in_playlists")
+        .annotate(total=Sum("duration"))
+        .values("total")
+    )
+    Playlist.objects.filter(pk__in=playlist_ids).update(
+        total_duration=Coalesce(Subquery(totals), 0), updated_at=timezone.now()
+    )
+    invalidate_tags_on_commit(*(f"playlist:{pk}" for pk in playlist_ids), "playlists")
+    return len(playlist_ids)
+
+
+__all__ = ["read_audio_info", "update_track_metadata", "refresh_playlist_durations"]
@@ -0,0 +1,123 @@
+import re
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+PARENT_TABLE = "musics_listening_events"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+PARTITION_RE = re.compile(rf"^{PARENT_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def ensure_listening_partitions(ahead=None):
+    """
+    Создаёт месячные партиции ListeningEvent от текущего месяца на ahead вперёд.
+    Строки, успевшие попасть в DEFAULT-партицию, переносятся в новую партицию.
+    Возвращает имена созданных партиций.
+    """
+    if connection.vendor != "postgresql":
+        return []
+    ahead = settings.LISTENING_PARTITIONS_AHEAD if ahead is None else ahead
+
+    existing = set(list_listening_partitions())
+    current = _month_start(timezone.now())
+    created = []
+    for offset in range(ahead + 1):
+        start = _add_months(current, offset)
+        name = partition_name(start)
+        if name in existing:
+            continue
+        _create_partition(name, start, _add_months(start, 1))
+        created.append(name)
+    return created
+
+
+def drop_expired_listening_partitions(retain_months=None):
+    """
+    Удаляет партиции старше retain_months месяцев (DETACH + DROP — мгновенно,
+    в отличие от DELETE). Возвращает имена удалённых партиций.
+    """
+    if connection.vendor != "postgresql":
+        return []
+    if retain_months is None:
+        retain_months = settings.LISTENING_RETENTION_MONTHS
+    cutoff = _add_months(_month_start(timezone.now()), -retain_months)
+
+    dropped = []
+    qn = connection.ops.quote_name
+    for name in list_listening_partitions():
+        match = PARTITION_RE.match(name)
+        start = datetime(int(match[1]), int(match[2]), 1, tzinfo=dt_timezone.utc)
+        if _add_months(start, 1) > cutoff:
+            continue
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER TABLE {qn(PARENT_TABLE)} DETACH PARTITION {qn(name)}"
+            )
+            cursor.execute(f"DROP TABLE {qn(name)}")
+        dropped.append(name)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {qn(DEFAULT_PARTITION)} WHERE listened_at < %s", [cutoff]
+        )
+    return dropped
+
+
+def list_listening_partitions():
+    """Имена месячных партиций (без DEFAULT) в порядке возрастания."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            ORDER BY child.relname
+            """,
+            [PARENT_TABLE],
+        )
+        return [name for (name,) in cursor.fetchall() if PARTITION_RE.match(name)]
+
+
+def partition_name(month_start):
+    return f"{PARENT_TABLE}_y{month_start.year}m{month_start.month:02d}"
+
+
+def _create_partition(name, start, end):
+    qn = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {qn(name)} "
+            f"(LIKE {qn(PARENT_TABLE)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {qn(DEFAULT_PARTITION)} "
+            f"WHERE listened_at >= %s AND listened_at < %s RETURNING *) "
+            f"INSERT INTO {qn(name)} SELECT * FROM moved",
+            [start, end],
+        )
+        cursor.execute(
+            f"ALTER TABLE {qn(PARENT_TABLE)} ATTACH PARTITION {qn(name)} "
+            f"FOR VALUES FROM (%s) TO (%s)",
+            [start, end],
+        )
+
+
+def _month_start(value):
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def _add_months(month_start, months):
+    years, month = divmod(month_start.month - 1 + months, 12)
+    return month_start.replace(year=month_start.year + years, month=month + 1)
+
+
+__all__ = [
+    "ensure_listening_partitions",
+    "drop_expired_listening_partitions",
+    "list_listening_partitions",
+]
@@ -0,0 +1,268 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast, Least
+from django.utils import timezone
+from scipy import sparse
+
+from apps.musics.models import Like, ListeningEvent, Track
+from .als import top_k_items, train_als
+
+logger = logging.getLogger(__name__)
+
+CURRENT_LINK = "current"
+MODEL_ARRAYS = ("user_ids", "track_ids", "user_factors", "item_factors", "candidates")
+KEEP_MODELS = 2
+# Верхняя граница памяти под матрицу скоров пачки пользователей
+SCORE_BATCH_BYTES = 256 * 1024 * 1024
+
+# Сила сигнала: полное прослушивание 1, просмотр карточки 0.25, лайк +3
+VIEW_STRENGTH = 0.25
+LIKE_STRENGTH = 3.0
+
+_model_lock = threading.Lock()
+_model_cache = {"path": None, "model": None}
+
+
+@dataclass
+class RecommenderModel:
+    """
+    Обученная модель, открытая через np.load(mmap_mode="r"):
+    веб-воркеры делят страницы файлов через page cache, а не держат копию в памяти.
+    """
+
+    path: Path
+    trained_at: datetime
+    user_ids: np.ndarray
+    track_ids: np.ndarray
+    user_factors: np.ndarray
+    item_factors: np.ndarray
+    candidates: np.ndarray
+
+    def score_candidates(self, user_id):
+        """(track_ids, scores) кандидатов пользователя по убыванию скора или None."""
+        row = np.searchsorted(self.user_ids, user_id)
+        if row >= len(self.user_ids) or self.user_ids[row] != user_id:
+            return None
+        candidates = np.asarray(self.candidates[row])
+        candidates = candidates[candidates >= 0]
+        scores = self.item_factors[candidates] @ self.user_factors[row]
+        order = np.argsort(-scores, kind="stable")
+        return self.track_ids[candidates[order]], scores[order]
+
+
+def recommend_track_ids(user, limit=None):
+    """
+    Id треков персональной подборки по убыванию скора.
+
+    Кандидаты из модели пересчитываются на лету, из них выкидываются треки,
+    которые пользователь лайкнул или слушал после обучения модели.
+    Без модели или для новых пользователей — популярные треки.
+    Возвращает с запасом (2 * limit): часть треков может быть снята с публикации.
+    """
+    limit = limit or settings.RECOMMENDATIONS_LIMIT
+    model = load_model()
+    scored = model.score_candidates(user.pk) if model else None
+    if scored is None:
+        return list(
+            Track.objects.filter(is_published=True)
+            .order_by("-plays_count")
+            .values_list("pk", flat=True)[: limit * 2]
+        )
+
+    candidate_ids = [int(pk) for pk in scored[0]]
+    seen = set(
+        ListeningEvent.objects.filter(
+            user=user, listened_at__gte=model.trained_at, track_id__in=candidate_ids
+        ).values_list("track_id", flat=True)
+    ) | set(
+        Like.objects.filter(
+            user=user, created_at__gte=model.trained_at, track_id__in=candidate_ids
+        ).values_list("track_id", flat=True)
+    )
+    return [pk for pk in candidate_ids if pk not in seen][: limit * 2]
+
+
+def train_recommender():
+    """
+    Обучает implicit ALS на прослушиваниях и лайках, считает кандидатов для
+    каждого пользователя и атомарно публикует новую версию модели.
+    Возвращает статистику обучения.
+    """
+    trained_at = timezone.now()
+    confidence, user_ids, track_ids = build_feedback_matrix()
+    if confidence.nnz == 0:
+        logger.info("No feedback to train the recommender on")
+        return {"users": 0, "tracks": 0, "interactions": 0}
+
+    user_factors, item_factors = train_als(
+        confidence,
+        factors=settings.RECOMMENDATIONS_FACTORS,
+        iterations=settings.RECOMMENDATIONS_ITERATIONS,
+        regularization=settings.RECOMMENDATIONS_REGULARIZATION,
+    )
+    candidates = build_candidates(
+        user_factors, item_factors, confidence, settings.RECOMMENDATIONS_CANDIDATES
+    )
+    path = save_model(
+        Path(settings.RECOMMENDATIONS_DIR),
+        trained_at,
+        user_ids=user_ids,
+        track_ids=track_ids,
+        user_factors=user_factors,
+        item_factors=item_factors,
+        candidates=candidates,
+    )
+    logger.info("Published recommender model %s", path)
+    return {
+        "users": len(user_ids),
+        "tracks": len(track_ids),
+        "interactions": confidence.nnz,
+    }
+
+
+def build_feedback_matrix():
+    """
+    CSR user×track с (confidence - 1) = alpha * log1p(сила сигнала)
+    за RECOMMENDATIONS_WINDOW_DAYS, плюс отсортированные id пользователей и треков.
+    Сила прослушивания — доля прослушанного трека (duration / track.duration).
+    """
+    since = timezone.now() - timezone.timedelta(
+        days=settings.RECOMMENDATIONS_WINDOW_DAYS
+    )
+    strength = Case(
+        When(event_type=ListeningEvent.EventTypeChoices.SKIP, then=Value(0.0)),
+        When(
+            event_type=ListeningEvent.EventTypeChoices.VIEW, then=Value(VIEW_STRENGTH)
+        ),
+        When(
+            duration__isnull=False,
+            track__duration__gt=0,
+            then=Least(
+                Cast(F("duration"), FloatField())
+                / Cast(F("track__duration"), FloatField()),
+                Value(1.0),
+            ),
+        ),
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    listens = (
+        ListeningEvent.objects.filter(listened_at__gte=since)
+        .values("user_id", "track_id")
+        .annotate(strength=Sum(strength))
+        .values_list("user_id", "track_id", "strength")
+    )
+    likes = Like.objects.annotate(strength=Value(LIKE_STRENGTH)).values_list(
+        "user_id", "track_id", "strength"
+    )
+    rows = np.array(
+        [*listens.iterator(chunk_size=10_000), *likes.iterator(chunk_size=10_000)],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+
+    user_ids, users = np.unique(rows[:, 0].astype(np.int64), return_inverse=True)
+    track_ids, tracks = np.unique(rows[:, 1].astype(np.int64), return_inverse=True)
+    # Дубликаты (user, track) суммируются до логарифма
+    matrix = sparse.csr_matrix(
+        (rows[:, 2], (users, tracks)), shape=(len(user_ids), len(track_ids))
+    )
+    matrix.data = (
+        settings.RECOMMENDATIONS_ALPHA * np.log1p(np.maximum(matrix.data, 0))
+    ).astype(np.float32)
+    matrix.eliminate_zeros()
+    return matrix.astype(np.float32), user_ids, track_ids
+
+
+def build_candidates(user_factors, item_factors, seen, count):
+    """Top-count непрослушанных треков (индексы столбцов) для каждого пользователя."""
+    n_users, n_items = seen.shape
+    count = min(count, n_items)
+    batch = max(SCORE_BATCH_BYTES // (n_items * 4), 1)
+    candidates = np.zeros((n_users, count), dtype=np.int32)
+    for start in range(0, n_users, batch):
+        end = min(start + batch, n_users)
+        candidates[start:end] = top_k_items(
+            user_factors[start:end], item_factors, count, exclude=seen[start:end]
+        )
+    return candidates
+
+
+def save_model(root, trained_at, **arrays):
+    """Пишет версию модели в отдельный каталог и переключает на неё симлинк current."""
+    root.mkdir(parents=True, exist_ok=True)
+    # Уникальный каталог: файлы текущей версии открыты воркерами через memmap,
+    # перезаписывать их нельзя — при совпадении mkdir упадёт
+    path = root / f"model-{trained_at:%Y%m%d%H%M%S}-{uuid.uuid4().hex[:8]}"
+    path.mkdir()
+    for name in MODEL_ARRAYS:
+        np.save(path / f"{name}.npy", arrays[name])
+    (path / "meta.json").write_text(
+        json.dumps(
+            {
+                "trained_at": trained_at.isoformat(),
+                "factors": int(arrays["user_factors"].shape[1]),
+            }
+        )
+    )
+
+    tmp_link = root / f"{CURRENT_LINK}.tmp"
+    tmp_link.unlink(missing_ok=True)
+    tmp_link.symlink_to(path.name)
+    os.replace(tmp_link, root / CURRENT_LINK)
+
+    # Старые версии удаляем: открытые memmap-ы воркеров остаются валидными до закрытия
+    versions = sorted(
+        (p for p in root.glob("model-*") if p.is_dir()),
+        key=lambda p: (p == path, p.name),
+    )
+    for old in versions[:-KEEP_MODELS]:
+        shutil.rmtree(old, ignore_errors=True)
+    return path
+
+
+def load_model():
+    """
+    Текущая модель (memmap) с кэшем на процесс; перечитывается,
+    когда симлинк current начинает указывать на новую версию.
+    """
+    current = Path(settings.RECOMMENDATIONS_DIR) / CURRENT_LINK
+    try:
+        path = current.resolve(strict=True)
+    except (FileNotFoundError, RuntimeError):
+        return None
+
+    with _model_lock:
+        if _model_cache["path"] != path:
+            meta = json.loads((path / "meta.json").read_text())
+            _model_cache["model"] = RecommenderModel(
+                path=path,
+                trained_at=datetime.fromisoformat(meta["trained_at"]),
+                **{
+                    name: np.load(path / f"{name}.npy", mmap_mode="r")
+                    for name in MODEL_ARRAYS
+                },
+            )
+            _model_cache["path"] = path
+        return _model_cache["model"]
+
+
+__all__ = [
+    "RecommenderModel",
+    "recommend_track_ids",
+    "train_recommender",
+    "build_feedback_matrix",
+    "build_candidates",
+    "save_model",
+    "load_model",
+]
@@ -0,0 +1,98 @@
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Q
+
+from apps.musics.models import Album, Artist, Playlist, Track
+
+TRACKS_TABLE = Track._meta.db_table
+SEARCH_CHUNK_SIZE = 10_000
+
+# Вес полей в search_vector: название трека важнее артиста, артист важнее альбома
+_SEARCH_VECTOR_SQL = f"""
+    UPDATE {TRACKS_TABLE} AS t
+    SET search_vector =
+        setweight(to_tsvector(%(config)s::regconfig, coalesce(t.name, '')), 'A')
+        || setweight(to_tsvector(%(config)s::regconfig, coalesce(a.name, '')), 'B')
+        || setweight(to_tsvector(%(config)s::regconfig, coalesce(
+            (SELECT al.name FROM {Album._meta.db_table} AS al WHERE al.id = t.album_id),
+            ''
+        )), 'C')
+    FROM {Artist._meta.db_table} AS a
+    WHERE a.id = t.artist_id AND {{where}}
+"""
+
+
+def search_catalog(query, limit=None):
+    """
+    Поиск по каталогу, сгруппированный по типам: треки, артисты, альбомы, плейлисты.
+    Возвращает словарь queryset-ов, уже отсортированных по релевантности.
+    """
+    limit = limit or settings.SEARCH_RESULTS_LIMIT
+    return {
+        "tracks": Track.objects.filter(is_published=True)
+        .search(query)
+        .select_related("artist", "album")
+        .prefetch_related("genres")[:limit],
+        "artists": _search_by_name(Artist.objects.all(), query, "-total_plays")[:limit],
+        "albums": _search_by_name(
+            Album.objects.filter(is_published=True).select_related("artist"),
+            query,
+            "-plays_count",
+        )[:limit],
+        "playlists": _search_by_name(
+            Playlist.objects.filter(is_public=True).select_related("owner"),
+            query,
+            "-created_at",
+        )[:limit],
+    }
+
+
+def update_search_vectors(track_ids=None, artist_id=None, album_id=None):
+    """
+    Пересчитывает денормализованный search_vector треков (только PostgreSQL).
+    Без аргументов — весь каталог, пачками по SEARCH_CHUNK_SIZE id.
+    """
+    if connection.vendor != "postgresql":
+        return
+
+    params = {"config": settings.SEARCH_CONFIG}
+    with connection.cursor() as cursor:
+        if track_ids is not None:
+            params["ids"] = list(track_ids)
+            cursor.execute(
+                _SEARCH_VECTOR_SQL.format(where="t.id = ANY(%(ids)s)"), params
+            )
+        elif artist_id is not None:
+            params["artist_id"] = artist_id
+            cursor.execute(
+                _SEARCH_VECTOR_SQL.format(where="t.artist_id = %(artist_id)s"), params
+            )
+        elif album_id is not None:
+            params["album_id"] = album_id
+            cursor.execute(
+                _SEARCH_VECTOR_SQL.format(where="t.album_id = %(album_id)s"), params
+            )
+        else:
+            cursor.execute(f"SELECT coalesce(max(id), 0) FROM {TRACKS_TABLE}")
+            (max_id,) = cursor.fetchone()
+            sql = _SEARCH_VECTOR_SQL.format(
+                where="t.id >= %(start)s AND t.id < %(end)s"
+            )
+            for start in range(0, max_id + 1, SEARCH_CHUNK_SIZE):
+                params.update(start=start, end=start + SEARCH_CHUNK_SIZE)
+                cursor.execute(sql, params)
+
+
+def _search_by_name(queryset, query, popularity):
+    """Поиск по названию: ILIKE + триграммы (оба используют GIN gin_trgm_ops)."""
+    if connection.vendor != "postgresql":
+        return queryset.filter(name__icontains=query).order_by(popularity)
+    return (
+        queryset.filter(Q(name__icontains=query) | Q(name__trigram_similar=query))
+        .annotate(similarity=TrigramSimilarity("name", query))
+        .order_by("-similarity", popularity)
+    )
+
+
+__all__ = ["search_catalog", "update_search_vectors"]
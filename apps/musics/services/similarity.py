@@ -0,0 +1,274 @@
+import logging
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from redis.exceptions import RedisError
+from scipy import sparse
+
+from apps.musics.models import Like, ListeningEvent, SimilarityBuild, TrackSimilarity
+from apps.shared.utils.redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+# Лайк — более сильный сигнал, чем прослушивание
+LISTEN_WEIGHT = 1.0
+LIKE_WEIGHT = 2.0
+# Сколько строк матрицы сходства считаем за раз (ограничивает память)
+SIMILARITY_BLOCK_SIZE = 1000
+# Треки, помеченные для следующего инкремента (снятые лайки)
+SIMILARITY_DIRTY_KEY = "musics:similarity:dirty"
+
+
+def build_track_similarities(full=False):
+    """
+    Пересчитывает top-K похожих треков по совместным прослушиваниям и лайкам.
+
+    Строит разреженную матрицу user×track W (вес: прослушивание 1, лайк 2)
+    и для треков считает cosine-сходство строк W^T W блоками.
+
+    Инкремент экономит только умножение блоков и запись: каждый запуск всё
+    равно читает лог за SIMILAR_TRACKS_WINDOW_DAYS и строит всю матрицу,
+    то есть стоит O(событий за окно) по времени и памяти. Пересчитываются
+    «грязные» треки — с новыми прослушиваниями и лайками, со снятыми лайками
+    (mark_similarity_dirty), с прослушиваниями, выпавшими из окна, — и их
+    старые и новые соседи, чтобы сходство оставалось симметричным.
+    Соседи соседей не пересчитываются: сдвиг, который вносит грязный трек
+    в чужой top-K без общего ребра, выправляет еженедельный полный пересчёт.
+    Возвращает количество пересчитанных треков.
+    """
+    started_at = timezone.now()
+    previous = (
+        SimilarityBuild.objects.filter(finished_at__isnull=False)
+        .order_by("-started_at")
+        .first()
+    )
+    since = None if full or previous is None else previous.started_at
+    window = timezone.timedelta(days=settings.SIMILAR_TRACKS_WINDOW_DAYS)
+
+    marked = _marked_track_ids()
+    weights, track_ids = build_interaction_matrix(since=started_at - window)
+    if since is None:
+        dirty = set(track_ids.tolist())
+    else:
+        dirty = _changed_track_ids(since, started_at, window) | marked
+        dirty |= _neighbour_ids(dirty)
+
+    # W^T в CSR: строка — трек, столбцы — пользователи
+    items = weights.T.tocsr()
+    norms = np.sqrt(np.asarray(items.multiply(items).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    binary = (items > 0).astype(np.float32)
+
+    dirty_idx = np.flatnonzero(np.isin(track_ids, list(dirty)))
+    found = _rebuild(items, binary, norms, track_ids, dirty_idx)
+    updated = len(dirty_idx)
+    if since is not None:
+        # Новые соседи грязных треков: их оценки к ним тоже изменились
+        extra_idx = np.array(sorted(found - set(dirty_idx.tolist())), dtype=np.int64)
+        _rebuild(items, binary, norms, track_ids, extra_idx)
+        updated += len(extra_idx)
+    updated += _drop_inactive(track_ids, None if since is None else dirty)
+
+    SimilarityBuild.objects.create(
+        started_at=started_at,
+        finished_at=timezone.now(),
+        is_full=since is None,
+        tracks_updated=updated,
+    )
+    _unmark(marked)
+    logger.info("Rebuilt similar tracks for %s tracks", updated)
+    return updated
+
+
+def mark_similarity_dirty(track_ids):
+    """
+    Помечает треки для следующего инкрементального пересчёта — для изменений,
+    которых не видно по логу (снятый лайк). Без Redis пометка теряется,
+    и такие треки догоняет полный пересчёт.
+    """
+    track_ids = list(track_ids)
+    redis = get_redis_connection()
+    if redis is None or not track_ids:
+        return
+    try:
+        redis.sadd(SIMILARITY_DIRTY_KEY, *track_ids)
+    except RedisError:
+        logger.exception("Could not mark tracks %s for similarity rebuild", track_ids)
+
+
+def build_interaction_matrix(since=None):
+    """
+    Разреженная матрица user×track (float32) за SIMILAR_TRACKS_WINDOW_DAYS
+    (или с since) и массив id треков, соответствующих её столбцам.
+    """
+    if since is None:
+        since = timezone.now() - timezone.timedelta(
+            days=settings.SIMILAR_TRACKS_WINDOW_DAYS
+        )
+    listens = np.array(
+        list(
+            ListeningEvent.objects.filter(listened_at__gte=since)
+            .values_list("user_id", "track_id")
+            .distinct()
+            .iterator(chunk_size=10_000)
+        ),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+    likes = np.array(
+        list(
+            Like.objects.values_list("user_id", "track_id").iterator(chunk_size=10_000)
+        ),
+        dtype=np.int64,
+    ).reshape(-1, 2)
+
+    pairs = np.vstack([listens, likes])
+    values = np.concatenate(
+        [
+            np.full(len(listens), LISTEN_WEIGHT, dtype=np.float32),
+            np.full(len(likes), LIKE_WEIGHT, dtype=np.float32),
+        ]
+    )
+    user_ids, rows = np.unique(pairs[:, 0], return_inverse=True)
+    track_ids, cols = np.unique(pairs[:, 1], return_inverse=True)
+    # Дубликаты (user, track) суммируются: прослушанный и лайкнутый трек весит 3
+    matrix = sparse.csr_matrix(
+        (values, (rows, cols)), shape=(len(user_ids), len(track_ids))
+    )
+    return matrix, track_ids
+
+
+def _changed_track_ids(since, started_at, window):
+    listened = ListeningEvent.objects.filter(listened_at__gte=since).values_list(
+        "track_id", flat=True
+    )
+    # Прослушивания, которые с прошлого запуска выпали из окна
+    aged_out = ListeningEvent.objects.filter(
+        listened_at__gte=since - window, listened_at__lt=started_at - window
+    ).values_list("track_id", flat=True)
+    liked = Like.objects.filter(created_at__gte=since).values_list(
+        "track_id", flat=True
+    )
+    return set(listened.distinct()) | set(aged_out.distinct()) | set(liked.distinct())
+
+
+def _neighbour_ids(track_ids):
+    """Треки, связанные с track_ids сохранённым сходством в любую сторону."""
+    track_ids = list(track_ids)
+    result = set()
+    for start in range(0, len(track_ids), SIMILARITY_BLOCK_SIZE):
+        chunk = track_ids[start : start + SIMILARITY_BLOCK_SIZE]
+        pairs = TrackSimilarity.objects.filter(
+            Q(track_id__in=chunk) | Q(similar_track_id__in=chunk)
+        ).values_list("track_id", "similar_track_id")
+        for pair in pairs:
+            result.update(pair)
+    return result
+
+
+def _rebuild(items, binary, norms, track_ids, indices):
+    """Пересчитывает соседей треков indices блоками -> индексы найденных соседей."""
+    found = set()
+    for start in range(0, len(indices), SIMILARITY_BLOCK_SIZE):
+        block = indices[start : start + SIMILARITY_BLOCK_SIZE]
+        neighbours = _top_neighbours(items, binary, norms, block)
+        _save_neighbours(track_ids, block, neighbours)
+        for cols, _ in neighbours:
+            found.update(cols.tolist())
+    return found
+
+
+def _drop_inactive(track_ids, candidates=None):
+    """
+    Удаляет соседей треков, у которых в окне не осталось взаимодействий:
+    в матрицу они не попали и иначе хранили бы устаревший список.
+    candidates — проверяемые id (None — все треки с сохранёнными соседями).
+    """
+    if candidates is None:
+        candidates = TrackSimilarity.objects.values_list(
+            "track_id", flat=True
+        ).distinct()
+    inactive = list(set(candidates) - set(track_ids.tolist()))
+    for start in range(0, len(inactive), SIMILARITY_BLOCK_SIZE):
+        TrackSimilarity.objects.filter(
+            track_id__in=inactive[start : start + SIMILARITY_BLOCK_SIZE]
+        ).delete()
+    return len(inactive)
+
+
+def _marked_track_ids():
+    redis = get_redis_connection()
+    if redis is None:
+        return set()
+    try:
+        return {int(pk) for pk in redis.smembers(SIMILARITY_DIRTY_KEY)}
+    except RedisError:
+        logger.exception("Could not read tracks marked for similarity rebuild")
+        return set()
+
+
+def _unmark(track_ids):
+    # SREM, а не DEL: пометки, сделанные во время пересчёта, остаются
+    redis = get_redis_connection()
+    if redis is None or not track_ids:
+        return
+    try:
+        redis.srem(SIMILARITY_DIRTY_KEY, *track_ids)
+    except RedisError:
+        logger.exception("Could not unmark rebuilt similar tracks")
+
+
+def _top_neighbours(items, binary, norms, block):
+    """
+    Для треков block — список (индексы соседей, cosine) длиной до SIMILAR_TRACKS_TOP_K.
+    Пары с менее чем SIMILAR_TRACKS_MIN_COMMON общими слушателями отбрасываются.
+    """
+    top_k = settings.SIMILAR_TRACKS_TOP_K
+    min_common = settings.SIMILAR_TRACKS_MIN_COMMON
+
+    # Веса положительные, поэтому у обеих матриц одинаковая разреженность
+    scores = (items[block] @ items.T).tocsr()
+    common = (binary[block] @ binary.T).tocsr()
+    scores.sort_indices()
+    common.sort_indices()
+
+    result = []
+    for row, track_idx in enumerate(block):
+        start, end = scores.indptr[row], scores.indptr[row + 1]
+        cols, data = scores.indices[start:end], scores.data[start:end]
+        counts = common.data[start:end]
+
+        keep = (cols != track_idx) & (counts >= min_common)
+        cols, data = cols[keep], data[keep] / (norms[track_idx] * norms[cols[keep]])
+        if len(cols) > top_k:
+            best = np.argpartition(-data, top_k)[:top_k]
+            cols, data = cols[best], data[best]
+        order = np.argsort(-data, kind="stable")
+        result.append((cols[order], data[order]))
+    return result
+
+
+def _save_neighbours(track_ids, block, neighbours):
+    rows = [
+        TrackSimilarity(
+            track_id=int(track_ids[track_idx]),
+            similar_track_id=int(track_ids[col]),
+            score=float(score),
+        )
+        for track_idx, (cols, scores) in zip(block, neighbours)
+        for col, score in zip(cols, scores)
+    ]
+    with transaction.atomic():
+        TrackSimilarity.objects.filter(
+            track_id__in=[int(track_ids[idx]) for idx in block]
+        ).delete()
+        TrackSimilarity.objects.bulk_create(rows, batch_size=5000)
+
+
+__all__ = [
+    "build_track_similarities",
+    "mark_similarity_dirty",
+    "build_interaction_matrix",
+]
@@ -0,0 +1,249 @@
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.utils import timezone
+
+from apps.musics.models import Track, TrackRendition
+from apps.shared.utils.redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+TRANSCODING_LOCK_KEY = "musics:transcoding:{}"
+PLAYLIST_NAME = "index.m3u8"
+# Хвост stderr ffmpeg, который сохраняется в TrackRendition.error
+ERROR_TAIL = 2000
+
+
+class TranscodingError(Exception):
+    """Перекодирование не удалось; задача повторит его с backoff."""
+
+
+def rendition_prefix(track_id, bitrate):
+    return f"tracks/hls/{track_id}/{bitrate}k/"
+
+
+def target_bitrates(track):
+    """Битрейты из TRANSCODING_BITRATES не выше исходного (самый низкий — всегда)."""
+    bitrates = sorted(set(settings.TRANSCODING_BITRATES))
+    if track.bitrate:
+        return [b for b in bitrates if b <= track.bitrate] or bitrates[:1]
+    return bitrates
+
+
+def ready_renditions(track):
+    """Готовые версии из текущего аудио трека, по возрастанию битрейта."""
+    return track.renditions.filter(
+        status=TrackRendition.StatusChoices.READY, source=track.audio.name
+    )
+
+
+def build_track_renditions(track_id):
+    """
+    Собирает недостающие HLS-версии трека: один запуск ffmpeg декодирует
+    исходник один раз и пишет все битрейты. Идемпотентно: версии, готовые
+    для текущего audio, пропускаются, поэтому повтор задачи (retry, двойная
+    доставка при acks_late) доделывает только недостающее.
+    Возвращает количество собранных версий.
+    """
+    track = Track.objects.filter(pk=track_id).only("id", "audio", "bitrate").first()
+    if track is None or not track.audio:
+        return 0
+
+    redis = get_redis_connection()
+    lock = None
+    if redis is not None:
+        lock = redis.lock(
+            TRANSCODING_LOCK_KEY.format(track_id),
+            timeout=settings.TRANSCODING_TIMEOUT + 60,
+        )
+        if not lock.acquire(blocking=False):
+            # Трек перекодирует другой воркер; повтор проверит, что осталось
+            raise TranscodingError(f"Track {track_id} is already being transcoded")
+    try:
+        return _build_renditions(track)
+    finally:
+        if lock is not None:
+            lock.release()
+
+
+def _build_renditions(track):
+    source = track.audio.name
+    storage = track.audio.storage
+    bitrates = target_bitrates(track)
+
+    for rendition in track.renditions.exclude(bitrate__in=bitrates):
+        _clear_prefix(storage, rendition_prefix(track.id, rendition.bitrate))
+        rendition.delete()
+
+    done = set(
+        ready_renditions(track)
+        .filter(bitrate__in=bitrates)
+        .values_list("bitrate", flat=True)
+    )
+    pending = [bitrate for bitrate in bitrates if bitrate not in done]
+    if not pending:
+        return 0
+
+    for bitrate in pending:
+        TrackRendition.objects.update_or_create(
+            track=track,
+            bitrate=bitrate,
+            defaults={
+                "status": TrackRendition.StatusChoices.PROCESSING,
+                "source": source,
+                "error": "",
+            },
+        )
+
+    with tempfile.TemporaryDirectory(prefix="transcode-") as workdir:
+        try:
+            _run_ffmpeg(local_audio_path(track.audio, workdir), workdir, pending)
+        except TranscodingError as exc:
+            track.renditions.filter(bitrate__in=pending).update(
+                status=TrackRendition.StatusChoices.FAILED,
+                error=str(exc),
+                updated_at=timezone.now(),
+            )
+            raise
+
+        for bitrate in pending:
+            prefix = rendition_prefix(track.id, bitrate)
+            segments, size = _upload(
+                storage, os.path.join(workdir, f"{bitrate}k"), prefix
+            )
+            track.renditions.filter(bitrate=bitrate).update(
+                status=TrackRendition.StatusChoices.READY,
+                playlist=prefix + PLAYLIST_NAME,
+                segments=segments,
+                size=size,
+                updated_at=timezone.now(),
+            )
+    logger.info("Transcoded track %s to %s kbps", track.id, pending)
+    return len(pending)
+
+
+def local_audio_path(field, workdir):
+    """Путь к исходнику на диске: сам файл FileSystemStorage или копия во workdir."""
+    try:
+        return field.storage.path(field.name)
+    except NotImplementedError:
+        pass
+    path = os.path.join(workdir, "source" + os.path.splitext(field.name)[1])
+    with field.storage.open(field.name, "rb") as src, open(path, "wb") as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    return path
+
+
+def _run_ffmpeg(input_path, workdir, bitrates):
+    threads = str(settings.TRANSCODING_FFMPEG_THREADS)
+    command = [
+        settings.TRANSCODING_FFMPEG,
+        *("-nostdin", "-hide_banner", "-loglevel", "error", "-y"),
+        *("-threads", threads, "-i", input_path),
+    ]
+    for bitrate in bitrates:
+        output = os.path.join(workdir, f"{bitrate}k")
+        os.makedirs(output, exist_ok=True)
+        command += [
+            *("-map", "0:a:0", "-vn", "-c:a", "aac", "-b:a", f"{bitrate}k"),
+            *("-threads", threads, "-f", "hls"),
+            *("-hls_time", str(settings.TRANSCODING_SEGMENT_SECONDS)),
+            *("-hls_playlist_type", "vod"),
+            *("-hls_segment_filename", os.path.join(output, "%05d.ts")),
+            os.path.join(output, PLAYLIST_NAME),
+        ]
+    run_ffmpeg(command)
+
+
+def run_ffmpeg(command):
+    """subprocess.run с TRANSCODING_TIMEOUT; любая неудача — TranscodingError."""
+    try:
+        result = subprocess.run(
+            command, capture_output=True, timeout=settings.TRANSCODING_TIMEOUT
+        )
+    except FileNotFoundError:
+        raise TranscodingError(f"{settings.TRANSCODING_FFMPEG} is not installed")
+    except subprocess.TimeoutExpired:
+        raise TranscodingError(
+            f"ffmpeg timed out after {settings.TRANSCODING_TIMEOUT}s"
+        )
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace")[-ERROR_TAIL:]
+        raise TranscodingError(f"ffmpeg exited with {result.returncode}: {stderr}")
+    return result
+
+
+def _upload(storage, directory, prefix):
+    """Сегменты, затем плейлист (пока его нет, версия не готова). -> (сегменты, байты)"""
+    _clear_prefix(storage, prefix)
+    names = sorted(name for name in os.listdir(directory) if name != PLAYLIST_NAME)
+    size = 0
+    for name in [*names, PLAYLIST_NAME]:
+        path = os.path.join(directory, name)
+        size += os.path.getsize(path)
+        with open(path, "rb") as f:
+            # Префикс очищен, поэтому storage не переименует файл
+            storage.save(prefix + name, File(f))
+    return len(names), size
+
+
+def _clear_prefix(storage, prefix):
+    try:
+        _, files = storage.listdir(prefix)
+    except FileNotFoundError:
+        return
+    for name in files:
+        storage.delete(prefix + name)
+
+
+def master_playlist(renditions, url):
+    """Master-плейлист HLS; url(bitrate) — адрес плейлиста версии."""
+    lines = ["#EXTM3U", "#EXT-X-VERSION:3"]
+    for rendition in renditions:
+        lines.append(
+            f'#EXT-X-STREAM-INF:BANDWIDTH={rendition.bitrate * 1000},CODECS="mp4a.40.2"'
+        )
+        lines.append(url(rendition.bitrate))
+    return "\n".join(lines) + "\n"
+
+
+def media_playlist(rendition, storage, signer):
+    """
+    Плейлист версии с абсолютными (и подписанными, см. MediaSigner) URL
+    сегментов: относительные ссылки не несли бы подпись. Исходный текст
+    кэшируется до пересборки версии.
+    """
+    key = f"track-rendition:{rendition.pk}:{rendition.updated_at.timestamp()}"
+    text = cache.get(key)
+    if text is None:
+        with storage.open(rendition.playlist, "rb") as f:
+            text = f.read().decode()
+        cache.set(key, text, settings.TAGGED_CACHE_TIMEOUT)
+
+    prefix = rendition.playlist.rsplit("/", 1)[0] + "/"
+    lines = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            line = signer.url(storage, prefix + line)
+        lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "TranscodingError",
+    "rendition_prefix",
+    "target_bitrates",
+    "ready_renditions",
+    "build_track_renditions",
+    "local_audio_path",
+    "run_ffmpeg",
+    "master_playlist",
+    "media_playlist",
+]
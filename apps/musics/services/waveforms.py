@@ -0,0 +1,62 @@
+import tempfile
+
+import numpy as np
+from django.conf import settings
+
+from apps.musics.models import Track, TrackWaveform
+from apps.musics.services.transcoding import local_audio_path, run_ffmpeg
+from apps.shared.utils.waveform import compute_peaks, encode_waveform
+
+
+def build_track_waveform(track_id, force=False):
+    """
+    Декодирует аудио трека один раз (ffmpeg -> моно PCM s16le) и сохраняет
+    пики WAVEFORM_BUCKETS окон. Пропускает трек, если волна для текущего
+    audio уже есть (force — пересчитать, например после смены
+    WAVEFORM_BUCKETS). Возвращает True, если волна посчитана.
+    """
+    track = Track.objects.filter(pk=track_id).only("id", "audio").first()
+    if track is None or not track.audio:
+        return False
+    source = track.audio.name
+    if (
+        not force
+        and TrackWaveform.objects.filter(
+            track=track, source=source, bits=settings.WAVEFORM_BITS
+        ).exists()
+    ):
+        return False
+
+    with tempfile.TemporaryDirectory(prefix="waveform-") as workdir:
+        samples = decode_samples(local_audio_path(track.audio, workdir))
+    peaks, samples_per_pixel = compute_peaks(
+        samples, settings.WAVEFORM_BUCKETS, settings.WAVEFORM_BITS
+    )
+    TrackWaveform.objects.update_or_create(
+        track=track,
+        defaults={
+            "source": source,
+            "bits": settings.WAVEFORM_BITS,
+            "buckets": len(peaks) // 2,
+            "data": encode_waveform(
+                peaks, settings.WAVEFORM_SAMPLE_RATE, samples_per_pixel
+            ),
+        },
+    )
+    return True
+
+
+def decode_samples(path):
+    """Моно int16 с частотой WAVEFORM_SAMPLE_RATE."""
+    command = [
+        settings.TRANSCODING_FFMPEG,
+        *("-nostdin", "-hide_banner", "-loglevel", "error"),
+        *("-threads", str(settings.TRANSCODING_FFMPEG_THREADS), "-i", path),
+        *("-vn", "-ac", "1", "-ar", str(settings.WAVEFORM_SAMPLE_RATE)),
+        *("-f", "s16le", "-acodec", "pcm_s16le", "-"),
+    ]
+    result = run_ffmpeg(command)
+    return np.frombuffer(result.stdout, dtype="<i2")
+
+
+__all__ = ["build_track_waveform", "decode_samples"]
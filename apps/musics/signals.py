@@ -0,0 +1,234 @@
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.musics.models import (
+    Album,
+    Artist,
+    Genre,
+    Like,
+    Playlist,
+    PlaylistTrack,
+    Track,
+    TrackRendition,
+    TrackWaveform,
+)
+from apps.musics.services.counters import record_likes
+from apps.musics.services.likes import add_liked_track, remove_liked_track
+from apps.musics.services.search import update_search_vectors
+from apps.musics.services.similarity import mark_similarity_dirty
+from apps.musics.tasks.transcoding import transcode_track
+from apps.musics.tasks.waveforms import build_waveform
+from apps.shared.utils.tagged_cache import invalidate_tags_on_commit
+
+logger = logging.getLogger(__name__)
+
+# Поля, из которых собирается search_vector трека
+TRACK_SEARCH_FIELDS = {"name", "artist", "artist_id", "album", "album_id"}
+
+# Модель -> префикс тегов кэша: "<префикс>:<id>" и коллекция "<префикс>s"
+CACHE_TAG_PREFIXES = {
+    Track: "track",
+    Album: "album",
+    Artist: "artist",
+    Genre: "genre",
+    Playlist: "playlist",
+}
+
+
+# --- Набор лайков пользователя в Redis и счётчики лайков трека/альбома/артиста ---
+def _record_likes_on_commit(tracks, delta):
+    # Дельты пишутся в Redis мимо транзакции: после отката счётчики разошлись бы
+    transaction.on_commit(lambda: record_likes(tracks, delta))
+
+
+def _like_counter_ids(like):
+    """
+    (track_id, artist_id, album_id) лайка без запроса к Track: трек берётся,
+    только если уже загружен (лайк из view), иначе — лишь счётчик трека.
+    """
+    if Like.track.is_cached(like):
+        return like.track_id, like.track.artist_id, like.track.album_id
+    return like.track_id, None, None
+
+
+def _deleted_with(origin, *models):
+    # origin — объект или QuerySet, с которого началось удаление
+    return isinstance(origin, models) or getattr(origin, "model", None) in models
+
+
+@receiver(post_save, sender=Like)
+def like_created(sender, instance, created, **kwargs):
+    if created:
+        add_liked_track(instance.user_id, instance.track_id)
+        _record_likes_on_commit([_like_counter_ids(instance)], 1)
+        invalidate_tags_on_commit(f"likes:{instance.user_id}")
+
+
+@receiver(post_delete, sender=Like)
+def like_deleted(sender, instance, origin=None, **kwargs):
+    remove_liked_track(instance.user_id, instance.track_id)
+    invalidate_tags_on_commit(f"likes:{instance.user_id}")
+    if _deleted_with(origin, Track, Artist):
+        # Каскад от трека (или артиста с треками): счётчики удаляемого трека
+        # не нужны, агрегаты альбома и артиста выправит reconcile_counters
+        return
+    if _deleted_with(origin, get_user_model()):
+        # Лайки удаляемого пользователя учтены пачкой в user_deleting
+        return
+    _record_likes_on_commit([_like_counter_ids(instance)], -1)
+    # Снятый лайк не оставляет строки в логе — трек помечается явно
+    mark_similarity_dirty([instance.track_id])
+
+
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def user_deleting(sender, instance, **kwargs):
+    # Один запрос на все лайки пользователя вместо загрузки трека на каждый
+    tracks = list(
+        Like.objects.filter(user=instance).values_list(
+            "track_id", "track__artist_id", "track__album_id"
+        )
+    )
+    if tracks:
+        _record_likes_on_commit(tracks, -1)
+        mark_similarity_dirty([track_id for track_id, _, _ in tracks])
+
+
+# --- search_vector треков ---
+@receiver(post_save, sender=Track)
+def track_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or TRACK_SEARCH_FIELDS & set(update_fields):
+        update_search_vectors(track_ids=[instance.pk])
+
+
+# --- HLS-версии и волна: обработка после загрузки или замены аудио ---
+@receiver(post_save, sender=Track)
+def track_audio_saved(sender, instance, created, update_fields=None, **kwargs):
+    if not instance.audio:
+        return
+    if update_fields is not None and "audio" not in update_fields:
+        return
+    source = instance.audio.name
+    # Для этого файла уже есть или собирается — не ставим задачу повторно
+    if settings.TRANSCODING_ENABLED and (
+        created
+        or not TrackRendition.objects.filter(track=instance, source=source)
+        .exclude(status=TrackRendition.StatusChoices.FAILED)
+        .exists()
+    ):
+        transaction.on_commit(lambda: _enqueue(transcode_track, instance.pk))
+    if settings.WAVEFORM_ENABLED and (
+        created
+        or not TrackWaveform.objects.filter(track=instance, source=source).exists()
+    ):
+        transaction.on_commit(lambda: _enqueue(build_waveform, instance.pk))
+
+
+def _enqueue(task, track_id):
+    try:
+        task.delay(track_id)
+    except Exception:
+        # Брокер недоступен: трек играет из оригинала, догонят
+        # transcode_tracks и build_waveforms
+        logger.exception("Failed to enqueue %s for track %s", task.name, track_id)
+
+
+@receiver(post_save, sender=Artist)
+def artist_saved(sender, instance, created, update_fields=None, **kwargs):
+    if not created and (update_fields is None or "name" in update_fields):
+        update_search_vectors(artist_id=instance.pk)
+
+
+@receiver(post_save, sender=Album)
+def album_saved(sender, instance, created, update_fields=None, **kwargs):
+    if not created and (update_fields is None or "name" in update_fields):
+        update_search_vectors(album_id=instance.pk)
+
+
+# --- updated_at плейлиста при изменении состава (валидатор conditional GET) ---
+@receiver(post_save, sender=PlaylistTrack)
+@receiver(post_delete, sender=PlaylistTrack)
+def playlist_track_changed(sender, instance, **kwargs):
+    Playlist.objects.filter(pk=instance.playlist_id).update(updated_at=timezone.now())
+    invalidate_tags_on_commit(f"playlist:{instance.playlist_id}", "playlists")
+
+
+@receiver(m2m_changed, sender=Playlist.tracks.through)
+def playlist_tracks_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    # clear ловим до удаления строк: после него не узнать, какие плейлисты затронуты
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        playlist_ids = [instance.pk]
+    elif pk_set is not None:
+        playlist_ids = pk_set
+    else:
+        playlist_ids = list(instance.in_playlists.values_list("pk", flat=True))
+    Playlist.objects.filter(pk__in=playlist_ids).update(updated_at=timezone.now())
+    invalidate_tags_on_commit(*(f"playlist:{pk}" for pk in playlist_ids), "playlists")
+
+
+# --- JSON-фрагменты треков сверяются по updated_at трека: правка вложенных
+# артиста, альбома или жанра сдвигает его у всех их треков ---
+TRACK_FRAGMENT_RELATIONS = {Artist: "artist", Album: "album", Genre: "genres"}
+
+
+def track_relation_changed(sender, instance, created=False, **kwargs):
+    if created:
+        return
+    lookup = {TRACK_FRAGMENT_RELATIONS[sender]: instance.pk}
+    Track.objects.filter(**lookup).update(updated_at=timezone.now())
+    invalidate_tags_on_commit("tracks")
+
+
+for model in TRACK_FRAGMENT_RELATIONS:
+    post_save.connect(
+        track_relation_changed, sender=model, dispatch_uid=f"fragments-{model}"
+    )
+    # До удаления: потом альбом у треков уже обнулён, а строки жанра удалены
+    pre_delete.connect(
+        track_relation_changed, sender=model, dispatch_uid=f"fragments-{model}"
+    )
+
+
+# --- Тегированный кэш: правки каталога сдвигают поколения тегов ---
+def catalog_changed(sender, instance, **kwargs):
+    prefix = CACHE_TAG_PREFIXES[sender]
+    invalidate_tags_on_commit(f"{prefix}:{instance.pk}", f"{prefix}s")
+
+
+for model in CACHE_TAG_PREFIXES:
+    post_save.connect(catalog_changed, sender=model, dispatch_uid=f"cache-{model}")
+    post_delete.connect(catalog_changed, sender=model, dispatch_uid=f"cache-{model}")
+
+
+@receiver(m2m_changed, sender=Track.genres.through)
+def track_genres_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        # genre.tracks.add(...): instance — жанр, pk_set — треки
+        genre_ids = [instance.pk]
+        track_ids = (
+            pk_set
+            if pk_set is not None
+            else instance.tracks.values_list("pk", flat=True)
+        )
+    else:
+        track_ids = [instance.pk]
+        genre_ids = (
+            pk_set
+            if pk_set is not None
+            else instance.genres.values_list("pk", flat=True)
+        )
+    Track.objects.filter(pk__in=track_ids).update(updated_at=timezone.now())
+    invalidate_tags_on_commit(
+        *(f"track:{pk}" for pk in track_ids),
+        *(f"genre:{pk}" for pk in genre_ids),
+        "tracks",
+    )
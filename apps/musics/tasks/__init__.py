@@ -0,0 +1,9 @@
+from .charts import *  # noqa
+from .counters import *  # noqa
+from .events import *  # noqa
+from .metadata import *  # noqa
+from .partitions import *  # noqa
+from .recommendations import *  # noqa
+from .similarity import *  # noqa
+from .transcoding import *  # noqa
+from .waveforms import *  # noqa
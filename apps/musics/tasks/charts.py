@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from apps.musics.services.charts import refresh_charts, rollup_daily_plays
+
+
+@shared_task(ignore_result=True)
+def rollup_track_plays():
+    return rollup_daily_plays()
+
+
+@shared_task(ignore_result=True)
+def build_daily_charts():
+    return refresh_charts()
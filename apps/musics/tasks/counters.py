@@ -0,0 +1,32 @@
+from celery import shared_task
+
+from apps.musics.services.counters import (
+    flush_counters,
+    purge_counter_flushes,
+    reconcile_counters,
+)
+from apps.musics.services.fragments import refresh_stale_fragments
+
+
+@shared_task(ignore_result=True)
+def flush_play_counters():
+    flushed = flush_counters()
+    if flushed:
+        # Блокировка flush уже снята: фрагменты рендерятся параллельно следующему сбросу
+        refresh_counter_fragments.delay()
+    return flushed
+
+
+@shared_task(ignore_result=True)
+def refresh_counter_fragments():
+    return refresh_stale_fragments()
+
+
+@shared_task(ignore_result=True)
+def purge_old_counter_flushes():
+    return purge_counter_flushes()
+
+
+@shared_task(ignore_result=True)
+def reconcile_aggregate_counters():
+    return reconcile_counters()
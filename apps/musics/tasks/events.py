@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from apps.musics.services.events import ingest_events
+
+
+@shared_task(ignore_result=True)
+def ingest_listening_events():
+    return ingest_events()
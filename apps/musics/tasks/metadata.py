@@ -0,0 +1,9 @@
+from celery import shared_task
+
+from apps.musics.services.metadata import update_track_metadata
+
+
+# Точная длительность MP3 без заголовка VBR: проход по всем кадрам файла
+@shared_task(ignore_result=True)
+def extract_track_metadata(track_id):
+    return update_track_metadata([track_id], scan=True)
@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from apps.musics.services.partitions import (
+    drop_expired_listening_partitions,
+    ensure_listening_partitions,
+)
+
+
+@shared_task(ignore_result=True)
+def maintain_listening_partitions():
+    created = ensure_listening_partitions()
+    dropped = drop_expired_listening_partitions()
+    return {"created": created, "dropped": dropped}
@@ -0,0 +1,8 @@
+from celery import shared_task
+
+from apps.musics.services.recommendations import train_recommender
+
+
+@shared_task(ignore_result=True)
+def train_recommendations():
+    return train_recommender()
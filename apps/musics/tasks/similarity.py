@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from apps.musics.services.similarity import build_track_similarities
+
+
+@shared_task(ignore_result=True)
+def update_track_similarities():
+    return build_track_similarities()
+
+
+@shared_task(ignore_result=True)
+def rebuild_track_similarities():
+    return build_track_similarities(full=True)
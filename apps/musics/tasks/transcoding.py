@@ -0,0 +1,19 @@
+from celery import shared_task
+from django.conf import settings
+
+from apps.musics.services.transcoding import TranscodingError, build_track_renditions
+
+
+# Очередь transcoding (CELERY_TASK_ROUTES). acks_late: упавший посреди ffmpeg
+# воркер вернёт задачу в очередь, а сборка идемпотентна и доделает недостающее
+@shared_task(
+    ignore_result=True,
+    acks_late=True,
+    reject_on_worker_lost=True,
+    autoretry_for=(TranscodingError,),
+    retry_backoff=30,
+    retry_backoff_max=30 * 60,
+    max_retries=settings.TRANSCODING_MAX_RETRIES,
+)
+def transcode_track(track_id):
+    return build_track_renditions(track_id)
@@ -0,0 +1,15 @@
+from celery import shared_task
+
+from apps.musics.services.transcoding import TranscodingError
+from apps.musics.services.waveforms import build_track_waveform
+
+
+@shared_task(
+    ignore_result=True,
+    acks_late=True,
+    autoretry_for=(TranscodingError,),
+    retry_backoff=30,
+    max_retries=3,
+)
+def build_waveform(track_id):
+    return build_track_waveform(track_id)
@@ -4,7 +4,11 @@ from rest_framework.routers import DefaultRouter
 from apps.musics.api_endpoints.v1 import (
     AlbumViewSet,
     ArtistViewSet,
+    ChartDetailAPIView,
+    ChartListAPIView,
+    ForYouAPIView,
     PlaylistViewSet,
+    SearchAPIView,
     LikeViewSet,
     ListeningHistoryViewSet,
     TrackViewSet,
@@ -21,5 +25,13 @@ router.register(r"likes", LikeViewSet, basename="like")
 router.register(r"history", ListeningHistoryViewSet, basename="history")
 
 urlpatterns = [
+    path("search/", SearchAPIView.as_view(), name="search"),
+    path("charts/", ChartListAPIView.as_view(), name="chart-list"),
+    path("charts/<str:period>/", ChartDetailAPIView.as_view(), name="chart-detail"),
+    path(
+        "recommendations/for-you/",
+        ForYouAPIView.as_view(),
+        name="recommendations-for-you",
+    ),
     path("", include(router.urls)),  # /musics/...
 ]
@@ -0,0 +1,66 @@
+import statistics
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from apps.shared.utils.signed_media import MediaSigner
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark signed media URLs: time to build audio + cover URLs for a "
+        "list response (--tracks per page), plain storage URLs vs MediaSigner."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tracks", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        tracks, repeat = options["tracks"], options["repeat"]
+        names = [
+            name
+            for i in range(tracks)
+            for name in (f"tracks/audio/track-{i}.mp3", f"tracks/covers/{i}.jpg")
+        ]
+        base = "https://viberfy.uz"
+        # Секрет из настроек, если задан, иначе тестовый — считаем именно подпись
+        signed = MediaSigner(base, "free", secret=MediaSigner().secret or "benchmark")
+        plain = MediaSigner(base, "free", secret="")
+
+        def page(signer):
+            def run():
+                url = signer.url
+                for name in names:
+                    url(default_storage, name)
+
+            return run
+
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"{tracks} tracks ({len(names)} URLs) per page, {repeat} pages"
+            )
+        )
+        baseline = self._report("plain", len(names), self._measure(page(plain), repeat))
+        cost = self._report("signed", len(names), self._measure(page(signed), repeat))
+        self.stdout.write(f"signing overhead: {(cost - baseline) * 1000:.3f} ms/page")
+
+    def _measure(self, func, repeat):
+        func()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - started)
+        return timings
+
+    def _report(self, label, urls, timings):
+        median = statistics.median(timings)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label:>8}: {median * 1000:.3f} ms/page, "
+                f"{median / urls * 1e6:.2f} µs/URL, {urls / median:,.0f} URLs/s"
+            )
+        )
+        return median
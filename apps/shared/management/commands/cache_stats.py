@@ -0,0 +1,42 @@
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from apps.shared.utils.tagged_cache import get_cache_stats, reset_cache_stats
+
+OUTCOMES = ("hit", "early", "refresh", "miss", "stale", "waited")
+
+
+class Command(BaseCommand):
+    help = (
+        "Show tagged cache outcomes per key family: hits, early (XFetch) and "
+        "stale refreshes, misses, stale values served and waits for a recompute."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true")
+
+    def handle(self, *args, **options):
+        stats = get_cache_stats()
+        self.stdout.write(f"{'key':<32}" + "".join(f"{o:>9}" for o in OUTCOMES))
+        for name, counts in sorted(stats.items()):
+            total = sum(counts.values())
+            row = f"{name:<32}" + "".join(f"{counts.get(o, 0):>9}" for o in OUTCOMES)
+            stale = counts.get("stale", 0) / total if total else 0
+            style = self.style.WARNING if stale > 0.05 else self.style.SUCCESS
+            self.stdout.write(style(f"{row}  stale {stale:.1%}"))
+
+        # Уровни TwoTierRedisCache: L1 — память процесса, L2 — Redis
+        get_tier_stats = getattr(cache, "get_tier_stats", None)
+        if get_tier_stats is not None:
+            for tier, counts in sorted(get_tier_stats().items()):
+                hits, misses = counts.get("hit", 0), counts.get("miss", 0)
+                ratio = hits / (hits + misses) if hits + misses else 0
+                self.stdout.write(
+                    f"{tier}: {hits} hits, {misses} misses, hit ratio {ratio:.1%}"
+                )
+
+        if options["reset"]:
+            reset_cache_stats()
+            if get_tier_stats is not None:
+                cache.reset_tier_stats()
+            self.stdout.write("Counters reset")
@@ -1,6 +1,7 @@
 import os
 
 from colorama import Fore, Style
+from django.conf import settings
 from django.core.management.base import BaseCommand
 
 
@@ -28,6 +29,14 @@ class Command(BaseCommand):
         file_contents = file_contents.replace("yourdomain.uz", domain_name)
         file_contents = file_contents.replace("/path/project", project_name)
         file_contents = file_contents.replace("PROJECT_PORT", project_port)
+        # internal location для X-Accel-Redirect должен совпадать с настройкой
+        file_contents = file_contents.replace(
+            "/protected-media/", settings.MEDIA_ACCEL_PREFIX
+        )
+        # Секрет secure_link — тот же, которым подписывает MediaSigner
+        file_contents = file_contents.replace(
+            "MEDIA_SIGNING_SECRET", settings.MEDIA_SIGNING_SECRET
+        )
 
         os.makedirs(target_dir_path, exist_ok=True)
 
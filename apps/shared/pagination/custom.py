@@ -1,8 +1,11 @@
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from apps.shared.paginations.estimated import EstimatedCountPaginator
+
 
 class CustomPagination(PageNumberPagination):
+    django_paginator_class = EstimatedCountPaginator
     page_size_query_param = "page_size"
     page_size = 5
 
@@ -17,6 +20,7 @@ class CustomPagination(PageNumberPagination):
                     "previous": self.get_previous_link(),
                 },
                 "total_items": paginator.count,
+                "total_is_approximate": paginator.is_approximate,
                 "total_pages": paginator.num_pages,
                 "page_size": self.get_page_size(self.request),
                 "current_page": self.page.number,
@@ -1,8 +1,11 @@
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from .estimated import EstimatedCountPaginator
+
 
 class SmallResultsSetPagination(PageNumberPagination):
+    django_paginator_class = EstimatedCountPaginator
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
@@ -0,0 +1,112 @@
+import json
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+# reltuples растёт вместе с таблицей так же, как её считает планировщик:
+# плотность строк на страницу с последнего ANALYZE * текущее число страниц
+RELTUPLES_SQL = """
+SELECT CASE
+    WHEN c.reltuples < 0 THEN -1
+    WHEN c.relpages = 0 THEN c.reltuples
+    ELSE c.reltuples / c.relpages
+        * (pg_relation_size(c.oid) / current_setting('block_size')::int)
+END::bigint
+FROM pg_class c
+WHERE c.oid = %s::regclass
+"""
+
+
+def estimate_count(queryset):
+    """
+    Оценка числа строк queryset по статистике планировщика PostgreSQL:
+    reltuples таблицы для queryset без фильтров, иначе rows из EXPLAIN.
+    None, если оценить нельзя (не PostgreSQL, срез, таблица без ANALYZE).
+    """
+    query = getattr(queryset, "query", None)
+    if query is None or query.is_sliced or query.combinator:
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+
+    with connection.cursor() as cursor:
+        if not query.where and not query.distinct and query.group_by is None:
+            table = connection.ops.quote_name(query.get_meta().db_table)
+            cursor.execute(RELTUPLES_SQL, [table])
+            row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        else:
+            query = query.clone()
+            query.clear_ordering(force=True)
+            sql, params = query.get_compiler(queryset.db).as_sql()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]["Plan"]["Plan Rows"]
+    return int(estimate) if estimate >= 0 else None
+
+
+class EstimatedPage(Page):
+    """Страница, у которой has_next известен точно (выбрана лишняя строка)."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator для больших таблиц: вместо COUNT(*) берёт оценку планировщика,
+    если она не меньше PAGINATION_EXACT_COUNT_THRESHOLD; на маленьких
+    выборках и не на PostgreSQL считает точно. is_approximate — признак
+    оценки. При оценке страница выбирается с одной лишней строкой, так что
+    переход на следующую страницу не зависит от неточного count.
+    """
+
+    @cached_property
+    def estimated_count(self):
+        estimate = estimate_count(self.object_list)
+        if estimate is None or estimate < settings.PAGINATION_EXACT_COUNT_THRESHOLD:
+            return None
+        return estimate
+
+    @property
+    def is_approximate(self):
+        return self.estimated_count is not None
+
+    @cached_property
+    def count(self):
+        if self.is_approximate:
+            return self.estimated_count
+        return super().count
+
+    def validate_number(self, number):
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            # Номер за оценочной последней страницей ещё может существовать
+            if not self.is_approximate or int(number) < 1:
+                raise
+            return int(number)
+
+    def page(self, number):
+        if not self.is_approximate:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        return EstimatedPage(
+            rows[: self.per_page], number, self, has_next=len(rows) > self.per_page
+        )
+
+
+__all__ = ["estimate_count", "EstimatedPage", "EstimatedCountPaginator"]
@@ -0,0 +1,211 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from django.core import signing
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class _CursorSerializer:
+    """JSON для значений ключа; datetime — полный isoformat, с микросекундами."""
+
+    def dumps(self, obj):
+        return json.dumps(obj, separators=(",", ":"), default=_encode).encode("latin-1")
+
+    def loads(self, data):
+        return json.loads(data.decode("latin-1"))
+
+
+def _encode(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f"{type(value).__name__} is not a valid cursor value")
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset-пагинация: следующая страница — WHERE (ключ) < (ключ последней строки)
+    вместо OFFSET, поэтому страница 5000 стоит столько же, сколько первая.
+
+    Ключ — порядок сортировки queryset (в т.ч. из OrderingFilter) плюс pk
+    для неуникальных полей вроде plays_count. Курсор — подписанный
+    (django.core.signing) и непрозрачный для клиента. Поля сортировки
+    должны быть NOT NULL и покрыты составным индексом.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    salt = "apps.shared.paginations.keyset"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(queryset)
+        page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        backwards = bool(cursor and cursor["r"])
+        ordering = [_reverse(f) for f in self.ordering] if backwards else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(_seek(ordering, cursor["v"]))
+
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        self.page = rows[:page_size]
+        if backwards:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor from the next/previous link",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": f"Number of results per page (max {self.max_page_size})",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_ordering(self, queryset):
+        """Поля сортировки queryset с pk в конце (того же направления, что и последнее поле)."""
+        query = queryset.query
+        ordering = list(query.order_by or query.get_meta().ordering)
+        if not ordering or not all(isinstance(field, str) for field in ordering):
+            raise ValueError("KeysetPagination needs a queryset ordered by field names")
+
+        pk_name = query.get_meta().pk.name
+        ordering = [_replace_pk(field, pk_name) for field in ordering]
+        if _field_name(ordering[-1]) != pk_name:
+            descending = ordering[-1].startswith("-")
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+        return ordering
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], backwards=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[0], backwards=True)
+
+    def encode_cursor(self, values, backwards):
+        return signing.dumps(
+            {"o": ",".join(self.ordering), "v": values, "r": backwards},
+            salt=self.salt,
+            serializer=_CursorSerializer,
+            compress=True,
+        )
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            cursor = signing.loads(token, salt=self.salt, serializer=_CursorSerializer)
+        except signing.BadSignature:
+            raise NotFound(self.invalid_cursor_message)
+        # Курсор от другой сортировки (например, сменился ?ordering=) недействителен
+        if cursor.get("o") != ",".join(self.ordering) or len(cursor["v"]) != len(
+            self.ordering
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def _link(self, row, backwards):
+        values = [_value(row, _field_name(field)) for field in self.ordering]
+        token = self.encode_cursor(values, backwards)
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+
+def _field_name(field):
+    return field.lstrip("-")
+
+
+def _reverse(field):
+    return field[1:] if field.startswith("-") else f"-{field}"
+
+
+def _replace_pk(field, pk_name):
+    return field.replace("pk", pk_name) if _field_name(field) == "pk" else field
+
+
+def _value(row, field):
+    # Строки .values() (lean-сериализация) — dict с ключами-lookup'ами
+    if isinstance(row, dict):
+        return row[field]
+    for attr in field.split("__"):
+        row = getattr(row, attr)
+    return row
+
+
+def _seek(ordering, values):
+    """
+    Строки строго после ключа values в порядке ordering:
+    (a < x) OR (a = x AND b < y) OR ..., плюс a <= x, чтобы БД
+    начала сканирование индекса прямо с позиции курсора.
+    """
+    condition = Q()
+    for i, field in enumerate(ordering):
+        lookup = "lt" if field.startswith("-") else "gt"
+        equal = {_field_name(f): v for f, v in zip(ordering[:i], values)}
+        condition |= Q(**equal, **{f"{_field_name(field)}__{lookup}": values[i]})
+
+    first = ordering[0]
+    bound = "lte" if first.startswith("-") else "gte"
+    return Q(**{f"{_field_name(first)}__{bound}": values[0]}) & condition
+
+
+__all__ = ["KeysetPagination"]
@@ -0,0 +1,120 @@
+import io
+import struct
+import wave
+
+from django.test import SimpleTestCase
+
+from apps.shared.utils.audio import AudioFormatError, probe_audio
+
+# MPEG-1 Layer III, 128 kbps, 44.1 кГц, без padding: кадр 417 байт, 1152 сэмпла
+MP3_HEADER = b"\xff\xfb\x90\x00"
+MP3_MONO_HEADER = b"\xff\xfb\x90\xc0"
+MP3_FRAME_LENGTH = 417
+
+
+def id3v2(payload_size=300):
+    size = bytes((payload_size >> shift) & 0x7F for shift in (21, 14, 7, 0))
+    return b"ID3\x04\x00\x00" + size + b"\x00" * payload_size
+
+
+def mp3_frames(count, header=MP3_HEADER):
+    return (header + b"\x00" * (MP3_FRAME_LENGTH - 4)) * count
+
+
+def flac(total_samples, sample_rate=44100, channels=2):
+    packed = (sample_rate << 44) | ((channels - 1) << 41) | (15 << 36) | total_samples
+    streaminfo = (
+        struct.pack(">HH", 4096, 4096)
+        + b"\x00" * 6
+        + packed.to_bytes(8, "big")
+        + b"\x00" * 16
+    )
+    return b"fLaC" + b"\x80" + (34).to_bytes(3, "big") + streaminfo + b"\x00" * 5000
+
+
+def ogg_page(packet, granule, serial=7, sequence=0):
+    segments = bytes([255] * (len(packet) // 255) + [len(packet) % 255])
+    return (
+        b"OggS\x00\x00"
+        + struct.pack("<qIII", granule, serial, sequence, 0)
+        + bytes([len(segments)])
+        + segments
+        + packet
+    )
+
+
+class ProbeAudioTestCase(SimpleTestCase):
+    """Длительность и битрейт по заголовкам без декодирования"""
+
+    def test_mp3_cbr_estimate_and_scan(self):
+        data = id3v2() + mp3_frames(1000) + b"TAG" + b"\x00" * 125
+        info = probe_audio(io.BytesIO(data))
+        self.assertEqual(info.format, "mp3")
+        self.assertFalse(info.exact)
+        self.assertEqual(info.bitrate, 128)
+        self.assertAlmostEqual(info.duration, 1000 * 1152 / 44100, delta=0.5)
+
+        info = probe_audio(io.BytesIO(data), scan=True)
+        self.assertTrue(info.exact)
+        self.assertEqual(info.duration, 1000 * 1152 / 44100)
+        self.assertEqual(info.seconds, 26)
+
+    def test_mp3_xing_header(self):
+        # Xing в первом кадре: 32 байта side info после заголовка (MPEG-1 стерео)
+        xing = b"Xing" + struct.pack(">III", 3, 5000, 5000 * MP3_FRAME_LENGTH)
+        first = MP3_HEADER + b"\x00" * 32 + xing
+        first += b"\x00" * (MP3_FRAME_LENGTH - len(first))
+        info = probe_audio(io.BytesIO(first + mp3_frames(10)))
+        self.assertTrue(info.exact)
+        self.assertEqual(info.duration, 5000 * 1152 / 44100)
+        self.assertEqual(info.channels, 2)
+
+        xing_mono = MP3_MONO_HEADER + b"\x00" * 17 + xing
+        xing_mono += b"\x00" * (MP3_FRAME_LENGTH - len(xing_mono))
+        info = probe_audio(io.BytesIO(xing_mono + mp3_frames(10, MP3_MONO_HEADER)))
+        self.assertEqual(info.duration, 5000 * 1152 / 44100)
+        self.assertEqual(info.channels, 1)
+
+    def test_flac_streaminfo(self):
+        info = probe_audio(io.BytesIO(flac(44100 * 90)))
+        self.assertEqual((info.format, info.duration, info.channels), ("flac", 90, 2))
+
+    def test_wav(self):
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as w:
+            w.setnchannels(2)
+            w.setsampwidth(2)
+            w.setframerate(22050)
+            w.writeframes(b"\x00" * 4 * 22050 * 3)
+        info = probe_audio(io.BytesIO(buffer.getvalue()))
+        self.assertEqual((info.format, info.duration), ("wav", 3))
+        self.assertEqual(info.bitrate, 706)
+
+    def test_ogg_opus_and_vorbis(self):
+        opus_head = b"OpusHead\x01\x02" + struct.pack("<HIhB", 312, 44100, 0, 0)
+        data = (
+            ogg_page(opus_head, 0)
+            + b"\x00" * 100_000
+            + ogg_page(b"\x00" * 10, 48000 * 10 + 312, sequence=5)
+        )
+        info = probe_audio(io.BytesIO(data))
+        self.assertEqual((info.format, info.duration), ("ogg", 10))
+        self.assertEqual(info.sample_rate, 44100)
+
+        vorbis_head = b"\x01vorbis" + struct.pack(
+            "<IBIiiiBB", 0, 2, 32000, 0, 0, 0, 0, 1
+        )
+        data = (
+            ogg_page(vorbis_head, 0)
+            + ogg_page(b"\x00" * 10, 32000 * 4, serial=9)
+            + ogg_page(b"\x00" * 10, 32000 * 5)
+            # Последняя страница чужого потока не считается
+            + ogg_page(b"\x00" * 10, 32000 * 60, serial=9)
+        )
+        self.assertEqual(probe_audio(io.BytesIO(data)).duration, 5)
+
+    def test_unknown_or_truncated(self):
+        with self.assertRaises(AudioFormatError):
+            probe_audio(io.BytesIO(b"file_content"))
+        with self.assertRaises(AudioFormatError):
+            probe_audio(io.BytesIO(flac(44100)[:20]))
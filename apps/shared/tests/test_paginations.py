@@ -0,0 +1,75 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.shared.pagination.custom import CustomPagination
+from apps.shared.paginations.estimated import EstimatedCountPaginator, estimate_count
+
+User = get_user_model()
+
+
+class EstimatedCountPaginatorTestCase(TestCase):
+    """Тесты для page-number пагинации с оценочным count"""
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(
+            User(username=f"user{i}", email=f"user{i}@example.com") for i in range(30)
+        )
+
+    def _paginate(self, queryset, page=1):
+        request = Request(APIRequestFactory().get("/", {"page": page}))
+        pagination = CustomPagination()
+        data = pagination.paginate_queryset(queryset, request)
+        return pagination.get_paginated_response(data).data
+
+    def test_small_queryset_counts_exactly(self):
+        queryset = User.objects.order_by("id")
+        paginator = EstimatedCountPaginator(queryset, 10)
+        self.assertEqual(paginator.count, 30)
+        self.assertFalse(paginator.is_approximate)
+
+        data = self._paginate(queryset, page=6)
+        self.assertEqual(data["total_items"], 30)
+        self.assertFalse(data["total_is_approximate"])
+        self.assertIsNone(data["links"]["next"])
+
+    @skipUnless(connection.vendor == "postgresql", "planner estimates need PostgreSQL")
+    @override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=1)
+    def test_large_queryset_uses_planner_estimate(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+        queryset = User.objects.order_by("id")
+        self.assertEqual(estimate_count(queryset), 30)
+        self.assertGreater(estimate_count(queryset.filter(username__gt="user2")), 0)
+
+        paginator = EstimatedCountPaginator(queryset, 10)
+        with self.assertNumQueries(1):
+            self.assertEqual(paginator.count, 30)
+        self.assertTrue(paginator.is_approximate)
+
+        data = self._paginate(queryset, page=5)
+        self.assertTrue(data["total_is_approximate"])
+        self.assertIsNotNone(data["links"]["next"])
+        data = self._paginate(queryset, page=6)
+        self.assertEqual(len(data["data"]), 5)
+        self.assertIsNone(data["links"]["next"])
+
+    @skipUnless(connection.vendor == "postgresql", "planner estimates need PostgreSQL")
+    @override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=1)
+    def test_pages_past_an_underestimate_stay_reachable(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {User._meta.db_table}")
+        User.objects.bulk_create(
+            User(username=f"late{i}", email=f"late{i}@example.com") for i in range(15)
+        )
+        paginator = EstimatedCountPaginator(User.objects.order_by("id"), 10)
+        page = paginator.page(4)
+        self.assertTrue(page.has_next())
+        last = paginator.page(5)
+        self.assertEqual(len(last), 5)
+        self.assertFalse(last.has_next())
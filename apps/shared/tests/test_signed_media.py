@@ -0,0 +1,82 @@
+import base64
+import hashlib
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.storage import FileSystemStorage
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from apps.shared.utils.signed_media import MediaSigner, verify_media_signature
+from apps.shared.views.media import serve
+
+
+@override_settings(
+    MEDIA_SIGNING_SECRET="s3cret",
+    MEDIA_SIGNED_PREFIXES=["tracks/"],
+    MEDIA_SIGNED_URL_TTL=3600,
+    MEDIA_SIGNED_URL_STEP=600,
+)
+class SignedMediaTestCase(SimpleTestCase):
+    """Подписанные медиа-URL в формате nginx secure_link_md5"""
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.storage = FileSystemStorage(location=self.root, base_url="/media/")
+        os.makedirs(os.path.join(self.root, "tracks", "audio"))
+        with open(os.path.join(self.root, "tracks", "audio", "a b.mp3"), "wb") as f:
+            f.write(b"audio")
+
+    def _url(self, name, tier="free", now=1_000_000):
+        return MediaSigner("http://testserver/", tier, now=now).url(self.storage, name)
+
+    def test_signature_matches_nginx_secure_link_md5(self):
+        url = self._url("tracks/audio/a b.mp3")
+        # Срок округлён вверх до шага: одинаковый URL в пределах 10 минут
+        self.assertEqual(url, self._url("tracks/audio/a b.mp3", now=1_000_199))
+        expires = 1_000_200 + 3600
+        # nginx: secure_link_md5 "$secure_link_expires$uri$arg_tier s3cret"
+        digest = hashlib.md5(
+            f"{expires}/media/tracks/audio/a b.mp3free s3cret".encode()
+        )
+        md5 = base64.urlsafe_b64encode(digest.digest()).rstrip(b"=").decode()
+        self.assertEqual(
+            url,
+            "http://testserver/media/tracks/audio/a%20b.mp3"
+            f"?md5={md5}&expires={expires}&tier=free",
+        )
+
+    def test_unsigned_outside_prefixes_or_without_secret(self):
+        self.assertEqual(
+            self._url("albums/covers/1.jpg"),
+            "http://testserver/media/albums/covers/1.jpg",
+        )
+        with override_settings(MEDIA_SIGNING_SECRET=""):
+            self.assertEqual(
+                self._url("tracks/audio/a b.mp3"),
+                "http://testserver/media/tracks/audio/a%20b.mp3",
+            )
+
+    def test_verify(self):
+        signer = MediaSigner(tier="premium")
+        query = signer.url(self.storage, "tracks/audio/a b.mp3").split("?")[1]
+        params = dict(pair.split("=") for pair in query.split("&"))
+        path = "/media/tracks/audio/a b.mp3"
+        self.assertIsNone(verify_media_signature(path, params))
+        self.assertEqual(verify_media_signature(path, {**params, "tier": "free"}), 403)
+        self.assertEqual(verify_media_signature(path, {}), 403)
+        with mock.patch("time.time", return_value=signer.expires + 1):
+            self.assertEqual(verify_media_signature(path, params), 410)
+
+    def test_dev_serve_checks_signature(self):
+        url = MediaSigner().url(self.storage, "tracks/audio/a b.mp3")
+        request = RequestFactory().get(url)
+        response = serve(request, "tracks/audio/a b.mp3", document_root=self.root)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), b"audio")
+
+        request = RequestFactory().get("/media/tracks/audio/a b.mp3")
+        response = serve(request, "tracks/audio/a b.mp3", document_root=self.root)
+        self.assertEqual(response.status_code, 403)
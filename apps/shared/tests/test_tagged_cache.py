@@ -0,0 +1,75 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from apps.shared.utils import tagged_cache
+from apps.shared.utils.tagged_cache import (
+    GENERATION_PREFIX,
+    LOCK_PREFIX,
+    get_cache_stats,
+    get_or_set_tagged,
+    invalidate_tags,
+    reset_cache_stats,
+)
+
+
+class TaggedCacheTestCase(SimpleTestCase):
+    """Тесты для кэша с инвалидацией по поколениям тегов"""
+
+    def setUp(self):
+        cache.clear()
+        reset_cache_stats()
+        self.calls = 0
+
+    def _compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_invalidate_only_dependent_entries(self):
+        self.assertEqual(
+            get_or_set_tagged("a", self._compute, ["track:1", "genre:3"]), 1
+        )
+        self.assertEqual(get_or_set_tagged("b", self._compute, ["track:2"]), 2)
+        self.assertEqual(
+            get_or_set_tagged("a", self._compute, ["track:1", "genre:3"]), 1
+        )
+
+        invalidate_tags("genre:3")
+        self.assertEqual(
+            get_or_set_tagged("a", self._compute, ["track:1", "genre:3"]), 3
+        )
+        self.assertEqual(get_or_set_tagged("b", self._compute, ["track:2"]), 2)
+
+    def test_evicted_generation_does_not_revive_old_entries(self):
+        get_or_set_tagged("a", self._compute, ["track:1"])
+        invalidate_tags("track:1")
+        get_or_set_tagged("a", self._compute, ["track:1"])
+        # Ключ поколения вытеснен: новое поколение не совпадает ни с одним прежним
+        cache.delete(GENERATION_PREFIX + "track:1")
+        self.assertEqual(get_or_set_tagged("a", self._compute, ["track:1"]), 3)
+
+    def test_stale_value_served_while_another_worker_recomputes(self):
+        get_or_set_tagged("top_tracks_10", self._compute, ["tracks"])
+        invalidate_tags("tracks")
+        # Блокировку пересчёта держит другой воркер
+        cache.add(LOCK_PREFIX + "top_tracks_10", 1)
+        self.assertEqual(
+            get_or_set_tagged("top_tracks_10", self._compute, ["tracks"]), 1
+        )
+        self.assertEqual(self.calls, 1)
+
+        cache.delete(LOCK_PREFIX + "top_tracks_10")
+        self.assertEqual(
+            get_or_set_tagged("top_tracks_10", self._compute, ["tracks"]), 2
+        )
+        self.assertEqual(
+            get_cache_stats()["top_tracks"], {"miss": 1, "stale": 1, "refresh": 1}
+        )
+
+    def test_expensive_entry_is_recomputed_early(self):
+        get_or_set_tagged("a", self._compute, ["track:1"], timeout=60)
+        value, version, expires_at, _ = cache.get("a")
+        # Расчёт "стоил" больше срока жизни — XFetch почти наверняка пересчитает
+        cache.set("a", (value, version, expires_at, 10_000))
+        self.assertEqual(get_or_set_tagged("a", self._compute, ["track:1"]), 2)
+        self.assertEqual(get_cache_stats()["a"], {"miss": 1, "early": 1})
+        self.assertIsNone(cache.get(tagged_cache.LOCK_PREFIX + "a"))
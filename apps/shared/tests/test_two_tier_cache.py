@@ -0,0 +1,94 @@
+import time
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from apps.shared.utils.tagged_cache import get_or_set_tagged, invalidate_tags
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+CACHES = {
+    "default": {
+        "BACKEND": "apps.shared.utils.two_tier_cache.TwoTierRedisCache",
+        "LOCATION": "redis://localhost:6379/1",
+        "OPTIONS": {
+            "CONNECTION_POOL_KWARGS": (
+                {
+                    "connection_class": fakeredis.FakeConnection,
+                    "server": fakeredis.FakeServer(),
+                }
+                if fakeredis
+                else {}
+            ),
+            "L1_CHANNEL": "tests:l1-invalidate",
+        },
+    }
+}
+
+
+@skipUnless(fakeredis, "fakeredis is not installed")
+@override_settings(CACHES=CACHES)
+class TwoTierCacheTestCase(SimpleTestCase):
+    """Тесты для L1 в памяти процесса перед Redis"""
+
+    def setUp(self):
+        cache.clear()
+        cache.reset_tier_stats()
+        self.assertTrue(cache.tier.listening.wait(2))
+        self.redis = cache.client.get_client()
+
+    def _write_behind_l1(self, key, value):
+        """Запись в Redis в обход backend — как из другого процесса."""
+        self.redis.set(cache.make_key(key), cache.client.encode(value))
+
+    def _wait_evicted(self, key):
+        deadline = time.monotonic() + 2
+        while cache.tier.get(cache.make_key(key)) is not None:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_hot_key_is_served_from_l1(self):
+        cache.set("stats", {"plays": 1})
+        self.assertEqual(cache.get("stats"), {"plays": 1})
+        self._write_behind_l1("stats", {"plays": 2})
+        self.assertEqual(cache.get("stats"), {"plays": 1})
+        self.assertEqual(
+            cache.get_tier_stats(),
+            {"l1": {"hit": 1, "miss": 1}, "l2": {"hit": 1}},
+        )
+
+        # Запись через backend сразу видна в своём процессе
+        cache.set("stats", {"plays": 3})
+        self.assertEqual(cache.get("stats"), {"plays": 3})
+
+    def test_invalidation_from_another_process(self):
+        cache.set("stats", {"plays": 1})
+        cache.get("stats")
+        self._write_behind_l1("stats", {"plays": 2})
+        self.redis.publish(
+            "tests:l1-invalidate", "other-node\n" + cache.make_key("stats")
+        )
+        self._wait_evicted("stats")
+        self.assertEqual(cache.get("stats"), {"plays": 2})
+
+    def test_tag_invalidation_reaches_l1(self):
+        self.assertEqual(
+            get_or_set_tagged("top_tracks_10", lambda: [1], ["tracks"]), [1]
+        )
+        self.assertEqual(
+            get_or_set_tagged("top_tracks_10", lambda: [2], ["tracks"]), [1]
+        )
+        invalidate_tags("tracks")
+        self.assertEqual(
+            get_or_set_tagged("top_tracks_10", lambda: [3], ["tracks"]), [3]
+        )
+
+    def test_locks_bypass_l1(self):
+        cache.add("tag-lock:top_tracks_10", 1)
+        cache.get("tag-lock:top_tracks_10")
+        self.redis.delete(cache.make_key("tag-lock:top_tracks_10"))
+        self.assertIsNone(cache.get("tag-lock:top_tracks_10"))
@@ -0,0 +1,46 @@
+import struct
+
+import numpy as np
+from django.test import SimpleTestCase
+
+from apps.shared.utils.waveform import compute_peaks, decode_waveform, encode_waveform
+
+
+class WaveformTestCase(SimpleTestCase):
+    """Пики min/max и формат .dat audiowaveform"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.samples = rng.integers(-32768, 32767, 10_001, dtype=np.int16)
+
+    def test_peaks_match_naive_windows(self):
+        peaks, samples_per_pixel = compute_peaks(self.samples, 1000, bits=16)
+        self.assertEqual(samples_per_pixel, 11)
+        self.assertEqual(len(peaks), 2 * 910)
+        for i in (0, 500, 909):
+            window = self.samples[i * 11 : (i + 1) * 11]
+            self.assertEqual(
+                (peaks[2 * i], peaks[2 * i + 1]), (window.min(), window.max())
+            )
+
+    def test_int8_peaks(self):
+        peaks16, _ = compute_peaks(self.samples, 1000, bits=16)
+        peaks8, _ = compute_peaks(self.samples, 1000, bits=8)
+        self.assertEqual(peaks8.dtype, np.int8)
+        np.testing.assert_array_equal(peaks8, peaks16 >> 8)
+
+    def test_dat_roundtrip(self):
+        peaks, samples_per_pixel = compute_peaks(self.samples, 1000)
+        data = encode_waveform(peaks, 22050, samples_per_pixel)
+        # version, flags (8 бит), частота, окно, число пар
+        self.assertEqual(struct.unpack_from("<iIiiI", data), (1, 1, 22050, 11, 910))
+        self.assertEqual(len(data), 20 + 2 * 910)
+        sample_rate, window, decoded = decode_waveform(data)
+        self.assertEqual((sample_rate, window), (22050, 11))
+        np.testing.assert_array_equal(decoded, peaks)
+
+    def test_short_and_empty_input(self):
+        peaks, samples_per_pixel = compute_peaks(np.array([5, -3], np.int16), 1000, 16)
+        self.assertEqual((list(peaks), samples_per_pixel), ([5, 5, -3, -3], 1))
+        peaks, _ = compute_peaks(np.array([], np.int16), 1000)
+        self.assertEqual(len(peaks), 0)
@@ -0,0 +1,317 @@
+import struct
+from collections import namedtuple
+from dataclasses import dataclass
+
+# Сколько читается с начала (после ID3v2) и с конца файла
+HEAD_BYTES = 16 * 1024
+TAIL_BYTES = 8 * 1024
+# Страница Ogg не длиннее 65 307 байт — последняя целиком попадает в хвост
+OGG_TAIL_BYTES = 66 * 1024
+SCAN_CHUNK_SIZE = 256 * 1024
+
+
+class AudioFormatError(ValueError):
+    """Файл не похож на MP3, FLAC, WAV или Ogg либо заголовки повреждены."""
+
+
+@dataclass(frozen=True)
+class AudioInfo:
+    format: str
+    duration: float
+    # kbps, средний по файлу
+    bitrate: int
+    sample_rate: int
+    channels: int
+    # False — оценка: MP3 без заголовка Xing/VBRI считается как CBR по первому кадру
+    exact: bool = True
+
+    @property
+    def seconds(self):
+        """Длительность для Track.duration: целые секунды, не меньше 1."""
+        return max(1, round(self.duration))
+
+
+def probe_audio(file, size=None, scan=False):
+    """
+    Формат, длительность и битрейт по заголовкам, без декодирования:
+    читаются HEAD_BYTES начала и несколько KB конца файла. file — двоичный
+    файл с seek (UploadedFile, File хранилища). scan — для MP3 без
+    Xing/VBRI пройти все заголовки кадров (читает весь файл, но не декодирует).
+    """
+    if size is None:
+        file.seek(0, 2)
+        size = file.tell()
+    file.seek(0)
+    head = file.read(HEAD_BYTES)
+    start = 0
+    if head[:3] == b"ID3" and len(head) >= 10:
+        # ID3v2: размер — syncsafe int, плюс заголовок и, если есть, футер
+        start = 10 + _syncsafe(head[6:10]) + (10 if head[5] & 0x10 else 0)
+        file.seek(start)
+        head = file.read(HEAD_BYTES)
+
+    try:
+        if head.startswith(b"fLaC"):
+            return _flac(head, size - start)
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            return _wav(head, size)
+        if head.startswith(b"OggS"):
+            return _ogg(file, head, size)
+        return _mp3(file, head, start, size, scan)
+    except (struct.error, IndexError) as exc:
+        # Заголовок обрезан посередине
+        raise AudioFormatError(f"Truncated audio header: {exc}") from exc
+
+
+def _syncsafe(data):
+    return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def _tail(file, size, length):
+    file.seek(max(size - length, 0))
+    return file.read(length)
+
+
+# --- MP3 ---
+_Frame = namedtuple(
+    "_Frame", "version layer bitrate sample_rate samples length channels"
+)
+
+# (MPEG-1?, слой) -> битрейты по индексу, kbps
+_MP3_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_SAMPLE_RATES = {
+    1: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    25: (11025, 12000, 8000),
+}
+# Биты версии в заголовке -> MPEG-1, 2, 2.5 (25); 1 — зарезервировано
+_MP3_VERSIONS = {3: 1, 2: 2, 0: 25}
+
+
+def _mp3_frame(data, i):
+    if i + 4 > len(data):
+        return None
+    (header,) = struct.unpack_from(">I", data, i)
+    if header >> 21 != 0x7FF:
+        return None
+    version = _MP3_VERSIONS.get((header >> 19) & 3)
+    layer = 4 - ((header >> 17) & 3)
+    bitrate_index = (header >> 12) & 0xF
+    rate_index = (header >> 10) & 3
+    # Free format, битые индексы и зарезервированный слой не поддерживаем
+    if version is None or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = _MP3_BITRATES[version == 1, layer][bitrate_index]
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (header >> 9) & 1
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate * 1000 // sample_rate + padding) * 4
+    else:
+        samples = 1152 if layer == 2 or version == 1 else 576
+        length = samples // 8 * bitrate * 1000 // sample_rate + padding
+    channels = 1 if (header >> 6) & 3 == 3 else 2
+    return _Frame(version, layer, bitrate, sample_rate, samples, length, channels)
+
+
+def _first_mp3_frame(head):
+    """Первый кадр, за которым (если он в буфере) идёт такой же — не ложный sync."""
+    i = head.find(b"\xff")
+    while i != -1:
+        frame = _mp3_frame(head, i)
+        if frame is not None:
+            following = _mp3_frame(head, i + frame.length)
+            if i + frame.length + 4 > len(head) or (
+                following is not None
+                and following[:2] == frame[:2]
+                and following.sample_rate == frame.sample_rate
+            ):
+                return i, frame
+        i = head.find(b"\xff", i + 1)
+    raise AudioFormatError("No MPEG audio frames found")
+
+
+def _mp3(file, head, start, size, scan):
+    offset, frame = _first_mp3_frame(head)
+    audio_start = start + offset
+    # Теги в конце файла: ID3v1 (128 байт), перед ним может быть APEv2
+    end = size
+    tail = _tail(file, size, TAIL_BYTES)
+    if tail[-128:-125] == b"TAG":
+        end -= 128
+        tail = tail[:-128]
+    if tail[-32:-24] == b"APETAGEX":
+        tag_size, _, flags = struct.unpack_from("<III", tail, len(tail) - 20)
+        end -= tag_size + (32 if flags & 0x80000000 else 0)
+
+    frames = audio_bytes = None
+    # Xing/Info идёт после side info: 32/17 байт в MPEG-1, 17/9 в MPEG-2/2.5
+    if frame.version == 1:
+        side_info = 32 if frame.channels == 2 else 17
+    else:
+        side_info = 17 if frame.channels == 2 else 9
+    xing = offset + 4 + side_info
+    vbri = offset + 4 + 32
+    if head[xing : xing + 4] in (b"Xing", b"Info"):
+        (flags,) = struct.unpack_from(">I", head, xing + 4)
+        position = xing + 8
+        if flags & 1:
+            (frames,) = struct.unpack_from(">I", head, position)
+            position += 4
+        if flags & 2:
+            (audio_bytes,) = struct.unpack_from(">I", head, position)
+    elif head[vbri : vbri + 4] == b"VBRI":
+        audio_bytes, frames = struct.unpack_from(">II", head, vbri + 10)
+
+    exact = True
+    if frames:
+        samples = frames * frame.samples
+    elif scan:
+        samples, audio_bytes = _scan_mp3(file, audio_start, end)
+    else:
+        # Без заголовка VBR — как CBR с битрейтом первого кадра
+        samples = (end - audio_start) * 8 * frame.sample_rate // (frame.bitrate * 1000)
+        exact = False
+    if not samples:
+        raise AudioFormatError("Empty MPEG audio stream")
+    duration = samples / frame.sample_rate
+    audio_bytes = audio_bytes or end - audio_start
+    return AudioInfo(
+        format="mp3",
+        duration=duration,
+        bitrate=round(audio_bytes * 8 / duration / 1000),
+        sample_rate=frame.sample_rate,
+        channels=frame.channels,
+        exact=exact,
+    )
+
+
+def _scan_mp3(file, start, end):
+    """Проход по заголовкам кадров от start до end -> (сэмплы, байты аудио)."""
+    samples = 0
+    position = buffer_start = start
+    buffer = b""
+    while position + 4 <= end:
+        i = position - buffer_start
+        if i + 4 > len(buffer):
+            file.seek(position)
+            buffer = file.read(min(SCAN_CHUNK_SIZE, end - position))
+            buffer_start, i = position, 0
+        frame = _mp3_frame(buffer, i)
+        if frame is None:
+            break
+        samples += frame.samples
+        position += frame.length
+    return samples, min(position, end) - start
+
+
+# --- FLAC ---
+def _flac(head, size):
+    # Первый блок метаданных — всегда STREAMINFO (тип 0, 34 байта)
+    if len(head) < 42 or head[4] & 0x7F != 0:
+        raise AudioFormatError("FLAC STREAMINFO block is missing")
+    info = _streaminfo(head[8:42])
+    return AudioInfo(
+        format="flac",
+        duration=info[0],
+        bitrate=round(size * 8 / info[0] / 1000),
+        sample_rate=info[1],
+        channels=info[2],
+    )
+
+
+def _streaminfo(block):
+    """STREAMINFO -> (длительность, частота, каналы)."""
+    packed = int.from_bytes(block[10:18], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total_samples = packed & ((1 << 36) - 1)
+    if not sample_rate or not total_samples:
+        raise AudioFormatError("FLAC stream length is unknown")
+    return total_samples / sample_rate, sample_rate, channels
+
+
+# --- WAV ---
+def _wav(head, size):
+    fmt = None
+    position = 12
+    while position + 8 <= len(head):
+        chunk_id = head[position : position + 4]
+        (chunk_size,) = struct.unpack_from("<I", head, position + 4)
+        if chunk_id == b"fmt " and position + 24 <= len(head):
+            fmt = struct.unpack_from("<HHIIHH", head, position + 8)
+        elif chunk_id == b"data":
+            data_start = position + 8
+            # Потоковая запись оставляет размер 0 или 0xFFFFFFFF — до конца файла
+            if not chunk_size or data_start + chunk_size > size:
+                chunk_size = size - data_start
+            break
+        position += 8 + chunk_size + (chunk_size & 1)
+    else:
+        raise AudioFormatError("WAV data chunk is not in the first KB")
+    if fmt is None or not fmt[3]:
+        raise AudioFormatError("WAV fmt chunk is missing")
+    _, channels, sample_rate, byte_rate, _, _ = fmt
+    return AudioInfo(
+        format="wav",
+        duration=chunk_size / byte_rate,
+        bitrate=round(byte_rate * 8 / 1000),
+        sample_rate=sample_rate,
+        channels=channels,
+    )
+
+
+# --- Ogg (Vorbis, Opus, FLAC) ---
+def _ogg(file, head, size):
+    if len(head) < 27:
+        raise AudioFormatError("Truncated Ogg page")
+    (serial,) = struct.unpack_from("<I", head, 14)
+    segments = head[26]
+    packet = head[27 + segments :]
+    pre_skip = 0
+    if packet.startswith(b"\x01vorbis"):
+        channels = packet[11]
+        (sample_rate,) = struct.unpack_from("<I", packet, 12)
+        rate = sample_rate
+    elif packet.startswith(b"OpusHead"):
+        channels = packet[9]
+        pre_skip, sample_rate = struct.unpack_from("<HI", packet, 10)
+        # Гранулы Opus всегда в 48 кГц, независимо от исходной частоты
+        rate = 48000
+    elif packet.startswith(b"\x7fFLAC") and packet[9:13] == b"fLaC":
+        _, sample_rate, channels = _streaminfo(packet[17:51])
+        rate = sample_rate
+    else:
+        raise AudioFormatError("Unsupported Ogg codec")
+
+    # Длительность — гранула последней страницы этого потока
+    tail = _tail(file, size, OGG_TAIL_BYTES)
+    position = tail.rfind(b"OggS")
+    while position != -1:
+        if position + 18 <= len(tail):
+            granule, page_serial = struct.unpack_from("<qI", tail, position + 6)
+            if page_serial == serial and granule > 0:
+                break
+        position = tail.rfind(b"OggS", 0, position)
+    else:
+        raise AudioFormatError("Last Ogg page is not in the tail")
+    if not rate or granule <= pre_skip:
+        raise AudioFormatError("Ogg stream length is unknown")
+    duration = (granule - pre_skip) / rate
+    return AudioInfo(
+        format="ogg",
+        duration=duration,
+        bitrate=round(size * 8 / duration / 1000),
+        sample_rate=sample_rate,
+        channels=channels,
+    )
+
+
+__all__ = ["AudioInfo", "AudioFormatError", "probe_audio"]
@@ -0,0 +1,243 @@
+from collections import defaultdict
+
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from .signed_media import get_media_signer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_renderer = JSONRenderer()
+_encoder = JSONEncoder()
+# Значение поля, ключ которого не попадает в ответ
+OMIT = object()
+
+
+def dumps(data):
+    """JSON-байты: orjson, если установлен, иначе те же байты, что у JSONRenderer."""
+    if orjson is not None:
+        return orjson.dumps(data, default=_encoder.default)
+    # render(None) даёт пустое тело, а не null
+    return _renderer.render(data) if data is not None else b"null"
+
+
+class LeanField:
+    """
+    Значение lookup из строки .values() как есть. omit_null — пропустить
+    ключ при None, как read-only поле DRF с source через пустой FK
+    (source="album.name" у трека без альбома).
+    """
+
+    def __init__(self, lookup, omit_null=False):
+        self.lookup = lookup
+        self.omit_null = omit_null
+
+    def lookups(self, prefix=""):
+        return [prefix + self.lookup]
+
+    def getter(self, context, rows, prefix=""):
+        """Функция row -> значение; строится один раз на страницу."""
+        lookup = prefix + self.lookup
+        if self.omit_null:
+            return lambda row: OMIT if row[lookup] is None else row[lookup]
+        return lambda row: row[lookup]
+
+
+class LeanDateField(LeanField):
+    """Как DateField/DateTimeField DRF (часовой пояс, "Z" вместо +00:00)."""
+
+    def __init__(self, lookup, drf_field=None):
+        super().__init__(lookup)
+        self.drf_field = drf_field or serializers.DateField()
+
+    def getter(self, context, rows, prefix=""):
+        lookup, represent = prefix + self.lookup, self.drf_field.to_representation
+
+        def get(row):
+            value = row[lookup]
+            return None if value is None else represent(value)
+
+        return get
+
+
+class LeanMediaField(LeanField):
+    """
+    FileField/ImageField: имя файла -> URL через MediaSigner контекста —
+    абсолютный от request и подписанный, как у SignedFileField. Базовый
+    URL и срок подписи считаются один раз на страницу.
+    """
+
+    def __init__(self, lookup, model_field):
+        super().__init__(lookup)
+        self.storage = model_field.storage
+
+    def getter(self, context, rows, prefix=""):
+        lookup, storage = prefix + self.lookup, self.storage
+        url = get_media_signer(context).url
+
+        def get(row):
+            name = row[lookup]
+            return url(storage, name) if name else None
+
+        return get
+
+
+class LeanNested(LeanField):
+    """
+    Вложенный объект по FK: поля с префиксом "<relation>__".
+    allow_null — None вместо объекта, если FK пустой.
+    """
+
+    def __init__(self, relation, fields, allow_null=False):
+        super().__init__(relation)
+        self.fields = _lean_fields(fields)
+        self.allow_null = allow_null
+
+    def lookups(self, prefix=""):
+        nested = f"{prefix}{self.lookup}__"
+        lookups = [lookup for f in self.fields.values() for lookup in f.lookups(nested)]
+        if self.allow_null:
+            lookups.append(f"{prefix}{self.lookup}_id")
+        return lookups
+
+    def getter(self, context, rows, prefix=""):
+        nested = f"{prefix}{self.lookup}__"
+        getters = [
+            (key, field.getter(context, rows, nested))
+            for key, field in self.fields.items()
+        ]
+        fk = f"{prefix}{self.lookup}_id" if self.allow_null else None
+        build = _builder(self.fields, getters)
+
+        def get(row):
+            if fk and row[fk] is None:
+                return None
+            return build(row)
+
+        return get
+
+
+class LeanMany(LeanField):
+    """
+    M2M: один .values() по through-таблице на всю страницу, в порядке
+    Meta.ordering связанной модели — как prefetch_related в ModelSerializer.
+    """
+
+    def __init__(self, descriptor, fields, source="id"):
+        super().__init__(source)
+        field = descriptor.field
+        self.through = descriptor.through
+        self.source_name = field.m2m_field_name()
+        self.target_name = field.m2m_reverse_field_name()
+        self.ordering = field.related_model._meta.ordering
+        self.fields = _lean_fields(fields)
+
+    def getter(self, context, rows, prefix=""):
+        source = f"{self.source_name}_id"
+        target = f"{self.target_name}__"
+        ids = {row[prefix + self.lookup] for row in rows}
+        lookups = [lookup for f in self.fields.values() for lookup in f.lookups(target)]
+        related = self.through.objects.filter(**{f"{source}__in": ids}).values(
+            source, *lookups
+        )
+        related = related.order_by(*(_prefixed(o, target) for o in self.ordering))
+        getters = [
+            (key, field.getter(context, related, target))
+            for key, field in self.fields.items()
+        ]
+        build = _builder(self.fields, getters)
+        grouped = defaultdict(list)
+        for item in related:
+            grouped[item[source]].append(build(item))
+        lookup = prefix + self.lookup
+        return lambda row: grouped.get(row[lookup], [])
+
+
+class LeanSerializer:
+    """
+    Read-only сериализация из строк .values(): dict по схеме fields без
+    экземпляров моделей и полей ModelSerializer. Схема повторяет вывод
+    своего ModelSerializer — это проверяют тесты эквивалентности.
+
+    fields: {ключ: lookup | LeanField}. Поля, которых нет в .values()
+    (персональные вроде is_liked), добавляет represent() подкласса.
+    """
+
+    fields = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._lean_fields = _lean_fields(cls.fields)
+
+    def __init__(self, context=None):
+        self.context = context or {}
+
+    @classmethod
+    def lookups(cls):
+        return [lookup for f in cls._lean_fields.values() for lookup in f.lookups()]
+
+    @classmethod
+    def values(cls, queryset, *extra):
+        """
+        queryset.values() с полями схемы, extra и полями сортировки —
+        их читает keyset-курсор.
+        """
+        pk_name = queryset.model._meta.pk.name
+        ordering = [
+            pk_name if f.lstrip("-") == "pk" else f.lstrip("-")
+            for f in queryset.query.order_by or queryset.model._meta.ordering
+        ]
+        lookups = [*cls.lookups(), *extra, pk_name, *ordering]
+        return queryset.values(*dict.fromkeys(lookups))
+
+    def represent(self, rows):
+        rows = list(rows)
+        getters = [
+            (key, field.getter(self.context, rows))
+            for key, field in self._lean_fields.items()
+        ]
+        build = _builder(self._lean_fields, getters)
+        return [build(row) for row in rows]
+
+
+def _builder(fields, getters):
+    """row -> dict; цикл с пропуском OMIT только если такие поля есть."""
+    if not any(field.omit_null for field in fields.values()):
+        return lambda row: {key: value(row) for key, value in getters}
+
+    def build(row):
+        item = {}
+        for key, value in getters:
+            result = value(row)
+            if result is not OMIT:
+                item[key] = result
+        return item
+
+    return build
+
+
+def _lean_fields(fields):
+    return {
+        key: field if isinstance(field, LeanField) else LeanField(field)
+        for key, field in fields.items()
+    }
+
+
+def _prefixed(ordering, prefix):
+    descending = ordering.startswith("-")
+    return ("-" if descending else "") + prefix + ordering.lstrip("-")
+
+
+__all__ = [
+    "dumps",
+    "LeanField",
+    "LeanDateField",
+    "LeanMediaField",
+    "LeanNested",
+    "LeanMany",
+    "LeanSerializer",
+]
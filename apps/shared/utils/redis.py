@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+from django_redis import get_redis_connection as _get_redis_connection
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+
+def get_redis_connection(alias="default"):
+    """
+    Raw-клиент Redis из django-redis.
+    Возвращает None, если кэш не на Redis (dev / тесты на LocMemCache).
+    """
+    try:
+        return _get_redis_connection(alias)
+    except NotImplementedError:
+        return None
+
+
+class BufferedCounter:
+    """
+    Счётчики событий в памяти процесса, которые не чаще раза в interval
+    секунд сливаются в Redis-хэш key одним pipeline — без round trip
+    на каждое событие. Без Redis остаются счётчиками процесса.
+    """
+
+    def __init__(self, key, interval=10, connection=get_redis_connection):
+        self.key = key
+        self.interval = interval
+        self._connection = connection
+        self._pending = Counter()
+        self._flush_at = time.monotonic() + interval
+        self._lock = threading.Lock()
+
+    def incr(self, field, amount=1):
+        if not amount:
+            return
+        with self._lock:
+            self._pending[field] += amount
+            due = time.monotonic() >= self._flush_at
+        if due:
+            self.flush()
+
+    def flush(self):
+        redis = self._connection()
+        if redis is None:
+            return
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._flush_at = time.monotonic() + self.interval
+        if not pending:
+            return
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for field, amount in pending.items():
+                pipe.hincrby(self.key, field, amount)
+            pipe.execute()
+        except RedisError:
+            logger.exception("Failed to flush counters to %s", self.key)
+            with self._lock:
+                self._pending.update(pending)
+
+    def read(self):
+        """Сумма по всем процессам из Redis плюс ещё не слитое в этом."""
+        totals = Counter()
+        redis = self._connection()
+        if redis is not None:
+            try:
+                totals.update(
+                    {f.decode(): int(n) for f, n in redis.hgetall(self.key).items()}
+                )
+            except RedisError:
+                logger.exception("Failed to read counters from %s", self.key)
+        with self._lock:
+            totals.update(self._pending)
+        return totals
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+        redis = self._connection()
+        if redis is not None:
+            redis.delete(self.key)
@@ -0,0 +1,86 @@
+from rest_framework.serializers import BaseSerializer
+
+
+class SparseFieldset:
+    """
+    ?fields= и ?include= запроса: множества путей через точку от корня
+    ответа (albums.tracks.name) или None, если параметра нет.
+
+    fields — какие поля оставить; на каждом уровне, где поля не названы,
+    остаются все. include — какие вложенные объекты разворачивать.
+    Пустой параметр — как его отсутствие (так же их нормализует кэш ответов).
+    """
+
+    def __init__(self, fields=None, include=None):
+        self.fields = fields
+        self.include = include
+
+    @classmethod
+    def from_request(cls, request, fields_param="fields", include_param="include"):
+        params = request.query_params
+        return cls(
+            _parse(params.get(fields_param)),
+            _parse(params.get(include_param)),
+        )
+
+    def __bool__(self):
+        return self.fields is not None or self.include is not None
+
+    def keep(self, path, relation=False):
+        """Остаётся ли в ответе поле path (вложенный объект, если relation)."""
+        parent, _, name = path.rpartition(".")
+        if self.fields is not None:
+            prefix = f"{parent}." if parent else ""
+            level = {
+                field[len(prefix) :].split(".")[0]
+                for field in self.fields
+                if field.startswith(prefix)
+            }
+            if level and name not in level:
+                return False
+        if relation and self.include is not None:
+            return any(i == path or i.startswith(f"{path}.") for i in self.include)
+        return True
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Сериализатор отдаёт только поля из SparseFieldset контекста
+    (context["sparse_fieldset"]). Вложенные сериализаторы тоже должны
+    использовать миксин — путь поля они считают по цепочке parent.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = self.context.get("sparse_fieldset")
+        if not fieldset:
+            return fields
+        prefix = _path(self)
+        return {
+            name: field
+            for name, field in fields.items()
+            if fieldset.keep(prefix + name, is_nested(field))
+        }
+
+
+def is_nested(field):
+    """Вложенный сериализатор (в т.ч. many=True), а не скалярное поле."""
+    return isinstance(getattr(field, "child", field), BaseSerializer)
+
+
+def _path(serializer):
+    names = []
+    node = serializer
+    while getattr(node, "parent", None) is not None:
+        if node.field_name:
+            names.append(node.field_name)
+        node = node.parent
+    return "".join(f"{name}." for name in reversed(names))
+
+
+def _parse(value):
+    items = {item.strip() for item in (value or "").split(",") if item.strip()}
+    return items or None
+
+
+__all__ = ["SparseFieldset", "SparseFieldsSerializerMixin", "is_nested"]
@@ -0,0 +1,196 @@
+import hashlib
+import math
+import random
+import re
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .redis import BufferedCounter, get_redis_connection
+
+GENERATION_PREFIX = "tag-gen:"
+LOCK_PREFIX = "tag-lock:"
+STATS_KEY = "tag-cache:stats"
+# Пересчёт дольше этого — блокировка истечёт и пересчитает следующий
+LOCK_TIMEOUT = 30
+# Сколько ждать пересчёта другим воркером, когда старого значения нет
+WAIT_TIMEOUT = 2.0
+WAIT_INTERVAL = 0.05
+# beta XFetch: > 1 — пересчитывать раньше, < 1 — позже
+XFETCH_BETA = 1.0
+
+# Исходы копятся в процессе и сливаются в Redis раз в 10 секунд
+_stats = BufferedCounter(STATS_KEY)
+
+
+def get_tag_generations(tags):
+    """
+    Текущие поколения тегов одним get_many. Поколение отсутствующего тега
+    (новый или вытесненный ключ) — time_ns(), а не 0: после вытеснения
+    старые записи не оживут под тем же поколением.
+    """
+    keys = [GENERATION_PREFIX + tag for tag in tags]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            generation = time.time_ns()
+            if not cache.add(key, generation, timeout=None):
+                generation = cache.get(key, generation)
+            found[key] = generation
+    return [found[key] for key in keys]
+
+
+def tags_version(tags):
+    """Короткий digest поколений тегов: меняется при bump любого из них."""
+    generations = ":".join(str(g) for g in get_tag_generations(tags))
+    return hashlib.md5(generations.encode()).hexdigest()[:12]
+
+
+def tagged_key(key, tags):
+    """Ключ записи с поколениями её тегов: bump любого тега даёт новый ключ."""
+    return f"{key}:{tags_version(tags)}"
+
+
+def get_or_set_tagged(key, default, tags, timeout=None, name=None):
+    """
+    cache.get_or_set с тегами вроде "track:42", "genre:3" или "tracks"
+    и защитой от stampede. default — значение или callable; значения должны
+    быть простыми данными (id, dict), не экземплярами моделей.
+
+    Запись хранит значение, версию тегов, срок и время расчёта:
+    - свежая запись пересчитывается заранее с вероятностью XFetch
+      (тем выше, чем ближе срок и дороже расчёт) — одним воркером;
+    - устаревшую (срок вышел или сдвинулся тег) пересчитывает тот, кто
+      взял блокировку "tag-lock:<key>" (cache.add = SET NX на Redis),
+      остальные TAGGED_CACHE_STALE_TIMEOUT отдают старое значение;
+    - без старого значения остальные ждут пересчёт до WAIT_TIMEOUT.
+    Исходы считаются в get_cache_stats() по имени name (по умолчанию —
+    ключ без числовых id: "top_tracks_10" -> "top_tracks").
+    """
+    timeout = settings.TAGGED_CACHE_TIMEOUT if timeout is None else timeout
+    name = name or re.sub(r"_\d+", "", key)
+    version = tags_version(tags)
+
+    entry = cache.get(key)
+    now = time.time()
+    if entry is not None and entry[1] == version and now < entry[2]:
+        value, _, expires_at, delta = entry
+        # XFetch: пересчёт, если now - delta * beta * ln(rand) >= expires_at
+        early = now - delta * XFETCH_BETA * math.log(1 - random.random())
+        if early < expires_at or not _acquire(key):
+            _count(name, "hit")
+            return value
+        _count(name, "early")
+        return _compute(key, default, version, timeout, locked=True)
+
+    if _acquire(key):
+        _count(name, "refresh" if entry is not None else "miss")
+        return _compute(key, default, version, timeout, locked=True)
+    if entry is not None:
+        # Пересчитывает другой воркер — отдаём старое значение
+        _count(name, "stale")
+        return entry[0]
+
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and entry[1] == version:
+            _count(name, "waited")
+            return entry[0]
+    _count(name, "miss")
+    return _compute(key, default, version, timeout, locked=False)
+
+
+def get_cache_stats():
+    """{имя: {исход: количество}} по всем воркерам (без Redis — по процессу)."""
+    stats = {}
+    for field, count in _stats.read().items():
+        name, _, outcome = field.rpartition("|")
+        stats.setdefault(name, {})[outcome] = count
+    return stats
+
+
+def reset_cache_stats():
+    _stats.reset()
+
+
+def _compute(key, default, version, timeout, locked):
+    started = time.time()
+    try:
+        value = default() if callable(default) else default
+        delta = time.time() - started
+        # Запись живёт дольше срока на окно stale-while-revalidate
+        cache.set(
+            key,
+            (value, version, started + delta + timeout, delta),
+            timeout + settings.TAGGED_CACHE_STALE_TIMEOUT,
+        )
+        return value
+    finally:
+        if locked:
+            cache.delete(LOCK_PREFIX + key)
+
+
+def _acquire(key):
+    return cache.add(LOCK_PREFIX + key, 1, LOCK_TIMEOUT)
+
+
+def _count(name, outcome):
+    _stats.incr(f"{name}|{outcome}")
+
+
+def invalidate_tags(*tags):
+    """
+    Сдвигает поколения тегов — все записи с этими тегами становятся
+    недостижимы за O(число тегов), без KEYS/SCAN; старые истекут по TTL.
+    На Redis — один pipeline: SET NX time_ns + INCR на тег (и PUBLISH
+    для локальных кэшей процессов, если backend — TwoTierRedisCache).
+    """
+    if not tags:
+        return
+    redis = get_redis_connection()
+    if redis is not None:
+        pipe = redis.pipeline(transaction=False)
+        raw_keys = [cache.make_key(GENERATION_PREFIX + tag) for tag in tags]
+        for raw_key in raw_keys:
+            pipe.set(raw_key, time.time_ns(), nx=True)
+            pipe.incr(raw_key)
+        publish = getattr(cache, "publish_invalidation", None)
+        if publish is not None:
+            publish(raw_keys, pipe)
+        pipe.execute()
+        return
+    for tag in tags:
+        key = GENERATION_PREFIX + tag
+        cache.add(key, time.time_ns(), timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Ключ вытеснили между add и incr — новое поколение выдаст чтение
+            pass
+
+
+def invalidate_tags_on_commit(*tags):
+    """
+    invalidate_tags сразу и ещё раз после commit: иначе параллельный
+    читатель успевает закэшировать незакоммиченное состояние под новым
+    поколением до конца TTL.
+    """
+    invalidate_tags(*tags)
+    if connection.in_atomic_block:
+        transaction.on_commit(lambda: invalidate_tags(*tags))
+
+
+__all__ = [
+    "get_tag_generations",
+    "tags_version",
+    "tagged_key",
+    "get_or_set_tagged",
+    "get_cache_stats",
+    "reset_cache_stats",
+    "invalidate_tags",
+    "invalidate_tags_on_commit",
+]
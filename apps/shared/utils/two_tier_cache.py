@@ -0,0 +1,285 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django_redis.cache import RedisCache
+from redis.exceptions import RedisError
+
+from .redis import BufferedCounter
+
+logger = logging.getLogger(__name__)
+
+TIER_STATS_KEY = "cache:tier-stats"
+# Блокировки и сессии всегда читаются из Redis
+DEFAULT_L1_EXCLUDE_PREFIXES = ("tag-lock:", "django.contrib.sessions")
+
+_tiers = {}
+_tiers_lock = threading.Lock()
+
+
+class LocalTier:
+    """
+    LRU процесса (L1): сырые байты из Redis с коротким TTL и поток,
+    подписанный на канал инвалидации. Пока подписка не подтверждена,
+    L1 не используется — иначе можно пропустить инвалидацию.
+    """
+
+    def __init__(self, get_client, channel, max_entries, timeout, max_value_size):
+        self.get_client = get_client
+        self.channel = channel
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.max_value_size = max_value_size
+        self.node = uuid.uuid4().hex
+        self.stats = BufferedCounter(
+            TIER_STATS_KEY, connection=lambda: get_client(write=True)
+        )
+        self.listening = threading.Event()
+        # Растёт при каждой инвалидации: значение, прочитанное из Redis
+        # до неё, в L1 уже не кладётся
+        self.epoch = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        threading.Thread(
+            target=self._listen, name="cache-l1-invalidation", daemon=True
+        ).start()
+
+    def get(self, key):
+        if not self.listening.is_set():
+            return None
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            if item[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return item[1]
+
+    def put(self, key, raw, epoch):
+        if len(raw) > self.max_value_size or not self.listening.is_set():
+            return
+        with self._lock:
+            if epoch != self.epoch:
+                return
+            self._entries[key] = (time.monotonic() + self.timeout, raw)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, keys):
+        with self._lock:
+            self.epoch += 1
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+
+    def message(self, keys):
+        """Сообщение для канала: id процесса-отправителя и ключи ("*" — все)."""
+        return "\n".join([self.node, *keys])
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.get_client(write=True).pubsub()
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    if message["type"] == "subscribe":
+                        # Пока были отписаны, инвалидации могли пройти мимо
+                        self.clear()
+                        self.listening.set()
+                    elif message["type"] == "message":
+                        self._receive(message["data"])
+            except RedisError:
+                logger.warning("L1 cache invalidation channel is down", exc_info=True)
+            self.listening.clear()
+            self.clear()
+            time.sleep(1)
+
+    def _receive(self, data):
+        node, *keys = data.decode().split("\n")
+        if node == self.node:
+            return
+        if keys == ["*"]:
+            self.clear()
+        else:
+            self.evict(keys)
+
+
+class TwoTierRedisCache(RedisCache):
+    """
+    django-redis с L1 — LRU в памяти процесса — перед Redis (L2): горячие
+    ключи (поколения тегов, Track.stats, топы) читаются без round trip.
+
+    Запись через этот backend удаляет ключ из своего L1 и публикует его
+    в канал L1_CHANNEL; остальные процессы удаляют его у себя. Если
+    сообщение потерялось, устаревание ограничено L1_TIMEOUT секунд.
+
+    OPTIONS: L1_MAX_ENTRIES (1000), L1_TIMEOUT (5), L1_MAX_VALUE_SIZE
+    (64 КиБ), L1_EXCLUDE_PREFIXES, L1_CHANNEL. Hit/miss по уровням —
+    get_tier_stats().
+    """
+
+    def __init__(self, server, params):
+        super().__init__(server, params)
+        options = params.get("OPTIONS", {})
+        self._l1_options = (
+            int(options.get("L1_MAX_ENTRIES", 1000)),
+            float(options.get("L1_TIMEOUT", 5)),
+            int(options.get("L1_MAX_VALUE_SIZE", 64 * 1024)),
+        )
+        self._l1_exclude = tuple(
+            options.get("L1_EXCLUDE_PREFIXES", DEFAULT_L1_EXCLUDE_PREFIXES)
+        )
+        self._channel = options.get("L1_CHANNEL", f"{self.key_prefix}:l1-invalidate")
+
+    @property
+    def tier(self):
+        """L1 текущего процесса; backend создаётся на поток, L1 — общий."""
+        key = (os.getpid(), self._server, self._channel)
+        tier = _tiers.get(key)
+        if tier is None:
+            with _tiers_lock:
+                tier = _tiers.get(key)
+                if tier is None:
+                    tier = _tiers[key] = LocalTier(
+                        self.client.get_client, self._channel, *self._l1_options
+                    )
+        return tier
+
+    def get(self, key, default=None, version=None, client=None):
+        if client is not None or key.startswith(self._l1_exclude):
+            return super().get(key, default, version, client)
+        return self.get_many([key], version).get(key, default)
+
+    def get_many(self, keys, version=None, client=None):
+        if client is not None:
+            return super().get_many(keys, version, client)
+        tier = self.tier
+        found, missing = {}, {}
+        for key in keys:
+            raw_key = self.make_key(key, version)
+            raw = None if key.startswith(self._l1_exclude) else tier.get(raw_key)
+            if raw is None:
+                missing[raw_key] = key
+            else:
+                found[key] = self.client.decode(raw)
+        l1_hits = len(found)
+        tier.stats.incr("l1|hit", l1_hits)
+        tier.stats.incr("l1|miss", len(missing))
+        if not missing:
+            return found
+
+        epoch = tier.epoch
+        try:
+            values = self.client.get_client(write=False).mget(list(missing))
+        except RedisError:
+            # Ошибку обработает django-redis (IGNORE_EXCEPTIONS и т. п.)
+            return {**found, **super().get_many(list(missing.values()), version)}
+        for raw_key, raw in zip(missing, values):
+            if raw is None:
+                continue
+            key = missing[raw_key]
+            found[key] = self.client.decode(raw)
+            if not key.startswith(self._l1_exclude):
+                tier.put(raw_key, raw, epoch)
+        tier.stats.incr("l2|hit", len(found) - l1_hits)
+        tier.stats.incr("l2|miss", len(missing) - len(found) + l1_hits)
+        return found
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().set(key, value, timeout, version, **kwargs)
+        self._invalidate([key], version)
+        return result
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        added = super().add(key, value, timeout, version, **kwargs)
+        if added:
+            self._invalidate([key], version)
+        return added
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None, **kwargs):
+        result = super().set_many(data, timeout, version, **kwargs)
+        self._invalidate(list(data), version)
+        return result
+
+    def delete(self, key, version=None, **kwargs):
+        result = super().delete(key, version, **kwargs)
+        self._invalidate([key], version)
+        return result
+
+    def delete_many(self, keys, version=None, **kwargs):
+        result = super().delete_many(keys, version, **kwargs)
+        self._invalidate(list(keys), version)
+        return result
+
+    def incr(self, key, delta=1, version=None, **kwargs):
+        result = super().incr(key, delta, version, **kwargs)
+        self._invalidate([key], version)
+        return result
+
+    def decr(self, key, delta=1, version=None, **kwargs):
+        result = super().decr(key, delta, version, **kwargs)
+        self._invalidate([key], version)
+        return result
+
+    def delete_pattern(self, *args, **kwargs):
+        result = super().delete_pattern(*args, **kwargs)
+        self.publish_invalidation(["*"])
+        return result
+
+    def clear(self):
+        result = super().clear()
+        self.publish_invalidation(["*"])
+        return result
+
+    def publish_invalidation(self, raw_keys, pipeline=None):
+        """
+        Удаляет ключи (уже через make_key) из L1 этого процесса и рассылает
+        остальным. pipeline — добавить PUBLISH в чужой pipeline Redis.
+        """
+        tier = self.tier
+        if raw_keys == ["*"]:
+            tier.clear()
+        else:
+            tier.evict(raw_keys)
+        message = tier.message(raw_keys)
+        if pipeline is not None:
+            pipeline.publish(self._channel, message)
+            return
+        try:
+            self.client.get_client(write=True).publish(self._channel, message)
+        except RedisError:
+            logger.warning("Failed to publish L1 cache invalidation", exc_info=True)
+
+    def get_tier_stats(self):
+        """{"l1": {"hit": ..., "miss": ...}, "l2": {...}} по всем процессам."""
+        stats = {}
+        for field, count in self.tier.stats.read().items():
+            tier, _, outcome = field.partition("|")
+            stats.setdefault(tier, {})[outcome] = count
+        return stats
+
+    def reset_tier_stats(self):
+        self.tier.stats.reset()
+
+    def _invalidate(self, keys, version):
+        raw_keys = [
+            self.make_key(key, version)
+            for key in keys
+            if not key.startswith(self._l1_exclude)
+        ]
+        if raw_keys:
+            self.publish_invalidation(raw_keys)
+
+
+__all__ = ["LocalTier", "TwoTierRedisCache"]
@@ -0,0 +1,60 @@
+import struct
+
+import numpy as np
+
+# Формат .dat audiowaveform (BBC) версии 1 — его читают waveform-data.js и peaks.js
+DAT_VERSION = 1
+DAT_FLAG_8_BIT = 0x1
+DAT_HEADER = struct.Struct("<iIiiI")
+
+
+def compute_peaks(samples, buckets, bits=8):
+    """
+    Пары (min, max) по окнам моно-сигнала int16: не больше buckets
+    окон по samples_per_pixel сэмплов. -> (массив min/max вперемешку, окно).
+    bits=8 — значения сдвигаются в int8: вдвое меньше байт, для рисования хватает.
+    """
+    samples = np.asarray(samples, dtype=np.int16)
+    if not len(samples):
+        return np.zeros(0, dtype=np.int8 if bits == 8 else np.int16), 1
+    samples_per_pixel = -(-len(samples) // buckets)
+    # Последнее окно дополняется последним сэмплом: он не сдвигает его min/max
+    padded = np.full(
+        -(-len(samples) // samples_per_pixel) * samples_per_pixel, samples[-1]
+    )
+    padded[: len(samples)] = samples
+    windows = padded.reshape(-1, samples_per_pixel)
+    peaks = np.empty((len(windows), 2), dtype=np.int16)
+    np.min(windows, axis=1, out=peaks[:, 0])
+    np.max(windows, axis=1, out=peaks[:, 1])
+    if bits == 8:
+        peaks = (peaks >> 8).astype(np.int8)
+    return peaks.reshape(-1), samples_per_pixel
+
+
+def encode_waveform(peaks, sample_rate, samples_per_pixel):
+    """Заголовок .dat и пары min/max little-endian."""
+    bits = 8 if peaks.dtype == np.int8 else 16
+    header = DAT_HEADER.pack(
+        DAT_VERSION,
+        DAT_FLAG_8_BIT if bits == 8 else 0,
+        sample_rate,
+        samples_per_pixel,
+        len(peaks) // 2,
+    )
+    return header + peaks.astype(peaks.dtype.newbyteorder("<")).tobytes()
+
+
+def decode_waveform(data):
+    """.dat -> (sample_rate, samples_per_pixel, массив min/max вперемешку)."""
+    version, flags, sample_rate, samples_per_pixel, length = DAT_HEADER.unpack_from(
+        data
+    )
+    if version != DAT_VERSION:
+        raise ValueError(f"Unsupported waveform version {version}")
+    dtype = np.dtype("<i1") if flags & DAT_FLAG_8_BIT else np.dtype("<i2")
+    peaks = np.frombuffer(data, dtype=dtype, count=length * 2, offset=DAT_HEADER.size)
+    return sample_rate, samples_per_pixel, peaks
+
+
+__all__ = ["compute_peaks", "encode_waveform", "decode_waveform"]
@@ -0,0 +1,121 @@
+import hashlib
+from functools import partial
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils import translation
+from django.utils.http import http_date
+
+from apps.shared.utils.signed_media import signed_urls_changed_at
+from apps.shared.utils.tagged_cache import get_or_set_tagged
+
+
+class ConditionalGetMixin:
+    """
+    Conditional GET для list/retrieve viewset'а: ETag и Last-Modified
+    считаются без сериализации — COUNT и MAX(updated_at) по querysets из
+    get_validator_querysets(), — и на совпавший If-None-Match /
+    If-Modified-Since отдаётся 304 без тела.
+
+    Валидатор кэшируется по URL (и пользователю, если vary_on_user)
+    с тегами validator_tags: правки каталога сбрасывают его сразу,
+    а CONDITIONAL_GET_TIMEOUT ограничивает отставание write-behind счётчиков.
+    Смена срока подписанных медиа-URL тоже меняет валидатор — иначе
+    клиент получит 304 и останется с истёкшими ссылками.
+    """
+
+    vary_on_user = False
+    validator_tags = ()
+
+    def get_validator_querysets(self):
+        """Querysets, изменение которых меняет ответ; по умолчанию — сам список/объект."""
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == "list":
+            return [queryset]
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return [queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})]
+
+    def get_validator_tags(self):
+        """Теги кэша, bump которых сбрасывает валидатор."""
+        return list(self.validator_tags)
+
+    def get_validators(self):
+        """(ETag, Last-Modified) ответа из кэша или свежим расчётом."""
+        user = self.request.user
+        signed_at = signed_urls_changed_at()
+        key = "conditional:{}:{}:{}:{}".format(
+            self.basename,
+            user.pk if self.vary_on_user and user.is_authenticated else "-",
+            request_fingerprint(self.request),
+            int(signed_at.timestamp()) if signed_at else "-",
+        )
+
+        def compute():
+            states = [_state(queryset) for queryset in self.get_validator_querysets()]
+            digest = hashlib.md5(repr((key, states)).encode()).hexdigest()
+            changes = [last for _, last in states if last]
+            last_modified = max(
+                [*changes, signed_at] if signed_at else changes, default=None
+            )
+            return f'W/"{digest}"', last_modified
+
+        return get_or_set_tagged(
+            key,
+            compute,
+            tags=self.get_validator_tags(),
+            timeout=settings.CONDITIONAL_GET_TIMEOUT,
+            name=f"conditional:{self.basename}",
+        )
+
+    def conditional_response(self, request, render):
+        """Ответ render() или 304, если у клиента актуальная версия."""
+        etag, last_modified = self.get_validators()
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = render()
+        if response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+            if timestamp is not None:
+                response.headers.setdefault("Last-Modified", http_date(timestamp))
+            if self.vary_on_user:
+                patch_vary_headers(response, ["Authorization"])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, partial(super().list, request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            request, partial(super().retrieve, request, *args, **kwargs)
+        )
+
+
+def request_fingerprint(request):
+    """
+    md5 пути, query-параметров (отсортированы, пустые отброшены)
+    и активного языка: ?a=1&b= и ?b=&a=1 — один и тот же ответ.
+    """
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+        if value != ""
+    )
+    raw = "|".join([request.path, urlencode(params), translation.get_language() or ""])
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _state(queryset):
+    """(число строк, последнее изменение) queryset одним агрегатом."""
+    model = queryset.model
+    field = "updated_at" if hasattr(model, "updated_at") else "created_at"
+    state = queryset.order_by().aggregate(count=Count("pk"), last=Max(field))
+    return state["count"], state["last"]
+
+
+__all__ = ["ConditionalGetMixin", "request_fingerprint"]
@@ -0,0 +1,138 @@
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date
+
+from apps.shared.utils.signed_media import is_signed_media, verify_media_signature
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+CHUNK_SIZE = 64 * 1024
+
+
+def media_response(request, name, storage=None, content_type=None):
+    """
+    Ответ с файлом name из storage после проверок доступа во view.
+
+    MEDIA_ACCEL_REDIRECT — тело отдаёт nginx (X-Accel-Redirect во
+    internal location MEDIA_ACCEL_PREFIX), вместе с Range и sendfile;
+    воркер освобождается сразу. Иначе — Range-ответ из Django (dev).
+    """
+    storage = storage or default_storage
+    content_type = content_type or (
+        mimetypes.guess_type(name)[0] or "application/octet-stream"
+    )
+    if settings.MEDIA_ACCEL_REDIRECT:
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_PREFIX + quote(name)
+    else:
+        response = ranged_file_response(request, storage, name, content_type)
+    patch_cache_control(response, private=True, max_age=settings.MEDIA_STREAM_MAX_AGE)
+    return response
+
+
+def playlist_response(text, max_age=None):
+    """HLS-плейлист (m3u8); private — в нём подписанные URL пользователя."""
+    response = HttpResponse(text, content_type="application/vnd.apple.mpegurl")
+    if max_age is None:
+        max_age = settings.MEDIA_STREAM_MAX_AGE
+    patch_cache_control(response, private=True, max_age=max_age)
+    return response
+
+
+def ranged_file_response(request, storage, name, content_type):
+    """
+    Файл целиком (200) или один диапазон из заголовка Range (206, 416).
+    Несколько диапазонов и устаревший If-Range — весь файл, как разрешает RFC 9110.
+    """
+    try:
+        size = storage.size(name)
+        modified = int(storage.get_modified_time(name).timestamp())
+    except (FileNotFoundError, NotImplementedError):
+        raise Http404("File not found")
+    last_modified = http_date(modified)
+    etag = f'"{modified:x}-{size:x}"'
+
+    byte_range = None
+    header = request.headers.get("Range")
+    if_range = request.headers.get("If-Range")
+    if header and (if_range is None or if_range in (etag, last_modified)):
+        try:
+            byte_range = _parse_range(header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    file = storage.open(name, "rb")
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+        response["Content-Length"] = size
+    else:
+        start, end = byte_range
+        response = StreamingHttpResponse(
+            _read_range(file, start, end - start + 1),
+            status=206,
+            content_type=content_type,
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = end - start + 1
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    return response
+
+
+def serve(request, path, document_root=None):
+    """
+    django.views.static.serve с Range (перемотка в плеере на dev-сервере)
+    и проверкой подписанных URL, как у nginx secure_link.
+    """
+    storage = FileSystemStorage(location=document_root)
+    if not path or not os.path.isfile(storage.path(path)):
+        raise Http404("File not found")
+    if is_signed_media(path):
+        denied = verify_media_signature(request.path, request.GET)
+        if denied:
+            return HttpResponse(status=denied)
+    content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    return ranged_file_response(request, storage, path, content_type)
+
+
+def _parse_range(header, size):
+    """(start, end) включительно; None — отдать весь файл; ValueError — 416."""
+    match = RANGE_RE.match(header.strip())
+    if match is None:
+        # Несколько диапазонов или другие единицы
+        return None
+    start, end = match.groups()
+    if size == 0:
+        raise ValueError(header)
+    if not start:
+        if not end or int(end) == 0:
+            raise ValueError(header)
+        return max(size - int(end), 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _read_range(file, start, length):
+    with file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+__all__ = ["media_response", "playlist_response", "ranged_file_response", "serve"]
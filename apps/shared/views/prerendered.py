@@ -0,0 +1,99 @@
+import json
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from apps.shared.utils.lean import dumps
+
+
+class PreRenderedResponse(Response):
+    """
+    JSON-ответ, в котором список items_key собран из готовых байтов
+    элементов: JSONRenderer рендерит только обёртку (next/previous и т. п.).
+    """
+
+    def __init__(self, data, items, items_key="results", **kwargs):
+        self.items = items
+        self.items_key = items_key
+        self._parsed = None
+        super().__init__(data, **kwargs)
+
+    @property
+    def data(self):
+        """Полный ответ, разобранный из байтов, — для тестов и отладки."""
+        if self._parsed is None:
+            self._parsed = json.loads(self.rendered_content)
+        return self._parsed
+
+    @data.setter
+    def data(self, envelope):
+        self.envelope = envelope
+
+    @property
+    def rendered_content(self):
+        renderer = JSONRenderer()
+        parts = [
+            b"%s:%s"
+            % (
+                renderer.render(key),
+                (
+                    b"[%s]" % b",".join(self.items)
+                    if key == self.items_key
+                    # render(None) даёт пустое тело, а не null
+                    else renderer.render(value)
+                    if value is not None
+                    else b"null"
+                ),
+            )
+            for key, value in self.envelope.items()
+        ]
+        self["Content-Type"] = renderer.media_type
+        return b"{%s}" % b",".join(parts)
+
+
+class FragmentListMixin:
+    """
+    list из готовых JSON-фрагментов элементов страницы: сериализатор
+    не вызывается. Viewset реализует get_list_fragments(page) -> [bytes]
+    и, если нужно, get_fragment_queryset(queryset) — лёгкий queryset
+    только для пагинации. use_list_fragments() = False — обычный list.
+    """
+
+    def use_list_fragments(self):
+        return True
+
+    def get_fragment_queryset(self, queryset):
+        return queryset
+
+    def get_list_fragments(self, page):
+        raise NotImplementedError
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_list_fragments():
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(self.get_fragment_queryset(queryset))
+        if page is None:
+            return super().list(request, *args, **kwargs)
+        envelope = self.get_paginated_response([]).data
+        return PreRenderedResponse(envelope, self.get_list_fragments(page))
+
+
+class LeanListMixin(FragmentListMixin):
+    """
+    list через lean_serializer_class (LeanSerializer): страница читается
+    через .values(), без экземпляров моделей и ModelSerializer. Вывод
+    совпадает с serializer_class — его используют остальные действия и схема.
+    """
+
+    lean_serializer_class = None
+
+    def get_fragment_queryset(self, queryset):
+        return self.lean_serializer_class.values(queryset)
+
+    def get_list_fragments(self, page):
+        serializer = self.lean_serializer_class(self.get_serializer_context())
+        return [dumps(item) for item in serializer.represent(page)]
+
+
+__all__ = ["PreRenderedResponse", "FragmentListMixin", "LeanListMixin"]
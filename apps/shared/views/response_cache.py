@@ -0,0 +1,82 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+from apps.shared.utils.tagged_cache import tagged_key
+
+from .conditional import request_fingerprint
+
+
+class AnonymousResponseCacheMixin:
+    """
+    Кэш готовых JSON-ответов list/retrieve для анонимных GET/HEAD.
+
+    Ключ — путь, нормализованные query-параметры (отсортированы, пустые
+    отброшены) и активный язык из Accept-Language. В кэше лежат уже
+    отрендеренные байты, поэтому попадание не трогает ни БД, ни сериализаторы.
+    Записи живут под тегами response_cache_tags (по умолчанию validator_tags
+    conditional GET) и сбрасываются сигналами моделей; RESPONSE_CACHE_TIMEOUT
+    ограничивает отставание write-behind счётчиков. Авторизованные запросы
+    идут мимо кэша: в них есть персональные поля.
+    """
+
+    response_cache_tags = None
+
+    def get_response_cache_tags(self):
+        tags = self.response_cache_tags
+        if tags is None:
+            tags = getattr(self, "validator_tags", ())
+        return list(tags)
+
+    def get_response_cache_key(self, request):
+        return f"response:{self.basename}:{request_fingerprint(request)}"
+
+    def cached_response(self, request, render):
+        """Ответ из кэша или render(), сохранённый в кэш при 200."""
+        if request.method not in ("GET", "HEAD") or request.user.is_authenticated:
+            return render()
+
+        key = tagged_key(
+            self.get_response_cache_key(request), self.get_response_cache_tags()
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response["X-Cache"] = "HIT"
+        else:
+            response = render()
+            if response.status_code == 200:
+                _render(self, request, response)
+                cache.set(
+                    key,
+                    (response.content, response["Content-Type"]),
+                    settings.RESPONSE_CACHE_TIMEOUT,
+                )
+            response["X-Cache"] = "MISS"
+        patch_vary_headers(response, ["Accept-Language", "Authorization"])
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, partial(super().list, request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, partial(super().retrieve, request, *args, **kwargs)
+        )
+
+
+def _render(view, request, response):
+    """Рендер DRF Response до finalize_response — как это сделал бы сам DRF."""
+    response.accepted_renderer = request.accepted_renderer
+    response.accepted_media_type = request.accepted_media_type
+    response.renderer_context = view.get_renderer_context()
+    response.render()
+
+
+__all__ = ["AnonymousResponseCacheMixin"]
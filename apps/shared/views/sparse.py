@@ -0,0 +1,160 @@
+from django.core.exceptions import FieldDoesNotExist
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+
+from apps.shared.utils.sparse import SparseFieldset, is_nested
+
+SPARSE_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        str,
+        description="Comma-separated fields to return, nested via dot: name,album.name",
+    ),
+    OpenApiParameter(
+        "include",
+        str,
+        description="Comma-separated nested objects to expand: albums,albums.tracks",
+    ),
+]
+
+# Полный набор полей сериализатора по классу: {путь: поле}
+_field_trees = {}
+
+
+class SparseFieldsetMixin:
+    """
+    ?fields= и ?include= для list/retrieve: сериализатор (с
+    SparseFieldsSerializerMixin) отдаёт только запрошенное, а queryset
+    сужается под ответ — select_related/prefetch_related только для
+    оставшихся вложенных объектов и only() по столбцам оставшихся полей.
+
+    sparse_relations: {путь вложенного объекта: lookup} — должен
+    перечислять все select_related/prefetch_related из get_queryset,
+    при сужении они собираются заново. sparse_required_fields — столбцы,
+    которые нужны помимо полей ответа.
+    """
+
+    sparse_actions = ("list", "retrieve")
+    sparse_relations = {}
+    sparse_required_fields = ()
+
+    def get_sparse_fieldset(self):
+        if not hasattr(self, "_sparse_fieldset"):
+            request = getattr(self, "request", None)
+            if (
+                request is None
+                or getattr(self, "action", None) not in self.sparse_actions
+            ):
+                fieldset = SparseFieldset()
+            else:
+                fieldset = SparseFieldset.from_request(request)
+                if fieldset:
+                    self._validate_fieldset(fieldset)
+            self._sparse_fieldset = fieldset
+        return self._sparse_fieldset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["sparse_fieldset"] = self.get_sparse_fieldset()
+        return context
+
+    def filter_queryset(self, queryset):
+        # После фильтров: only() должен сохранить поля сортировки
+        queryset = super().filter_queryset(queryset)
+        fieldset = self.get_sparse_fieldset()
+        if not fieldset:
+            return queryset
+        return self.narrow_queryset(queryset, fieldset)
+
+    def narrow_queryset(self, queryset, fieldset):
+        tree = self.get_sparse_field_tree()
+        kept = {path for path in tree if _kept(fieldset, tree, path)}
+        model = queryset.model
+
+        queryset = queryset.select_related(None).prefetch_related(None)
+        columns = {model._meta.pk.name, *self.sparse_required_fields}
+        for path, lookup in self.sparse_relations.items():
+            if path not in kept:
+                continue
+            if _is_single(model, lookup):
+                queryset = queryset.select_related(lookup)
+                columns.add(lookup.split("__")[0])
+            else:
+                queryset = queryset.prefetch_related(lookup)
+
+        if fieldset.fields is None:
+            return queryset
+        for path in kept:
+            # source="*" (SerializerMethodField и т. п.) столбцов не читает
+            if "." not in path and tree[path].source_attrs:
+                columns.add(tree[path].source_attrs[0])
+        for ordering in queryset.query.order_by:
+            if isinstance(ordering, str):
+                columns.add(ordering.lstrip("-").split("__")[0])
+        columns = [name for name in columns if _is_column(model, name)]
+        return queryset.only(*columns)
+
+    def get_sparse_field_tree(self):
+        serializer_class = self.get_serializer_class()
+        if serializer_class not in _field_trees:
+            _field_trees[serializer_class] = _field_tree(serializer_class(context={}))
+        return _field_trees[serializer_class]
+
+    def _validate_fieldset(self, fieldset):
+        tree = self.get_sparse_field_tree()
+        errors = {}
+        unknown = sorted(path for path in fieldset.fields or () if path not in tree)
+        if unknown:
+            errors["fields"] = [f"Unknown field: {path}" for path in unknown]
+        unknown = sorted(
+            path
+            for path in fieldset.include or ()
+            if path not in tree or not is_nested(tree[path])
+        )
+        if unknown:
+            errors["include"] = [f"Unknown nested object: {path}" for path in unknown]
+        if errors:
+            raise ValidationError(errors)
+
+
+def _field_tree(serializer, prefix=""):
+    tree = {}
+    for name, field in serializer.fields.items():
+        tree[prefix + name] = field
+        if is_nested(field):
+            tree.update(_field_tree(getattr(field, "child", field), f"{prefix}{name}."))
+    return tree
+
+
+def _kept(fieldset, tree, path):
+    """Поле и все его родители остаются в ответе."""
+    parts = path.split(".")
+    for i in range(1, len(parts) + 1):
+        current = ".".join(parts[:i])
+        if not fieldset.keep(current, is_nested(tree[current])):
+            return False
+    return True
+
+
+def _is_single(model, lookup):
+    """lookup идёт только по прямым FK/OneToOne — годится для select_related."""
+    for name in lookup.split("__"):
+        field = model._meta.get_field(name)
+        if not (field.concrete and (field.many_to_one or field.one_to_one)):
+            return False
+        model = field.related_model
+    return True
+
+
+def _is_column(model, name):
+    if name == "pk":
+        return True
+    try:
+        field = model._meta.get_field(name)
+    except FieldDoesNotExist:
+        # Аннотации, SerializerMethodField, свойства модели
+        return False
+    return field.concrete and not field.many_to_many
+
+
+__all__ = ["SparseFieldsetMixin", "SPARSE_PARAMETERS"]
@@ -1,6 +1,8 @@
 from .apps import *  # noqa
 
 # from .cache import *  # noqa
+from .celery import *  # noqa
+
 # from .ckeditor5 import *  # noqa
 from .jwt import *  # noqa
 
@@ -10,3 +12,4 @@ from .unfold import *  # noqa
 from .unfold_navigation import *  # noqa
 from .google import *  # noqa
 from .mail import *  # noqa
+from .musics import *  # noqa
@@ -1,12 +1,22 @@
 import os
 
 # Redis Cache Configuration
+# CACHE_L1=1 — локальный LRU в каждом процессе перед Redis (инвалидация через pub/sub).
+# Включается явно: до прихода инвалидации процесс может отдать устаревшее значение
+CACHE_L1 = os.getenv("CACHE_L1", "0") == "1"
+
 CACHES = {
     "default": {
-        "BACKEND": "django_redis.cache.RedisCache",
+        "BACKEND": (
+            "apps.shared.utils.two_tier_cache.TwoTierRedisCache"
+            if CACHE_L1
+            else "django_redis.cache.RedisCache"
+        ),
         "LOCATION": os.getenv("REDIS_CACHE_URL", "redis://redis:6379/1"),
         "OPTIONS": {
             "CLIENT_CLASS": "django_redis.client.DefaultClient",
+            "L1_MAX_ENTRIES": int(os.getenv("CACHE_L1_MAX_ENTRIES", 1000)),
+            "L1_TIMEOUT": float(os.getenv("CACHE_L1_TIMEOUT", 5)),
         },
         "KEY_PREFIX": "core",
     }
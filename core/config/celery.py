@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from celery.schedules import crontab
+
+CELERY_BEAT_SCHEDULE = {
+    "flush-play-counters": {
+        "task": "apps.musics.tasks.counters.flush_play_counters",
+        "schedule": timedelta(seconds=10),
+    },
+    "ingest-listening-events": {
+        "task": "apps.musics.tasks.events.ingest_listening_events",
+        "schedule": timedelta(seconds=5),
+    },
+    "maintain-listening-partitions": {
+        "task": "apps.musics.tasks.partitions.maintain_listening_partitions",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    "update-track-similarities": {
+        "task": "apps.musics.tasks.similarity.update_track_similarities",
+        "schedule": crontab(minute=15),
+    },
+    "rebuild-track-similarities": {
+        "task": "apps.musics.tasks.similarity.rebuild_track_similarities",
+        "schedule": crontab(hour=5, minute=0, day_of_week="sunday"),
+    },
+    "train-recommendations": {
+        "task": "apps.musics.tasks.recommendations.train_recommendations",
+        "schedule": crontab(hour=2, minute=0),
+    },
+    "rollup-track-plays": {
+        "task": "apps.musics.tasks.charts.rollup_track_plays",
+        "schedule": crontab(minute=5),
+    },
+    "build-daily-charts": {
+        "task": "apps.musics.tasks.charts.build_daily_charts",
+        "schedule": crontab(hour=0, minute=20),
+    },
+    "reconcile-aggregate-counters": {
+        "task": "apps.musics.tasks.counters.reconcile_aggregate_counters",
+        "schedule": crontab(hour=4, minute=30),
+    },
+    "purge-old-counter-flushes": {
+        "task": "apps.musics.tasks.counters.purge_old_counter_flushes",
+        "schedule": crontab(hour=4, minute=0),
+    },
+}
+
+# Обработка аудио — в своей очереди и на своём воркере (--concurrency, prefetch 1),
+# чтобы ffmpeg и разбор файлов не задерживали письма и периодические задачи
+CELERY_TASK_ROUTES = {
+    "apps.musics.tasks.transcoding.*": {"queue": "transcoding"},
+    "apps.musics.tasks.metadata.*": {"queue": "transcoding"},
+    "apps.musics.tasks.waveforms.*": {"queue": "transcoding"},
+}
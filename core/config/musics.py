@@ -0,0 +1,119 @@
+import os
+
+# История прослушиваний (ListeningEvent)
+LISTENING_HISTORY_DAYS = int(os.getenv("LISTENING_HISTORY_DAYS", 90))
+LISTENING_PARTITIONS_AHEAD = int(os.getenv("LISTENING_PARTITIONS_AHEAD", 3))
+LISTENING_RETENTION_MONTHS = int(os.getenv("LISTENING_RETENTION_MONTHS", 24))
+
+# Очередь событий прослушивания (Redis stream -> ListeningEvent)
+# Аварийный потолок длины stream: обрезка выбрасывает непрочитанные события,
+# поэтому по умолчанию (0) её нет, а об очереди предупреждает BACKLOG_WARNING
+LISTENING_EVENTS_STREAM_MAXLEN = int(os.getenv("LISTENING_EVENTS_STREAM_MAXLEN", 0))
+LISTENING_EVENTS_BATCH_SIZE = int(os.getenv("LISTENING_EVENTS_BATCH_SIZE", 5000))
+LISTENING_EVENTS_MAX_BATCHES = int(os.getenv("LISTENING_EVENTS_MAX_BATCHES", 20))
+LISTENING_EVENTS_BACKLOG_WARNING = int(
+    os.getenv("LISTENING_EVENTS_BACKLOG_WARNING", 100_000)
+)
+LISTENING_EVENTS_LOCAL_BUFFER_SIZE = int(
+    os.getenv("LISTENING_EVENTS_LOCAL_BUFFER_SIZE", 500)
+)
+LISTENING_EVENTS_LOCAL_FLUSH_INTERVAL = int(
+    os.getenv("LISTENING_EVENTS_LOCAL_FLUSH_INTERVAL", 5)
+)
+
+# Поиск по каталогу (PostgreSQL FTS + pg_trgm)
+SEARCH_CONFIG = os.getenv("SEARCH_CONFIG", "simple")
+SEARCH_POPULARITY_WEIGHT = float(os.getenv("SEARCH_POPULARITY_WEIGHT", 0.05))
+SEARCH_RESULTS_LIMIT = int(os.getenv("SEARCH_RESULTS_LIMIT", 10))
+
+# Похожие треки по совместным прослушиваниям
+SIMILAR_TRACKS_TOP_K = int(os.getenv("SIMILAR_TRACKS_TOP_K", 50))
+SIMILAR_TRACKS_WINDOW_DAYS = int(os.getenv("SIMILAR_TRACKS_WINDOW_DAYS", 180))
+SIMILAR_TRACKS_MIN_COMMON = int(os.getenv("SIMILAR_TRACKS_MIN_COMMON", 2))
+SIMILAR_TRACKS_LIMIT = int(os.getenv("SIMILAR_TRACKS_LIMIT", 10))
+
+# Персональные рекомендации (implicit ALS)
+RECOMMENDATIONS_DIR = os.getenv(
+    "RECOMMENDATIONS_DIR",
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "var", "recommendations")
+    ),
+)
+RECOMMENDATIONS_WINDOW_DAYS = int(os.getenv("RECOMMENDATIONS_WINDOW_DAYS", 180))
+RECOMMENDATIONS_FACTORS = int(os.getenv("RECOMMENDATIONS_FACTORS", 64))
+RECOMMENDATIONS_ITERATIONS = int(os.getenv("RECOMMENDATIONS_ITERATIONS", 10))
+RECOMMENDATIONS_REGULARIZATION = float(
+    os.getenv("RECOMMENDATIONS_REGULARIZATION", 0.05)
+)
+RECOMMENDATIONS_ALPHA = float(os.getenv("RECOMMENDATIONS_ALPHA", 20))
+RECOMMENDATIONS_CANDIDATES = int(os.getenv("RECOMMENDATIONS_CANDIDATES", 200))
+RECOMMENDATIONS_LIMIT = int(os.getenv("RECOMMENDATIONS_LIMIT", 20))
+
+# Чарты (недельные/месячные, общий, по жанрам и языкам)
+CHARTS_SIZE = int(os.getenv("CHARTS_SIZE", 100))
+
+# Оценочный count в page-number пагинации: ниже порога — точный COUNT(*)
+PAGINATION_EXACT_COUNT_THRESHOLD = int(
+    os.getenv("PAGINATION_EXACT_COUNT_THRESHOLD", 10_000)
+)
+
+# Conditional GET (ETag / Last-Modified): сколько секунд кэшируется валидатор
+CONDITIONAL_GET_TIMEOUT = int(os.getenv("CONDITIONAL_GET_TIMEOUT", 10))
+
+# Тегированный кэш: записи инвалидируются по тегам, TTL — страховка
+TAGGED_CACHE_TIMEOUT = int(os.getenv("TAGGED_CACHE_TIMEOUT", 60 * 60 * 24))
+
+# Кэш готовых JSON-ответов для анонимных запросов каталога
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 60))
+
+# Сколько после истечения/инвалидации запись ещё можно отдать, пока её пересчитывают
+TAGGED_CACHE_STALE_TIMEOUT = int(os.getenv("TAGGED_CACHE_STALE_TIMEOUT", 300))
+
+# JSON-фрагменты треков для списков: TTL записи (сверяется по updated_at)
+TRACK_FRAGMENT_TIMEOUT = int(os.getenv("TRACK_FRAGMENT_TIMEOUT", 60 * 60 * 24))
+# Сколько треков перерендеривает один запуск refresh_counter_fragments
+TRACK_FRAGMENT_REFRESH_LIMIT = int(os.getenv("TRACK_FRAGMENT_REFRESH_LIMIT", 1000))
+
+# Отдача аудио: X-Accel-Redirect в internal location nginx или Range-ответ из Django
+MEDIA_ACCEL_REDIRECT = os.getenv("MEDIA_ACCEL_REDIRECT", "0") == "1"
+MEDIA_ACCEL_PREFIX = os.getenv("MEDIA_ACCEL_PREFIX", "/protected-media/")
+MEDIA_STREAM_MAX_AGE = int(os.getenv("MEDIA_STREAM_MAX_AGE", 60 * 60))
+
+# Подписанные ссылки на аудио и обложки треков (nginx secure_link); пустой секрет — обычные URL
+MEDIA_SIGNING_SECRET = os.getenv("MEDIA_SIGNING_SECRET", "")
+MEDIA_SIGNED_PREFIXES = [
+    prefix.strip()
+    for prefix in os.getenv("MEDIA_SIGNED_PREFIXES", "tracks/").split(",")
+    if prefix.strip()
+]
+MEDIA_SIGNED_URL_TTL = int(os.getenv("MEDIA_SIGNED_URL_TTL", 60 * 60))
+# Срок подписи округляется вверх до шага: в пределах шага URL не меняются
+MEDIA_SIGNED_URL_STEP = int(os.getenv("MEDIA_SIGNED_URL_STEP", 10 * 60))
+
+# HLS-версии треков: битрейты (kbps), длина сегмента, ffmpeg и лимиты воркера
+TRANSCODING_ENABLED = os.getenv("TRANSCODING_ENABLED", "1") == "1"
+TRANSCODING_BITRATES = [
+    int(bitrate)
+    for bitrate in os.getenv("TRANSCODING_BITRATES", "64,128,256").split(",")
+    if bitrate.strip()
+]
+TRANSCODING_SEGMENT_SECONDS = int(os.getenv("TRANSCODING_SEGMENT_SECONDS", 6))
+TRANSCODING_FFMPEG = os.getenv("TRANSCODING_FFMPEG", "ffmpeg")
+# Потоков ffmpeg на задачу: воркер очереди transcoding × потоки ≈ ядра машины
+TRANSCODING_FFMPEG_THREADS = int(os.getenv("TRANSCODING_FFMPEG_THREADS", 2))
+TRANSCODING_TIMEOUT = int(os.getenv("TRANSCODING_TIMEOUT", 30 * 60))
+TRANSCODING_MAX_RETRIES = int(os.getenv("TRANSCODING_MAX_RETRIES", 5))
+
+# Длительность и битрейт из заголовков загруженного аудио. MP3 без Xing/VBRI
+# до этого размера пересчитывается по кадрам в запросе, крупнее — в фоновой задаче
+AUDIO_METADATA_SCAN_MAX_BYTES = int(
+    os.getenv("AUDIO_METADATA_SCAN_MAX_BYTES", 20 * 1024 * 1024)
+)
+
+# Волна трека: число окон min/max, разрядность (8 или 16), частота декодирования
+WAVEFORM_ENABLED = os.getenv("WAVEFORM_ENABLED", "1") == "1"
+WAVEFORM_BUCKETS = int(os.getenv("WAVEFORM_BUCKETS", 2000))
+WAVEFORM_BITS = int(os.getenv("WAVEFORM_BITS", 8))
+WAVEFORM_SAMPLE_RATE = int(os.getenv("WAVEFORM_SAMPLE_RATE", 22050))
+# Пики меняются только с заменой файла (ETag), поэтому кэшируются надолго
+WAVEFORM_MAX_AGE = int(os.getenv("WAVEFORM_MAX_AGE", 30 * 24 * 60 * 60))
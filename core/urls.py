@@ -4,6 +4,7 @@ from django.contrib import admin
 from django.urls import path, include, re_path
 from django.views.static import serve
 
+from apps.shared.views.media import serve as serve_media
 from core.config.swagger import urlpatterns as swagger_patterns
 
 
@@ -25,7 +26,9 @@ urlpatterns = (
         path("rosetta/", include("rosetta.urls")),
         # Media and static files
         re_path(r"static/(?P<path>.*)", serve, {"document_root": settings.STATIC_ROOT}),
-        re_path(r"media/(?P<path>.*)", serve, {"document_root": settings.MEDIA_ROOT}),
+        re_path(
+            r"media/(?P<path>.*)", serve_media, {"document_root": settings.MEDIA_ROOT}
+        ),
     ]
 )
 